@@ -60,6 +60,13 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = Field(default="local", description="Environment: local, dev, staging, prod")
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
 
+    # ============================================
+    # RUNTIME (.env only)
+    # ============================================
+    USE_UVLOOP: bool = Field(
+        default=True, description="Run services on uvloop when installed (Linux/macOS)"
+    )
+
     # ============================================
     # CLOUD PROVIDER (.env only)
     # ============================================
@@ -92,6 +99,16 @@ class Settings(BaseSettings):
         """Stream client worker pool size from streaming.yaml"""
         return self._streaming_config.get("queue", {}).get("workers", 10)
 
+    @property
+    def STREAM_BATCH_MAX(self) -> int:
+        """Max records a stream worker takes per send round from streaming.yaml"""
+        return self._streaming_config.get("queue", {}).get("batch_max", 500)
+
+    @property
+    def STREAM_LINGER_MS(self) -> int:
+        """How long a stream worker waits for a partial batch to fill from streaming.yaml"""
+        return self._streaming_config.get("queue", {}).get("linger_ms", 0)
+
     @property
     def DB_QUEUE_SIZE(self) -> int:
         """Database client queue size from databases.yaml"""
@@ -117,6 +134,11 @@ class Settings(BaseSettings):
         """Cache client worker pool size from databases.yaml"""
         return self._database_config.get("redis", {}).get("queue", {}).get("workers", 2)
 
+    @property
+    def CACHE_MAX_BATCH(self) -> int:
+        """Max cache sets flushed per worker round-trip (pipeline) from databases.yaml"""
+        return self._database_config.get("redis", {}).get("queue", {}).get("max_batch", 100)
+
     # ============================================
     # STREAMING - Kafka/Kinesis (from YAML)
     # ============================================
@@ -206,6 +228,31 @@ class Settings(BaseSettings):
         """
         return self._database_config.get("clickhouse", {}).get("pool_size", self.DB_WORKERS)
 
+    @property
+    def CLICKHOUSE_LAZY_POOL(self) -> bool:
+        """ClickHouse lazy pool flag (grow connections on demand) from databases.yaml"""
+        return self._database_config.get("clickhouse", {}).get("lazy_pool", False)
+
+    @property
+    def CLICKHOUSE_MIN_POOL_SIZE(self) -> int:
+        """ClickHouse connections opened at startup in lazy mode from databases.yaml"""
+        return self._database_config.get("clickhouse", {}).get("min_pool_size", 1)
+
+    @property
+    def CLICKHOUSE_BLOCK_ROWS(self) -> int:
+        """ClickHouse insert block size (rows buffered per INSERT) from databases.yaml"""
+        return self._database_config.get("clickhouse", {}).get("block_rows", 65536)
+
+    @property
+    def CLICKHOUSE_FLUSH_MS(self) -> int:
+        """ClickHouse max insert buffer age in milliseconds from databases.yaml"""
+        return self._database_config.get("clickhouse", {}).get("flush_ms", 1000)
+
+    @property
+    def CLICKHOUSE_PING_INTERVAL_S(self) -> int:
+        """ClickHouse idle connection ping interval in seconds (0 = off) from databases.yaml"""
+        return self._database_config.get("clickhouse", {}).get("ping_interval_s", 30)
+
     # ClickHouse password from .env (secret)
     CLICKHOUSE_PASSWORD: str = Field(default="trading_pass")
 
@@ -235,6 +282,21 @@ class Settings(BaseSettings):
         """Redis database from databases.yaml"""
         return self._database_config.get("redis", {}).get("db", 0)
 
+    @property
+    def REDIS_MAX_CONNECTIONS(self) -> int:
+        """Redis connection pool size from databases.yaml"""
+        return self._database_config.get("redis", {}).get("max_connections", 50)
+
+    @property
+    def REDIS_SOCKET_TIMEOUT_SEC(self) -> float:
+        """Redis socket timeout from databases.yaml"""
+        return self._database_config.get("redis", {}).get("socket_timeout_sec", 5)
+
+    @property
+    def REDIS_HEALTH_CHECK_INTERVAL_SEC(self) -> int:
+        """Seconds a pooled Redis connection may sit idle before it's PINGed on borrow"""
+        return self._database_config.get("redis", {}).get("health_check_interval_sec", 30)
+
     # Redis password from .env (optional secret)
     REDIS_PASSWORD: str | None = Field(default=None)
 
@@ -462,6 +524,45 @@ class Settings(BaseSettings):
         """Minimum candles required for calculation"""
         return self._indicators_config.get("service", {}).get("min_candles", 20)
 
+    @property
+    def INDICATOR_SERVICE_DB_BATCH_ROWS(self) -> int:
+        """Buffered indicator rows per bulk database INSERT"""
+        return self._indicators_config.get("service", {}).get("db_batch_rows", 10000)
+
+    @property
+    def INDICATOR_SERVICE_DB_FLUSH_INTERVAL_SECONDS(self) -> float:
+        """Max seconds buffered indicator rows wait before a database INSERT"""
+        return float(
+            self._indicators_config.get("service", {}).get("db_flush_interval_seconds", 1.0)
+        )
+
+    @property
+    def INDICATOR_SERVICE_CACHE_FLUSH_INTERVAL_SECONDS(self) -> float:
+        """Max seconds computed indicators wait before they are sent to the cache"""
+        return float(
+            self._indicators_config.get("service", {}).get("cache_flush_interval_seconds", 0.1)
+        )
+
+    @property
+    def INDICATOR_SERVICE_DB_MAX_BUFFERED_ROWS(self) -> int:
+        """Buffered indicator rows at which saves wait for the database (backpressure)"""
+        return self._indicators_config.get("service", {}).get("db_max_buffered_rows", 100000)
+
+    @property
+    def INDICATOR_SERVICE_DB_MAX_CONCURRENT_FLUSHES(self) -> int:
+        """Indicator bulk INSERTs allowed in flight at once"""
+        return self._indicators_config.get("service", {}).get("db_max_concurrent_flushes", 2)
+
+    @property
+    def INDICATOR_SERVICE_DB_BATCH_ROWS_MAX(self) -> int:
+        """Ceiling for the adaptive indicator INSERT batch size"""
+        return self._indicators_config.get("service", {}).get("db_batch_rows_max", 50000)
+
+    @property
+    def INDICATOR_SERVICE_DB_INSERT_SLO_SECONDS(self) -> float:
+        """Indicator INSERT latency above which the batch size is halved"""
+        return float(self._indicators_config.get("service", {}).get("db_insert_slo_seconds", 1.0))
+
 
 # Singleton pattern
 _settings_instance: Settings | None = None
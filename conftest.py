@@ -0,0 +1,15 @@
+"""
+Root pytest configuration
+
+Makes the project root importable (core, config, providers, services, ...)
+once per session, so individual test modules don't need sys.path hacks.
+Not needed when the project is installed in editable mode (uv sync / pip install -e .).
+"""
+
+import sys
+from pathlib import Path
+
+_ROOT = str(Path(__file__).parent)
+
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
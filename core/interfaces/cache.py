@@ -1,13 +1,50 @@
+import array
 import asyncio
-import contextlib
 import logging
 import time
 from abc import ABC, abstractmethod
 from datetime import timedelta
+from typing import Any
+
+from core.utils.ring import BoundedRing, RingClosedError
 
 logger = logging.getLogger(__name__)
 
 
+class SetOp:
+    """
+    Queued cache set (one per enqueue_set())
+
+    Slotted object instead of a ("set", key, value, ttl) tuple: fields are
+    reassigned in place, so recycled instances from _SETOP_FREELIST cost no
+    allocation on the enqueue hot path.
+
+    Indexing (op[0] == "set", op[1] key, op[2] value, op[3] ttl) mirrors the
+    old tuple layout for callers not yet moved to attribute access.
+    """
+
+    __slots__ = ("key", "value", "ttl")
+
+    op = "set"
+
+    def __init__(self, key: str, value: str, ttl: timedelta | None = None):
+        self.key = key
+        self.value = value
+        self.ttl = ttl
+
+    def __getitem__(self, index: int):
+        return (self.op, self.key, self.value, self.ttl)[index]
+
+    def __repr__(self) -> str:
+        return f"SetOp({self.key!r}, {self.value!r}, {self.ttl!r})"
+
+
+# Recycled SetOps (workers return them after the batch is written).
+# Capped so a burst doesn't pin memory after the queue drains.
+_SETOP_FREELIST: list[SetOp] = []
+_SETOP_FREELIST_MAX = 4096
+
+
 class BaseCacheClient(ABC):
     """
     Abstract interface for caching layer
@@ -20,20 +57,62 @@ class BaseCacheClient(ABC):
     - MemcachedClient (In-memory only)
 
     Architecture:
-        StreamProcessor → enqueue_set() → Queue → Workers → Redis
+        StreamProcessor → enqueue_set() → BoundedRing → Workers → Redis
                               ↓ (put_nowait, fast)
                           Non-blocking
     """
 
-    def __init__(self):
+    def __init__(self, settings: Any = None):
+        """
+        Args:
+            settings: Settings to read queue/worker config from in connect()
+                (default: get_settings(); tests pass a fake instead of patching)
+        """
+        self._settings = settings
+
         # Internal queue + workers
-        self._queue: asyncio.Queue | None = None
+        self._queue: BoundedRing | None = None
+        self._put_nowait = None  # Bound self._queue.put_nowait (set in connect())
         self._worker_tasks: list[asyncio.Task] = []
         self._dropped_sets = 0  # Metric: dropped sets due to queue full
-        self._drop_rate_window: list[float] = []  # For drop rate tracking
-
-        # Sentinel for shutdown
-        self._SENTINEL = object()
+        # Drop rate tracking: ring of 60 one-second buckets, stored flat as
+        # (epoch_second, count) pairs. Fixed size, O(1) update per drop.
+        self._drop_buckets = array.array("q", [0] * (self._DROP_WINDOW_SECS * 2))
+        self._max_batch = 1  # Max items per worker flush (set in connect())
+        # Drop-rate clock (monotonic seconds). connect() swaps in the running
+        # loop's time(); tests can assign a fake without patching modules.
+        self._clock = time.monotonic
+
+    _DROP_WINDOW_SECS = 60
+    _CLOSE_TIMEOUT_SECS = 5.0  # close(): drain deadline before cancelling workers
+
+    def _record_drop(self, now: int, count: int = 1) -> None:
+        """Count `count` dropped sets in the bucket for second `now`"""
+        i = (now % self._DROP_WINDOW_SECS) * 2
+        buckets = self._drop_buckets
+        if buckets[i] != now:
+            # Bucket still holds an older second - recycle it
+            buckets[i] = now
+            buckets[i + 1] = 0
+        buckets[i + 1] += count
+
+    def _drops_in_window(self, now: int) -> int:
+        """Number of drops recorded within the last 60 seconds"""
+        buckets = self._drop_buckets
+        cutoff = now - self._DROP_WINDOW_SECS
+        return sum(buckets[i + 1] for i in range(0, len(buckets), 2) if buckets[i] > cutoff)
+
+    @property
+    def _drop_rate_window(self) -> list[int]:
+        """Drop timestamps (whole seconds) within the last 60 seconds, one entry per drop"""
+        now = int(self._clock())
+        buckets = self._drop_buckets
+        cutoff = now - self._DROP_WINDOW_SECS
+        window: list[int] = []
+        for i in range(0, len(buckets), 2):
+            if buckets[i] > cutoff:
+                window.extend([buckets[i]] * buckets[i + 1])
+        return window
 
     async def connect(self) -> None:
         """
@@ -43,12 +122,17 @@ class BaseCacheClient(ABC):
         1. Call super().connect() first
         2. Then do provider-specific connection
         """
-        from config.settings import get_settings
+        settings = self._settings
+        if settings is None:
+            from config.settings import get_settings
 
-        settings = get_settings()
+            settings = get_settings()
 
         # Create queue
-        self._queue = asyncio.Queue(maxsize=settings.CACHE_QUEUE_SIZE)
+        self._queue = BoundedRing(settings.CACHE_QUEUE_SIZE)
+        self._put_nowait = self._queue.put_nowait  # Hot path: skip attribute lookup per enqueue
+        self._max_batch = max(1, settings.CACHE_MAX_BATCH)
+        self._clock = asyncio.get_running_loop().time
 
         # Start workers
         for i in range(settings.CACHE_WORKERS):
@@ -65,6 +149,8 @@ class BaseCacheClient(ABC):
 
         This method is FAST (just put_nowait, no await, no I/O).
 
+        Queued item is a SetOp, reused from the freelist when one is available.
+
         Args:
             key: Cache key
             value: Value to set
@@ -73,58 +159,132 @@ class BaseCacheClient(ABC):
         Returns:
             True if queued, False if dropped
         """
-        if not self._queue:
+        if self._put_nowait is None:
             raise RuntimeError("Cache client not connected")
 
-        try:
-            self._queue.put_nowait(("set", key, value, ttl))
+        if _SETOP_FREELIST:
+            op = _SETOP_FREELIST.pop()
+            op.key = key
+            op.value = value
+            op.ttl = ttl
+        else:
+            op = SetOp(key, value, ttl)
+
+        if self._put_nowait(op):
             return True
-        except asyncio.QueueFull:
-            # Track drop metrics + rate
-            now = time.time()
-            self._dropped_sets += 1
-            self._drop_rate_window.append(now)
-
-            # Keep only last 60 seconds
-            cutoff = now - 60
-            self._drop_rate_window = [t for t in self._drop_rate_window if t > cutoff]
-            drop_rate = len(self._drop_rate_window) / 60
-
-            # SLO: Cache drops are OK (nice-to-have), just warn at high rate
-            if drop_rate > 50:
-                logger.warning(
-                    f"Cache drop rate high: {drop_rate:.1f}/sec (key: {key}, total: {self._dropped_sets})"
-                )
-            # No logging for low drop rates (cache drops are acceptable)
-            return False
+
+        self._track_drops(1, key)
+        return False
+
+    def enqueue_set_many(self, items: list[tuple[str, str, timedelta | None]]) -> int:
+        """
+        Enqueue several cache sets at once (SYNC, NON-BLOCKING)
+
+        One ring append + one worker wake-up for the whole batch instead of
+        one enqueue_set() call per key. If the queue can't hold them all,
+        the leading items are queued and the rest dropped.
+
+        Args:
+            items: (key, value, ttl) tuples, ttl may be None
+
+        Returns:
+            Number queued (len(items) - queued were dropped)
+        """
+        if self._queue is None:
+            raise RuntimeError("Cache client not connected")
+
+        free = self._queue.maxsize - self._queue.qsize()
+        fits = items if len(items) <= free else items[:free]
+
+        ops = []
+        for key, value, ttl in fits:
+            if _SETOP_FREELIST:
+                op = _SETOP_FREELIST.pop()
+                op.key = key
+                op.value = value
+                op.ttl = ttl
+            else:
+                op = SetOp(key, value, ttl)
+            ops.append(op)
+
+        queued = self._queue.put_many_nowait(ops)
+
+        dropped = len(items) - queued
+        if dropped:
+            self._track_drops(dropped, items[queued][0])
+        return queued
+
+    def _track_drops(self, count: int, key: str) -> None:
+        """Ring full - track drop metrics + rate (last 60 seconds)"""
+        now = int(self._clock())
+        self._dropped_sets += count
+        self._record_drop(now, count)
+        drop_rate = self._drops_in_window(now) / self._DROP_WINDOW_SECS
+
+        # SLO: Cache drops are OK (nice-to-have), just warn at high rate
+        if drop_rate > 50:
+            logger.warning(
+                f"Cache drop rate high: {drop_rate:.1f}/sec (key: {key}, total: {self._dropped_sets})"
+            )
+        # No logging for low drop rates (cache drops are acceptable)
 
     async def _worker(self) -> None:
         """
         Background worker - consume and set cache
 
-        Uses sentinel pattern for clean shutdown.
+        Waits for one item, then drains whatever else is already queued
+        (up to CACHE_MAX_BATCH) and flushes it in one _set_many_impl() call.
+
+        Exits when the ring is closed and drained (RingClosedError) - no
+        sentinel items, so the hot loop never compares against one.
         """
+        # Hot-loop lookups bound once (LOAD_FAST instead of LOAD_ATTR per batch)
+        queue = self._queue
+        get_many, task_done = queue.get_many, queue.task_done
+        set_many = self._set_many_impl
+        max_batch = self._max_batch
+        freelist_extend = _SETOP_FREELIST.extend
+
         while True:
             try:
-                item = await self._queue.get()
+                # One wake per burst: take everything queued (up to max batch) at once
+                batch = await get_many(max_batch)
 
-                # Sentinel check (shutdown signal)
-                if item is self._SENTINEL:
-                    self._queue.task_done()
-                    break
+                try:
+                    await set_many(batch)
+                except Exception as e:
+                    logger.error(f"Cache worker error: {e}", exc_info=True)
 
-                operation, key, value, ttl = item
+                # Written (or failed) - hand the ops back for reuse
+                free = _SETOP_FREELIST_MAX - len(_SETOP_FREELIST)
+                if free > 0:
+                    freelist_extend(batch[:free])
 
-                if operation == "set":
-                    await self._set_impl(key, value, ttl)
+                for _ in batch:
+                    task_done()
 
-                self._queue.task_done()
-
-            except asyncio.CancelledError:
+            except (RingClosedError, asyncio.CancelledError):
                 break
             except Exception as e:
                 logger.error(f"Cache worker error: {e}", exc_info=True)
 
+    async def _set_many_impl(self, items: list[SetOp]) -> None:
+        """
+        Provider-specific batch set (override to pipeline/batch the I/O)
+
+        Default: call _set_impl() per item, isolating failures per key.
+
+        Items are recycled once this returns - don't keep references to them.
+
+        Args:
+            items: Queued SetOps
+        """
+        for item in items:
+            try:
+                await self._set_impl(item.key, item.value, item.ttl)
+            except Exception as e:
+                logger.error(f"Cache set error for {item.key}: {e}")
+
     @abstractmethod
     async def _set_impl(self, key: str, value: str, ttl: timedelta | None) -> None:
         """
@@ -184,26 +344,77 @@ class BaseCacheClient(ABC):
             Dictionary of field:value pairs
         """
 
+    async def hget(self, name: str, key: str) -> str | None:
+        """
+        Get one hash field
+
+        Default: hgetall() + lookup (override with a single-field read).
+
+        Args:
+            name: Hash name
+            key: Field key
+
+        Returns:
+            Field value, or None if the hash or field doesn't exist
+        """
+        return (await self.hgetall(name)).get(key)
+
+    async def hmget(self, name: str, keys: list[str]) -> list[str | None]:
+        """
+        Get several fields of one hash
+
+        Default: hgetall() + lookups (override with a single multi-field read).
+
+        Args:
+            name: Hash name
+            keys: Field keys
+
+        Returns:
+            Values in `keys` order, None for missing fields
+        """
+        fields = await self.hgetall(name)
+        return [fields.get(key) for key in keys]
+
+    async def hset_many(self, items: list[tuple[str, dict[str, str], timedelta | None]]) -> int:
+        """
+        Set fields on several hashes, each with an optional TTL on the whole hash
+
+        Direct write (awaits the I/O, not queued like enqueue_set()).
+        Default: hset() per field, TTL ignored - override to send it all in
+        one round-trip with expiry.
+
+        Args:
+            items: (name, {field: value}, ttl) tuples, ttl may be None
+
+        Returns:
+            Number of hashes written
+        """
+        for name, mapping, _ttl in items:
+            for key, value in mapping.items():
+                await self.hset(name, key, value)
+        return len(items)
+
     async def close(self) -> None:
         """
         Stop workers + flush queue
 
-        Uses sentinel pattern for clean shutdown.
+        Single broadcast: workers drain what's queued, then exit. Doesn't
+        need free queue slots, so it can't stall on a full queue.
         """
-        # Signal workers to stop by sending sentinel to each
         if self._queue:
-            for _ in self._worker_tasks:
-                await self._queue.put(self._SENTINEL)
+            self._queue.close()
 
-        # Wait for workers to finish
-        for task in self._worker_tasks:
-            try:
-                await asyncio.wait_for(task, timeout=5.0)
-            except TimeoutError:
-                logger.warning("Cache worker didn't finish in 5s, cancelling")
-                task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
+        # One shared deadline for the whole pool (not 5s per worker in turn)
+        if self._worker_tasks:
+            _, pending = await asyncio.wait(self._worker_tasks, timeout=self._CLOSE_TIMEOUT_SECS)
+            if pending:
+                logger.warning(
+                    f"{len(pending)} cache workers didn't finish in "
+                    f"{self._CLOSE_TIMEOUT_SECS:g}s, cancelling"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
 
         self._worker_tasks.clear()
 
@@ -1,16 +1,67 @@
 import asyncio
-import contextlib
+import itertools
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterable
 from datetime import datetime
-from typing import Any
+from operator import itemgetter
+from typing import Any, NamedTuple
 
 from core.models.market_data import Candle
+from core.utils.ring import DropRateRing
 
 logger = logging.getLogger(__name__)
 
 
+class TradeRow(NamedTuple):
+    """
+    Compact queued trade (one per buffered trade, fields in market_trades column order)
+
+    A tuple instead of a dict: roughly half the memory per queued trade and
+    attribute access for columnar serialization. Prices are floats (what the
+    insert sends), not the Decimal strings of Trade.to_dict().
+    """
+
+    timestamp: datetime
+    exchange: str
+    symbol: str
+    trade_id: str
+    price: float
+    quantity: float
+    side: str
+    is_buyer_maker: bool
+
+    @classmethod
+    def from_dict(cls, trade: dict[str, Any]) -> "TradeRow":
+        """Adapt a Trade.to_dict() style dict"""
+        return cls(
+            trade["timestamp"],
+            trade["exchange"],
+            trade["symbol"],
+            trade["trade_id"],
+            float(trade["price"]),
+            float(trade["quantity"]),
+            trade["side"],
+            bool(trade["is_buyer_maker"]),
+        )
+
+
+class IndicatorSet(NamedTuple):
+    """
+    One candle's indicator values (insert_indicators() arguments, in order)
+
+    Expands to one indicators row per entry in `indicators`.
+    """
+
+    exchange: str
+    symbol: str
+    timeframe: str
+    timestamp: datetime
+    indicators: dict[str, float]
+
+
 class BaseTimeSeriesDB(ABC):
     """
     Abstract interface for time-series databases
@@ -24,20 +75,48 @@ class BaseTimeSeriesDB(ABC):
     - InfluxDBClient (Purpose-built time-series)
 
     Architecture:
-        StreamProcessor → enqueue_trades() → Queue → Workers → Batch → ClickHouse
-                              ↓ (put_nowait, fast)
+        StreamProcessor → enqueue_trades() → deque of trades → Workers → ClickHouse
+                              ↓ (extend, fast)       ↑ flush event (>= batch_size)
                           Non-blocking
     """
 
-    def __init__(self):
-        # Internal queue + workers
-        self._queue: asyncio.Queue | None = None
+    # Queue/worker state in slots (read on every enqueue). Subclasses keep
+    # a __dict__: connect() rebinds enqueue_trades per instance.
+    __slots__ = (
+        "_settings",
+        "_buffer",
+        "_flush_event",
+        "_batch_size",
+        "_closing",
+        "_worker_tasks",
+        "_dropped_trades",
+        "_trade_drops",
+        "_clock",
+        "_loop",
+    )
+
+    _CLOSE_TIMEOUT_SECS = 15.0  # close(): flush deadline before cancelling workers
+
+    def __init__(self, settings: Any = None):
+        """
+        Args:
+            settings: Settings to read queue/worker config from in connect()
+                (default: get_settings(); tests pass a fake instead of patching)
+        """
+        self._settings = settings
+
+        # Trade buffer + workers
+        self._buffer: deque[TradeRow] | None = None  # Capacity DB_QUEUE_SIZE trades
+        self._flush_event = asyncio.Event()  # Set when >= batch_size trades are buffered
+        self._batch_size = 1  # Trades per insert (set in connect())
+        self._closing = False  # Workers drain partial batches, then exit
         self._worker_tasks: list[asyncio.Task] = []
         self._dropped_trades = 0  # Metric: dropped trades due to queue full
-        self._trade_drop_rate_window: list[float] = []  # For drop rate tracking
-
-        # Sentinel for shutdown
-        self._SENTINEL = object()
+        self._trade_drops = DropRateRing()  # Drop timestamps for get_drop_rate_60s()
+        # Drop-rate clock (monotonic seconds). connect() swaps in the running
+        # loop's time(); tests can assign a fake without patching modules.
+        self._clock = time.monotonic
+        self._loop: asyncio.AbstractEventLoop | None = None  # Set in connect()
 
     async def connect(self) -> None:
         """
@@ -47,12 +126,19 @@ class BaseTimeSeriesDB(ABC):
         1. Call super().connect() first
         2. Then do provider-specific connection
         """
-        from config.settings import get_settings
+        settings = self._settings
+        if settings is None:
+            from config.settings import get_settings
 
-        settings = get_settings()
+            settings = get_settings()
 
-        # Create queue
-        self._queue = asyncio.Queue(maxsize=settings.DB_QUEUE_SIZE)
+        # Create buffer (capacity counted in trades)
+        self._buffer = deque(maxlen=settings.DB_QUEUE_SIZE)
+        self._batch_size = max(1, settings.DB_BATCH_SIZE)
+        self._closing = False
+        self._loop = asyncio.get_running_loop()
+        self._clock = self._loop.time
+        self.enqueue_trades = self._enqueue_trades_fast  # Hot path: skip connected check
 
         # Start workers
         for i in range(settings.DB_WORKERS):
@@ -64,116 +150,180 @@ class BaseTimeSeriesDB(ABC):
             f"(queue size: {settings.DB_QUEUE_SIZE}, batch size: {settings.DB_BATCH_SIZE})"
         )
 
-    def enqueue_trades(self, trades: list[dict[str, Any]]) -> int:
+    def enqueue_trades(self, trades: Iterable[TradeRow]) -> int:
         """
         Enqueue trades for insertion (SYNC, NON-BLOCKING)
 
-        Batched by workers before actual DB insert.
+        Trades are appended straight to the shared buffer; workers are woken
+        once a full batch is waiting. If the buffer would overflow, the
+        oldest buffered trades are dropped to make room (drop-oldest).
+
+        connect() rebinds this name on the instance to _enqueue_trades_fast(),
+        so the connected check below only runs before connect().
 
         Args:
-            trades: List of trade dictionaries
+            trades: TradeRows - a list, or any iterable such as a generator
+                (no intermediate list needed; see insert_trades() for dicts)
 
         Returns:
             Number of trades queued (not yet inserted)
         """
-        if not self._queue:
+        if self._buffer is None:
             raise RuntimeError("Database client not connected")
+        return self._enqueue_trades_fast(trades)
 
-        if not trades:
-            return 0
+    def _enqueue_trades_fast(self, trades: Iterable[TradeRow]) -> int:
+        """enqueue_trades() after connect() - buffer is known to exist"""
+        buffer = self._buffer
 
+        # deque(maxlen) evicts from the left: a full buffer drops its OLDEST
+        # trades to make room - fresh trades beat stale ones
         try:
-            # Enqueue trades (sync operation)
-            self._queue.put_nowait(("trades", trades))
-            return len(trades)
-        except asyncio.QueueFull:
-            # Track drop metrics + rate
-            now = time.time()
             count = len(trades)
-            self._dropped_trades += count
-            self._trade_drop_rate_window.extend([now] * count)
-
-            # Keep only last 60 seconds
-            cutoff = now - 60
-            self._trade_drop_rate_window = [t for t in self._trade_drop_rate_window if t > cutoff]
-            drop_rate = len(self._trade_drop_rate_window) / 60  # trades dropped/sec
-
-            # SLO: DB drops are critical - panic if > 5/sec
-            if drop_rate > 5:
-                logger.error(
-                    f"🚨 PANIC: DB trade drop rate {drop_rate:.1f}/sec exceeds threshold! "
-                    f"Total dropped: {self._dropped_trades}"
-                )
-            else:
-                logger.warning(
-                    f"DB queue full, dropping {count} trades "
-                    f"(rate: {drop_rate:.1f}/sec, total: {self._dropped_trades})"
-                )
+        except TypeError:
+            count, overflow = self._extend_unsized(trades)
+        else:
+            overflow = len(buffer) + count - buffer.maxlen
+            buffer.extend(trades)
+        if not count:
             return 0
 
+        if len(buffer) >= self._batch_size:
+            self._flush_event.set()
+        if overflow <= 0:
+            return count
+
+        # Buffer overflowed - track drop metrics + rate
+        self._dropped_trades += overflow
+        now = self._clock()  # One clock read for record + rate
+        self._trade_drops.record(overflow, now)
+        drop_rate = self._trade_drops.rate_60s(now)  # trades dropped/sec
+
+        # SLO: DB drops are critical - panic if > 5/sec
+        if drop_rate > 5:
+            logger.error(
+                f"🚨 PANIC: DB trade drop rate {drop_rate:.1f}/sec exceeds threshold! "
+                f"Total dropped: {self._dropped_trades}"
+            )
+        else:
+            logger.warning(
+                f"DB queue full, dropping {overflow} oldest trades "
+                f"(rate: {drop_rate:.1f}/sec, total: {self._dropped_trades})"
+            )
+        return min(count, buffer.maxlen)
+
+    def _extend_unsized(self, trades: Iterable[TradeRow]) -> tuple[int, int]:
+        """
+        Extend the buffer from an iterable without a len() (e.g. a generator)
+
+        Both extends run in C: fill the free slots, then stream the rest
+        through a counter - each of those evicts one oldest trade.
+
+        Returns:
+            (trades consumed, trades evicted)
+        """
+        buffer = self._buffer
+        it = iter(trades)
+        before = len(buffer)
+        buffer.extend(itertools.islice(it, buffer.maxlen - before))
+        count = len(buffer) - before
+        if len(buffer) < buffer.maxlen:
+            return count, 0
+
+        counter = itertools.count()
+        buffer.extend(map(itemgetter(0), zip(it, counter)))
+        overflow = next(counter)
+        return count + overflow, overflow
+
+    def enqueue_trades_threadsafe(self, trades: Iterable[TradeRow]) -> None:
+        """
+        Enqueue trades from a thread other than the event loop's
+
+        For sync producers running in worker threads. Hands the trades to
+        the loop thread, which runs enqueue_trades() - the buffer and flush
+        event are only touched there. Fire-and-forget: drops show up in the
+        usual metrics. Don't mutate `trades` after the call.
+        """
+        if self._loop is None:
+            raise RuntimeError("Database client not connected")
+        self._loop.call_soon_threadsafe(self.enqueue_trades, trades)
+
+    def get_drop_rate_60s(self) -> float:
+        """Trades dropped per second over the last 60 seconds"""
+        return self._trade_drops.rate_60s(self._clock())
+
     async def _worker(self) -> None:
         """
         Background worker - batch and insert to database
 
         Batching strategy:
-        - Collect up to batch_size items (from databases.yaml)
-        - Flush on sentinel (shutdown signal)
+        - Sleep on the flush event until batch_size trades (from databases.yaml)
+          are buffered, then pop one batch and insert it
+        - On close(), drain the remainder (including a partial batch) and exit
         - No timeout polling (better performance)
-        """
-        from config.settings import get_settings
 
-        settings = get_settings()
-        batch_size = settings.DB_BATCH_SIZE  # From databases.yaml
-
-        batch_trades = []
+        Full batches are written into one preallocated list per worker and
+        handed over as-is (no list growth per trade, no new list per batch).
+        """
+        buffer = self._buffer
+        batch_size = self._batch_size
+        flush_event = self._flush_event
+        # Hot-loop lookups bound once (LOAD_FAST instead of LOAD_ATTR per batch)
+        popleft = buffer.popleft
+        wait, clear = flush_event.wait, flush_event.clear
+        insert = self._insert_trades_impl
+        batch: list[TradeRow] = [None] * batch_size  # Reused across batches
 
         while True:
             try:
-                item = await self._queue.get()
-
-                # Sentinel check (shutdown signal)
-                if item is self._SENTINEL:
-                    self._queue.task_done()
-                    # Flush remaining batches before exit
-                    if batch_trades:
-                        await self._insert_trades_impl(batch_trades)
-                    break
-
-                msg_type, items = item
-
-                if msg_type == "trades":
-                    batch_trades.extend(items)
-
-                self._queue.task_done()
-
-                # Flush if batch full
-                if len(batch_trades) >= batch_size:
-                    await self._insert_trades_impl(batch_trades)
-                    batch_trades.clear()
+                await wait()
+
+                if not self._closing and len(buffer) < batch_size:
+                    # Another worker took the batch - sleep until the next one
+                    clear()
+                    continue
+                if not buffer:
+                    break  # Closing and drained
+
+                # No await between pops: workers never split a batch
+                if len(buffer) >= batch_size:
+                    for i in range(batch_size):
+                        batch[i] = popleft()
+                    trades = batch
+                else:
+                    # Partial batch - only when closing
+                    trades = list(buffer)
+                    buffer.clear()
+                if not self._closing and len(buffer) < batch_size:
+                    clear()
+
+                try:
+                    await insert(trades)
+                except Exception as e:
+                    logger.error(f"DB worker error: {e}", exc_info=True)
 
             except asyncio.CancelledError:
-                # Flush remaining before exit
-                if batch_trades:
-                    await self._insert_trades_impl(batch_trades)
                 break
-            except Exception as e:
-                logger.error(f"DB worker error: {e}", exc_info=True)
 
     @abstractmethod
-    async def _insert_trades_impl(self, trades: list[dict[str, Any]]) -> int:
+    async def _insert_trades_impl(self, trades: list[TradeRow]) -> int:
         """
         Provider-specific trades insert (ClickHouse, TimescaleDB, etc.)
 
         Called by worker with batched trades. Must be implemented by subclass.
+        The worker reuses the list after this returns - copy it to keep it.
         """
 
-    async def insert_trades(self, trades: list[dict[str, Any]]) -> int:
+    async def insert_trades(self, trades: list[dict[str, Any] | TradeRow]) -> int:
         """
         Legacy async method for backward compatibility
 
-        NEW: Just calls enqueue_trades() (sync, non-blocking)
+        NEW: Just calls enqueue_trades() (sync, non-blocking).
+        Trade dicts are converted to TradeRow first.
         """
-        return self.enqueue_trades(trades)
+        return self.enqueue_trades(
+            t if isinstance(t, TradeRow) else TradeRow.from_dict(t) for t in trades
+        )
 
     @abstractmethod
     async def query(self, sql: str, params: dict | None = None) -> list[dict]:
@@ -259,26 +409,45 @@ class BaseTimeSeriesDB(ABC):
             ORDER BY (exchange, symbol, timeframe, indicator_name, timestamp)
         """
 
+    async def insert_indicators_bulk(self, indicator_sets: list[IndicatorSet]) -> int:
+        """
+        Insert indicator values for many candles at once
+
+        Default: one insert_indicators() call per set. Override to send
+        everything in a single INSERT.
+
+        Args:
+            indicator_sets: Buffered (exchange, symbol, timeframe, timestamp, indicators)
+
+        Returns:
+            Number of rows inserted
+        """
+        total = 0
+        for indicator_set in indicator_sets:
+            total += await self.insert_indicators(*indicator_set)
+        return total
+
     async def close(self) -> None:
         """
-        Stop workers + flush queue
+        Stop workers + flush buffer
 
-        Uses sentinel pattern for clean shutdown.
+        Wakes every worker once; they drain the buffer (partial batch
+        included) and exit.
         """
-        # Signal workers to stop by sending sentinel to each
-        if self._queue:
-            for _ in self._worker_tasks:
-                await self._queue.put(self._SENTINEL)
+        self._closing = True
+        self._flush_event.set()
 
-        # Wait for workers to finish (they will flush batches on sentinel)
-        for task in self._worker_tasks:
-            try:
-                await asyncio.wait_for(task, timeout=15.0)
-            except TimeoutError:
-                logger.warning("DB worker didn't finish in 15s, cancelling")
-                task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
+        # One shared deadline for the whole pool (not 15s per worker in turn)
+        if self._worker_tasks:
+            _, pending = await asyncio.wait(self._worker_tasks, timeout=self._CLOSE_TIMEOUT_SECS)
+            if pending:
+                logger.warning(
+                    f"{len(pending)} DB workers didn't finish in "
+                    f"{self._CLOSE_TIMEOUT_SECS:g}s, cancelling"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
 
         self._worker_tasks.clear()
 
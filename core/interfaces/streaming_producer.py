@@ -1,10 +1,11 @@
 import asyncio
-import contextlib
 import logging
 import time
 from abc import ABC, abstractmethod
 from typing import Any
 
+from core.utils.ring import BoundedRing, DropRateRing, RingClosedError
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,18 +25,48 @@ class BaseStreamProducer(ABC):
     Architecture:
         WebSocket → Consumer → StreamProcessor → enqueue_record()
                                                       ↓ (put_nowait, fast)
-                                                  Queue → Workers → _send_impl() → Kafka
+                                                  BoundedRing → Workers → _send_impl() → Kafka
     """
 
-    def __init__(self):
+    # Queue/worker state in slots (read on every enqueue)
+    __slots__ = (
+        "_settings",
+        "_queue",
+        "_worker_tasks",
+        "_dropped_count",
+        "_drops",
+        "_clock",
+        "_batch_max",
+        "_linger",
+        "_shutdown",
+        "_loop",
+    )
+
+    _CLOSE_TIMEOUT_SECS = 10.0  # close(): drain deadline before cancelling workers
+
+    def __init__(self, settings: Any = None):
+        """
+        Args:
+            settings: Settings to read queue/worker config from in connect()
+                (default: get_settings(); tests pass a fake instead of patching)
+        """
+        self._settings = settings
+
         # Internal queue + workers (lazy init in connect())
-        self._queue: asyncio.Queue | None = None
+        self._queue: BoundedRing | None = None
         self._worker_tasks: list[asyncio.Task] = []
         self._dropped_count = 0  # Metric: dropped records due to queue full
-        self._drop_rate_window: list[float] = []  # For tracking drop rate
+        self._drops = DropRateRing()  # Drop timestamps for get_drop_rate_60s()
+        # Drop-rate clock (monotonic seconds). connect() swaps in the running
+        # loop's time(); tests can assign a fake without patching modules.
+        self._clock = time.monotonic
+
+        self._batch_max = 1  # Max records per send round (set in connect())
+        self._linger = 0.0  # Seconds to let a partial batch fill (set in connect())
 
-        # Sentinel for clean shutdown (no polling overhead)
-        self._SENTINEL = object()
+        # Shutdown broadcast (close() sets it and closes the ring)
+        self._shutdown = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None  # Set in connect()
 
     async def connect(self) -> None:
         """
@@ -45,12 +76,18 @@ class BaseStreamProducer(ABC):
         1. Call super().connect() first (creates queue + starts workers)
         2. Then do provider-specific connection
         """
-        from config.settings import get_settings
+        settings = self._settings
+        if settings is None:
+            from config.settings import get_settings
 
-        settings = get_settings()
+            settings = get_settings()
 
         # Create queue
-        self._queue = asyncio.Queue(maxsize=settings.STREAM_QUEUE_SIZE)
+        self._queue = BoundedRing(settings.STREAM_QUEUE_SIZE)
+        self._batch_max = max(1, settings.STREAM_BATCH_MAX)
+        self._linger = max(0, settings.STREAM_LINGER_MS) / 1000
+        self._loop = asyncio.get_running_loop()
+        self._clock = self._loop.time
 
         # Start workers
         for i in range(settings.STREAM_WORKERS):
@@ -67,8 +104,9 @@ class BaseStreamProducer(ABC):
         """
         Enqueue record for sending (SYNC, NON-BLOCKING)
 
-        This method is FAST (just put_nowait, no await, no I/O).
-        Actual sending happens in background workers.
+        This method is FAST (just a ring write, no await, no I/O).
+        Actual sending happens in background workers. When the queue is
+        full the OLDEST queued record is dropped to make room.
 
         Args:
             stream_name: Stream/topic name
@@ -76,70 +114,114 @@ class BaseStreamProducer(ABC):
             partition_key: Partition key for ordering
 
         Returns:
-            {"status": "queued"} or {"status": "dropped"}
+            {"status": "queued"} (the record itself is never dropped)
         """
         if not self._queue:
             raise RuntimeError("Stream producer not connected")
 
-        try:
-            # Non-blocking enqueue (sync operation)
-            self._queue.put_nowait((stream_name, data, partition_key))
+        # Non-blocking enqueue (sync operation). Full ring: drop the oldest
+        # record, not this one - fresh market data beats stale data.
+        if not self._queue.put_evicting((stream_name, data, partition_key)):
             return {"status": "queued"}
-        except asyncio.QueueFull:
-            # Track drop metrics
-            now = time.time()
-            self._dropped_count += 1
-            self._drop_rate_window.append(now)
-
-            # Keep only last 60 seconds for rate calculation
-            cutoff = now - 60
-            self._drop_rate_window = [t for t in self._drop_rate_window if t > cutoff]
-
-            drop_rate = len(self._drop_rate_window) / 60  # drops/sec
-
-            # SLO: Panic if drop rate > 10/sec (configurable threshold)
-            if drop_rate > 10:
-                logger.error(
-                    f"🚨 PANIC: Stream drop rate {drop_rate:.1f}/sec exceeds threshold! "
-                    f"Queue full, total dropped: {self._dropped_count}"
-                )
-            else:
-                logger.warning(
-                    f"Stream queue full, dropping record: {stream_name}/{partition_key} "
-                    f"(rate: {drop_rate:.1f}/sec, total: {self._dropped_count})"
-                )
 
-            return {"status": "dropped"}
+        # Ring was full - track drop metrics
+        self._dropped_count += 1
+        now = self._clock()  # One clock read for record + rate
+        self._drops.record(1, now)
+        drop_rate = self._drops.rate_60s(now)  # drops/sec
+
+        # SLO: Panic if drop rate > 10/sec (configurable threshold)
+        if drop_rate > 10:
+            logger.error(
+                f"🚨 PANIC: Stream drop rate {drop_rate:.1f}/sec exceeds threshold! "
+                f"Queue full, total dropped: {self._dropped_count}"
+            )
+        else:
+            logger.warning(
+                f"Stream queue full, dropped oldest record for {stream_name}/{partition_key} "
+                f"(rate: {drop_rate:.1f}/sec, total: {self._dropped_count})"
+            )
+
+        return {"status": "queued"}
 
-    async def _worker(self) -> None:
+    def enqueue_record_threadsafe(
+        self, stream_name: str, data: dict[str, Any], partition_key: str
+    ) -> None:
         """
-        Background worker - consume from queue and send to stream
+        Enqueue a record from a thread other than the event loop's
 
-        Uses sentinel pattern for clean shutdown (no polling overhead).
-        Subclasses must implement _send_impl() for actual I/O.
+        For sync producers running in worker threads (e.g. thread-pool
+        request handlers). Hands the record to the loop thread, which runs
+        enqueue_record() - the ring itself stays single-threaded and lock-free.
+        Fire-and-forget: drops show up in the usual metrics.
         """
-        while True:
-            try:
-                item = await self._queue.get()
+        if self._loop is None:
+            raise RuntimeError("Stream producer not connected")
+        self._loop.call_soon_threadsafe(self.enqueue_record, stream_name, data, partition_key)
 
-                # Sentinel check (shutdown signal)
-                if item is self._SENTINEL:
-                    self._queue.task_done()
-                    break
+    def get_drop_rate_60s(self) -> float:
+        """Records dropped per second over the last 60 seconds"""
+        return self._drops.rate_60s(self._clock())
 
-                stream_name, data, partition_key = item
+    async def _worker(self) -> None:
+        """
+        Background worker - consume from queue and send to stream
 
-                # Call provider-specific send implementation
-                await self._send_impl(stream_name, data, partition_key)
+        Batching (linger.ms / batch.size style):
+        - Wait for one record, take everything already queued (up to batch_max)
+        - If the batch isn't full, linger once (linger_ms) and top it up
+        - Hand the batch to _send_many_impl() in one call
 
-                self._queue.task_done()
+        Exits when the ring is closed and drained (RingClosedError) - no
+        sentinel items, so shutdown never queues behind buffered records.
+        """
+        # Hot-loop lookups bound once (LOAD_FAST instead of LOAD_ATTR per batch)
+        queue = self._queue
+        get_many, get_many_nowait, task_done = (
+            queue.get_many,
+            queue.get_many_nowait,
+            queue.task_done,
+        )
+        send_many = self._send_many_impl
+        shutdown_is_set = self._shutdown.is_set
+        batch_max = self._batch_max
+        linger = self._linger
 
+        while True:
+            try:
+                batch = await get_many(batch_max)
+                if linger and len(batch) < batch_max and not shutdown_is_set():
+                    await asyncio.sleep(linger)
+                    batch += get_many_nowait(batch_max - len(batch))
+            except (RingClosedError, asyncio.CancelledError):
+                break
+
+            try:
+                await send_many(batch)
             except asyncio.CancelledError:
                 # Graceful exit on cancel
                 break
             except Exception as e:
                 logger.error(f"Stream worker error: {e}", exc_info=True)
                 # Continue processing (don't break on error)
+            finally:
+                for _ in batch:
+                    task_done()
+
+    async def _send_many_impl(self, records: list[tuple[str, dict[str, Any], str]]) -> None:
+        """
+        Provider-specific batch send (override to use a bulk API, e.g. PutRecords)
+
+        Default: call _send_impl() per record, isolating failures per record.
+
+        Args:
+            records: Queued (stream_name, data, partition_key) tuples
+        """
+        for stream_name, data, partition_key in records:
+            try:
+                await self._send_impl(stream_name, data, partition_key)
+            except Exception as e:
+                logger.error(f"Stream worker error: {e}", exc_info=True)
 
     @abstractmethod
     async def _send_impl(self, stream_name: str, data: dict[str, Any], partition_key: str) -> None:
@@ -177,26 +259,26 @@ class BaseStreamProducer(ABC):
         """
         Stop workers + flush queue + close connection
 
-        Uses sentinel pattern for clean shutdown (no polling, no _running flag).
+        Single broadcast: workers drain what's queued, then exit. Doesn't
+        need free queue slots, so it can't stall on a full queue.
 
         Subclasses should call super().close() after provider-specific cleanup.
         """
-        # Signal workers to stop by sending sentinel to each
+        self._shutdown.set()
         if self._queue:
-            for _ in self._worker_tasks:
-                await self._queue.put(self._SENTINEL)
+            self._queue.close()
 
-        # Wait for workers to finish gracefully
-        # They will process remaining items, then exit on sentinel
-        for task in self._worker_tasks:
-            try:
-                # Give workers reasonable time to drain queue
-                await asyncio.wait_for(task, timeout=10.0)
-            except TimeoutError:
-                logger.warning("Stream worker didn't finish in 10s, cancelling")
-                task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
+        # One shared deadline for the whole pool (not 10s per worker in turn)
+        if self._worker_tasks:
+            _, pending = await asyncio.wait(self._worker_tasks, timeout=self._CLOSE_TIMEOUT_SECS)
+            if pending:
+                logger.warning(
+                    f"{len(pending)} stream workers didn't finish in "
+                    f"{self._CLOSE_TIMEOUT_SECS:g}s, cancelling"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
 
         self._worker_tasks.clear()
 
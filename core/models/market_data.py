@@ -8,12 +8,17 @@ Pydantic models for market data structures:
 - GapInfo: Gap detection metadata
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+# Shared empty-book level (avoids allocating zero Decimals per call)
+_ZERO = Decimal(0)
+_ZERO_LEVEL: tuple[Decimal, Decimal] = (_ZERO, _ZERO)
 
 
 class Trade(BaseModel):
@@ -34,6 +39,12 @@ class Trade(BaseModel):
         description="Was the buyer the maker? (true = buyer posted limit order)"
     )
 
+    @field_validator("exchange", "symbol", "side", mode="after")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        """Intern low-cardinality strings (shared across millions of trades)"""
+        return sys.intern(value)
+
     def to_dict(self) -> dict:
         """Convert to dictionary for database insertion"""
         return {
@@ -65,7 +76,7 @@ class Candle(BaseModel):
     close: Decimal = Field(description="Closing price")
     volume: Decimal = Field(description="Total volume traded (base asset)")
     quote_volume: Decimal = Field(
-        default=Decimal(0),
+        default=_ZERO,
         description="Quote asset volume = SUM(price * quantity) for all trades",
     )
     trades_count: int = Field(default=0, description="Number of trades in interval")
@@ -74,6 +85,12 @@ class Candle(BaseModel):
         description="True if candle was gap-filled (OHLC=prev close, volume=0)",
     )
 
+    @field_validator("exchange", "symbol", "timeframe", mode="after")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        """Intern low-cardinality strings (shared across all candles of a series)"""
+        return sys.intern(value)
+
 
 class OrderBook(BaseModel):
     """
@@ -92,25 +109,25 @@ class OrderBook(BaseModel):
     @property
     def best_bid(self) -> tuple[Decimal, Decimal]:
         """Get best bid (highest buy price)"""
-        return self.bids[0] if self.bids else (Decimal(0), Decimal(0))
+        return self.bids[0] if self.bids else _ZERO_LEVEL
 
     @property
     def best_ask(self) -> tuple[Decimal, Decimal]:
         """Get best ask (lowest sell price)"""
-        return self.asks[0] if self.asks else (Decimal(0), Decimal(0))
+        return self.asks[0] if self.asks else _ZERO_LEVEL
 
     @property
     def spread(self) -> Decimal:
         """Calculate bid-ask spread"""
         if not self.bids or not self.asks:
-            return Decimal(0)
+            return _ZERO
         return self.best_ask[0] - self.best_bid[0]
 
     @property
     def mid_price(self) -> Decimal:
         """Calculate mid price (average of best bid and ask)"""
         if not self.bids or not self.asks:
-            return Decimal(0)
+            return _ZERO
         return (self.best_bid[0] + self.best_ask[0]) / 2
 
     def to_dict(self) -> dict:
@@ -0,0 +1,28 @@
+"""
+msgspec wire models for exchange messages
+
+Typed structs decoded straight from JSON bytes (no intermediate dict).
+Used on the ingest hot path; the result is mapped to the Pydantic models
+in core.models.market_data in one step.
+
+Requires the optional msgspec dependency (speedups extra).
+"""
+
+import msgspec
+
+
+class BinanceTradeMsg(msgspec.Struct):
+    """
+    Binance trade stream message
+
+    Field names mirror the raw Binance payload; unknown fields are ignored.
+    """
+
+    e: str  # Event type
+    E: int  # Event time (ms)
+    s: str  # Symbol
+    t: int  # Trade ID
+    p: str  # Price
+    q: str  # Quantity
+    T: int  # Trade time (ms)
+    m: bool  # Is buyer maker?
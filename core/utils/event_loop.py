@@ -0,0 +1,50 @@
+"""
+Event loop selection for service entrypoints
+
+Uses uvloop (libuv-based loop, faster future/callback scheduling) when
+enabled via USE_UVLOOP and installed; falls back to the default asyncio
+loop otherwise. Must be chosen before the loop starts, so services call
+run() instead of asyncio.run() - swapping loops from inside connect()
+would be too late.
+"""
+
+import asyncio
+import logging
+import sys
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def get_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """
+    Pick the event loop factory for this process
+
+    Returns:
+        uvloop.new_event_loop if enabled and available, else None (asyncio default)
+    """
+    from config.settings import get_settings
+
+    if not get_settings().USE_UVLOOP or sys.platform == "win32":
+        return None
+
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using default asyncio event loop")
+        return None
+
+    return uvloop.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a service's main coroutine (drop-in for asyncio.run)
+
+    Example:
+        >>> if __name__ == "__main__":
+        ...     run(main())
+    """
+    with asyncio.Runner(loop_factory=get_loop_factory()) as runner:
+        return runner.run(main)
@@ -0,0 +1,314 @@
+"""
+Bounded ring buffer queue for single-producer / multi-consumer hand-off
+
+Drop-in for the subset of asyncio.Queue used by the queued provider
+interfaces (put_nowait/get/get_nowait/put/task_done/join/qsize/empty),
+plus put_many_nowait()/get_many() for moving a burst in one call,
+with these differences:
+- put_nowait() returns False when full instead of raising QueueFull,
+  so the producer can count a drop without exception overhead;
+  put_evicting() drops the oldest item instead
+- Storage is a preallocated list; consumers wait on one asyncio.Event
+  (set on empty → non-empty) instead of a Future per waiter
+- close() wakes every consumer at once; get() raises RingClosedError once the
+  ring is closed AND drained (no per-worker sentinel items)
+
+DropRateRing keeps the timestamps behind the providers' 60-second drop rates.
+"""
+
+import array
+import asyncio
+import bisect
+import time
+from typing import Any
+
+
+class RingClosedError(Exception):
+    """Raised by BoundedRing.get() when the ring is closed and empty"""
+
+
+class BoundedRing:
+    """
+    Fixed-capacity FIFO ring with asyncio wake-ups
+
+    Architecture:
+        producer → put_nowait() → [slot][slot][slot]... → get() → workers
+                      ↓ (False when full)
+                  caller counts drop
+
+    Args:
+        maxsize: Capacity (must be >= 1)
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError(f"BoundedRing maxsize must be >= 1, got {maxsize}")
+
+        self.maxsize = maxsize
+        self._buf: list[Any] = [None] * maxsize
+        self._head = 0  # Next slot to read
+        self._tail = 0  # Next slot to write
+        self._size = 0
+        self._unfinished = 0  # Items put but not yet task_done()
+        self._closed = False
+
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def qsize(self) -> int:
+        """Number of items currently buffered"""
+        return self._size
+
+    def empty(self) -> bool:
+        """True if no items are buffered"""
+        return self._size == 0
+
+    def full(self) -> bool:
+        """True if the ring is at capacity"""
+        return self._size == self.maxsize
+
+    def put_nowait(self, item: Any) -> bool:
+        """
+        Append item without waiting
+
+        Returns:
+            True if stored, False if the ring is full (item dropped)
+        """
+        size = self._size
+        if size == self.maxsize:
+            return False
+
+        tail = self._tail
+        self._buf[tail] = item
+        self._tail = tail + 1 if tail + 1 < self.maxsize else 0
+        self._size = size + 1
+        self._unfinished += 1
+        self._finished.clear()
+
+        if size == 0:
+            self._not_empty.set()
+        if size + 1 == self.maxsize:
+            self._not_full.clear()
+        return True
+
+    def put_many_nowait(self, items: list[Any]) -> int:
+        """
+        Append as many of items as fit, in order, without waiting
+
+        Event bookkeeping is done once for the whole batch.
+
+        Returns:
+            Number stored (the first n items); the rest are dropped
+        """
+        size = self._size
+        cap = self.maxsize
+        n = min(len(items), cap - size)
+        if n <= 0:
+            return 0
+
+        buf, tail = self._buf, self._tail
+        end = tail + n
+        if end <= cap:
+            buf[tail:end] = items[:n]
+        else:
+            # Batch wraps around the end of the buffer
+            first = cap - tail
+            buf[tail:] = items[:first]
+            end -= cap
+            buf[:end] = items[first:n]
+        self._tail = end if end < cap else 0
+        self._size = size + n
+        self._unfinished += n
+        self._finished.clear()
+
+        if size == 0:
+            self._not_empty.set()
+        if size + n == cap:
+            self._not_full.clear()
+        return n
+
+    def put_evicting(self, item: Any) -> bool:
+        """
+        Append item; if the ring is full, overwrite the oldest item instead
+
+        Drop-oldest overflow policy: the newest item is always stored. The
+        evicted item is never returned by get() and needs no task_done().
+
+        Returns:
+            True if the oldest item was evicted to make room
+        """
+        if self.put_nowait(item):
+            return False
+
+        # Full ring: head == tail, so the write slot holds the oldest item
+        tail = self._tail
+        self._buf[tail] = item
+        self._tail = self._head = tail + 1 if tail + 1 < self.maxsize else 0
+        return True
+
+    async def put(self, item: Any) -> None:
+        """Append item, waiting for a free slot if the ring is full"""
+        while not self.put_nowait(item):
+            await self._not_full.wait()
+
+    def get_nowait(self) -> Any:
+        """
+        Pop the oldest item without waiting
+
+        Raises:
+            asyncio.QueueEmpty: If the ring is empty
+        """
+        size = self._size
+        if size == 0:
+            raise asyncio.QueueEmpty
+
+        head = self._head
+        item = self._buf[head]
+        self._buf[head] = None  # Don't keep a reference to consumed items
+        self._head = head + 1 if head + 1 < self.maxsize else 0
+        self._size = size - 1
+
+        if size == 1:
+            self._not_empty.clear()
+        if size == self.maxsize:
+            self._not_full.set()
+        return item
+
+    async def get(self) -> Any:
+        """
+        Pop the oldest item, waiting until one is available
+
+        Raises:
+            RingClosedError: If close() was called and no items remain
+        """
+        # Several consumers may wake on one set(); losers just wait again
+        while self._size == 0:
+            if self._closed:
+                raise RingClosedError
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_many_nowait(self, max_items: int) -> list[Any]:
+        """
+        Pop up to max_items oldest items in one call (empty list if none)
+
+        Event bookkeeping is done once for the whole batch, so a consumer
+        draining a burst pays one call instead of one get_nowait() per item
+        plus a QueueEmpty at the end.
+        """
+        size = self._size
+        n = min(max_items, size)
+        if n <= 0:
+            return []
+
+        buf, head, cap = self._buf, self._head, self.maxsize
+        end = head + n
+        if end <= cap:
+            items = buf[head:end]
+            buf[head:end] = [None] * n
+        else:
+            # Batch wraps around the end of the buffer
+            end -= cap
+            items = buf[head:] + buf[:end]
+            buf[head:] = [None] * (cap - head)
+            buf[:end] = [None] * end
+        self._head = end if end < cap else 0
+        self._size = size - n
+
+        if n == size:
+            self._not_empty.clear()
+        if size == cap:
+            self._not_full.set()
+        return items
+
+    async def get_many(self, max_items: int) -> list[Any]:
+        """
+        Wait for at least one item, then pop up to max_items
+
+        Raises:
+            RingClosedError: If close() was called and no items remain
+        """
+        while self._size == 0:
+            if self._closed:
+                raise RingClosedError
+            await self._not_empty.wait()
+        return self.get_many_nowait(max_items)
+
+    def close(self) -> None:
+        """
+        Broadcast shutdown to all consumers
+
+        Buffered items are still returned by get(); once drained, get()
+        raises RingClosedError. Producers may keep calling put_nowait().
+        """
+        self._closed = True
+        self._not_empty.set()  # Wake all waiting getters
+
+    def task_done(self) -> None:
+        """Mark one previously fetched item as processed (see join())"""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every item put has been marked task_done()"""
+        if self._unfinished > 0:
+            await self._finished.wait()
+
+
+class DropRateRing:
+    """
+    Fixed-size ring of drop timestamps for "drops in the last 60 seconds"
+
+    Recording a drop is one store into a preallocated array (no list
+    trimming on the hot path); the 60-second window is only resolved when
+    rate_60s() is queried, by bisecting the time-ordered view of the ring.
+
+    Holds the most recent `capacity` drops, so the measurable rate tops out
+    at capacity / 60 per second (~17/sec at 1024) - above the panic
+    thresholds it feeds.
+
+    Args:
+        capacity: Number of timestamps kept (power of two)
+    """
+
+    WINDOW_SECS = 60
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1 or capacity & (capacity - 1):
+            raise ValueError(f"DropRateRing capacity must be a power of two, got {capacity}")
+
+        self._ring = array.array("d", [0.0] * capacity)
+        self._mask = capacity - 1
+        self._head = 0  # Total drops recorded; next slot is _head & _mask
+
+    def record(self, count: int = 1, now: float | None = None) -> None:
+        """Record `count` drops at `now` (time.monotonic() if omitted)"""
+        if now is None:
+            now = time.monotonic()
+        ring, mask, head = self._ring, self._mask, self._head
+        # Only the newest `capacity` timestamps can survive anyway
+        for i in range(head + max(0, count - mask - 1), head + count):
+            ring[i & mask] = now
+        self._head = head + count
+
+    def count_60s(self, now: float | None = None) -> int:
+        """Number of drops within the last 60 seconds (capped at capacity)"""
+        if now is None:
+            now = time.monotonic()
+        head, ring = self._head, self._ring
+        if head <= len(ring):
+            ordered = ring[:head]
+        else:
+            split = head & self._mask
+            ordered = ring[split:] + ring[:split]
+        return len(ordered) - bisect.bisect_right(ordered, now - self.WINDOW_SECS)
+
+    def rate_60s(self, now: float | None = None) -> float:
+        """Drops per second averaged over the last 60 seconds"""
+        return self.count_60s(now) / self.WINDOW_SECS
@@ -0,0 +1,34 @@
+"""
+JSON encoding for stream records (Kafka / Kinesis payloads)
+
+Uses orjson when installed (Rust encoder, returns bytes directly, native
+datetime/numpy support); falls back to the stdlib json module otherwise.
+
+Types orjson can't encode natively (Decimal prices) go through str(),
+same as the stdlib path. Datetimes are RFC 3339 (UTC as "Z") with orjson.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on optional dependency
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps_record(data: Any) -> bytes:
+    """
+    Encode a record as UTF-8 JSON bytes
+
+    Example:
+        >>> dumps_record({"price": Decimal("50000.5")})
+        b'{"price":"50000.5"}'
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(data, default=str).encode("utf-8")
@@ -4,7 +4,6 @@ AWS Kinesis implementation of stream client
 Works with both AWS and LocalStack
 """
 
-import json
 import logging
 from typing import Any
 
@@ -12,9 +11,12 @@ import aioboto3
 
 from config.settings import get_settings
 from core.interfaces.streaming_producer import BaseStreamProducer
+from core.utils.serialization import dumps_record
 
 logger = logging.getLogger(__name__)
 
+_PUT_RECORDS_MAX = 500  # Kinesis PutRecords limit per request
+
 
 class KinesisStreamProducer(BaseStreamProducer):
     """
@@ -28,12 +30,16 @@ class KinesisStreamProducer(BaseStreamProducer):
     """
 
     def __init__(self):
+        super().__init__()  # Initialize queue + workers from BaseStreamProducer
         self.settings = get_settings()
         self.session = aioboto3.Session()
         self.client = None
 
     async def connect(self) -> None:
-        """Initialize Kinesis client"""
+        """Initialize Kinesis client + start worker pool"""
+        # Start workers FIRST (BaseStreamProducer.connect())
+        await super().connect()
+
         try:
             # Create client context manager
             self.client = self.session.client(
@@ -50,12 +56,44 @@ class KinesisStreamProducer(BaseStreamProducer):
             logger.info(f"✓ Connected to Kinesis: {self.settings.AWS_ENDPOINT_URL or 'AWS'}")
         except Exception as e:
             logger.error(f"✗ Failed to connect to Kinesis: {e}")
+            self.client = None
+            await super().close()  # Don't leave workers running without a client
             raise
 
     async def _send_impl(self, stream_name: str, data: dict[str, Any], partition_key: str) -> None:
         """Required by BaseStreamProducer - delegates to send_record"""
         await self.send_record(stream_name, data, partition_key)
 
+    async def _send_many_impl(self, records: list[tuple[str, dict[str, Any], str]]) -> None:
+        """
+        Batched Kinesis send via PutRecords (called by worker from BaseStreamProducer)
+
+        Groups the worker batch by stream and sends each group in
+        PutRecords calls of up to 500 records, instead of one PutRecord
+        per record. Failures are logged, not raised.
+        """
+        if not self.client:
+            raise RuntimeError("Kinesis client not connected")
+
+        by_stream: dict[str, list[dict[str, Any]]] = {}
+        for stream_name, data, partition_key in records:
+            by_stream.setdefault(stream_name, []).append(
+                {"Data": dumps_record(data), "PartitionKey": partition_key}
+            )
+
+        for stream_name, entries in by_stream.items():
+            for start in range(0, len(entries), _PUT_RECORDS_MAX):
+                chunk = entries[start : start + _PUT_RECORDS_MAX]
+                try:
+                    response = await self.client.put_records(StreamName=stream_name, Records=chunk)
+                    failed = response.get("FailedRecordCount", 0)
+                    if failed:
+                        logger.warning(
+                            f"⚠ Kinesis PutRecords: {failed} records failed out of {len(chunk)}"
+                        )
+                except Exception as e:
+                    logger.error(f"✗ Kinesis PutRecords error ({len(chunk)} records): {e}")
+
     async def send_record(
         self, stream_name: str, data: dict[str, Any], partition_key: str
     ) -> dict[str, Any]:
@@ -76,7 +114,7 @@ class KinesisStreamProducer(BaseStreamProducer):
         try:
             response = await self.client.put_record(
                 StreamName=stream_name,
-                Data=json.dumps(data, default=str),  # default=str for Decimal/datetime
+                Data=dumps_record(data),  # str() for Decimal, RFC 3339 datetimes
                 PartitionKey=partition_key,
             )
             logger.debug(
@@ -106,7 +144,7 @@ class KinesisStreamProducer(BaseStreamProducer):
         try:
             kinesis_records = [
                 {
-                    "Data": json.dumps(record["data"], default=str),
+                    "Data": dumps_record(record["data"]),
                     "PartitionKey": record["partition_key"],
                 }
                 for record in records
@@ -131,7 +169,10 @@ class KinesisStreamProducer(BaseStreamProducer):
             raise
 
     async def close(self) -> None:
-        """Close client"""
+        """Stop workers (flushing the queue) + close client"""
+        # Stop workers + flush queue first (BaseStreamProducer.close()) - they need the client
+        await super().close()
+
         if self.client:
             try:
                 await self.client.__aexit__(None, None, None)
@@ -3,29 +3,321 @@ ClickHouse implementation of time-series database
 
 Provides high-performance columnar storage for market data
 
-Note: clickhouse_driver.Client is synchronous. All execute() calls are
-wrapped in asyncio.to_thread() to avoid blocking the event loop.
+Note: clickhouse_driver.Client is synchronous. All execute() calls run
+in threads to avoid blocking the event loop - inserts on the dedicated
+_CH_EXECUTOR, everything else via asyncio.to_thread().
 """
 
 import asyncio
+import bisect
 import contextlib
+import functools
 import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from clickhouse_driver import Client
 
 from config.settings import get_settings
-from core.interfaces.database import BaseTimeSeriesDB
+from core.interfaces.database import BaseTimeSeriesDB, IndicatorSet, TradeRow
 
 logger = logging.getLogger(__name__)
 
 
+# Upper bounds (seconds) of the pool wait histogram: 1ms, 2ms, 4ms ... ~8.2s, then overflow
+POOL_WAIT_BUCKETS = tuple(0.001 * 2**i for i in range(14))
+
+
+class _ConnectionPool:
+    """
+    Fixed-size slot array of idle connections
+
+    Checkout claims the first occupied slot (swaps None in), checkin writes the
+    connection back. Neither touches the event loop when a slot/connection is
+    available. When all connections are busy, acquire() parks a Future in a
+    FIFO waiter queue and release() hands the connection straight to the
+    oldest waiter.
+
+    With a factory (lazy mode), acquire() opens a new connection instead of
+    waiting while fewer than `size` connections exist.
+
+    Checkout latency is counted in pool_wait_seconds (one count per
+    POOL_WAIT_BUCKETS bound + overflow); immediate checkouts land in bucket 0.
+
+    Runs on a single event loop, so slot swaps need no locking.
+
+    Also exposes the asyncio.Queue subset used elsewhere (qsize/empty/get/put/
+    get_nowait) so callers and tests can treat it like the previous queue pool.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], Awaitable[Client]] | None = None):
+        self.size = size
+        self._slots: list[Client | None] = [None] * size
+        self._waiters: deque[asyncio.Future] = deque()
+        self._factory = factory
+        self._open = 0  # Connections owned by the pool (idle + checked out)
+        self.pool_wait_seconds = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+
+    def _record_wait(self, started: float) -> None:
+        """Count one checkout that waited since `started` (monotonic)"""
+        waited = time.monotonic() - started
+        self.pool_wait_seconds[bisect.bisect_left(POOL_WAIT_BUCKETS, waited)] += 1
+
+    def add(self, conn: Client) -> None:
+        """Seed a newly opened connection into the pool"""
+        self._open += 1
+        self.release(conn)
+
+    def discard(self) -> None:
+        """Forget a checked-out connection that was closed and not replaced"""
+        self._open -= 1
+
+    @property
+    def open_count(self) -> int:
+        """Connections owned by the pool (idle + checked out)"""
+        return self._open
+
+    def try_acquire(self) -> Client | None:
+        """Claim an idle connection without waiting (None if all busy)"""
+        slots = self._slots
+        for i in range(len(slots)):
+            conn = slots[i]
+            if conn is not None:
+                slots[i] = None
+                return conn
+        return None
+
+    def try_acquire_slot(self, index: int) -> Client | None:
+        """Claim the idle connection in a specific slot (None if empty/checked out)"""
+        conn = self._slots[index]
+        self._slots[index] = None
+        return conn
+
+    async def acquire(self) -> Client:
+        """Claim an idle connection, waiting (FIFO) if all are busy"""
+        conn = self.try_acquire()
+        if conn is not None:
+            self.pool_wait_seconds[0] += 1
+            return conn
+
+        started = time.monotonic()
+        if self._factory is not None and self._open < len(self._slots):
+            # Lazy growth: open a new connection rather than wait
+            self._open += 1
+            try:
+                conn = await self._factory()
+            except BaseException:
+                self._open -= 1
+                raise
+            self._record_wait(started)
+            return conn
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            conn = await waiter
+            self._record_wait(started)
+            return conn
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Connection was handed to us just as we were cancelled - pass it on
+                self.release(waiter.result())
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self, conn: Client) -> None:
+        """Return a connection: hand off to the oldest waiter, else store in a free slot"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(conn)
+                return
+
+        slots = self._slots
+        for i in range(len(slots)):
+            if slots[i] is None:
+                slots[i] = conn
+                return
+
+        raise RuntimeError("ClickHouse pool overflow: released more connections than slots")
+
+    # asyncio.Queue-compatible surface
+    def qsize(self) -> int:
+        """Number of idle connections"""
+        return sum(1 for conn in self._slots if conn is not None)
+
+    def empty(self) -> bool:
+        """True if no idle connections"""
+        return all(conn is None for conn in self._slots)
+
+    def get_nowait(self) -> Client:
+        """Claim an idle connection (raises asyncio.QueueEmpty if all busy)"""
+        conn = self.try_acquire()
+        if conn is None:
+            raise asyncio.QueueEmpty
+        return conn
+
+    async def get(self) -> Client:
+        """Alias for acquire()"""
+        return await self.acquire()
+
+    async def put(self, conn: Client) -> None:
+        """Alias for release()"""
+        self.release(conn)
+
+
+# INSERT statements are built once at import, not per call
+_TRADE_COLUMNS = (
+    "timestamp",
+    "exchange",
+    "symbol",
+    "trade_id",
+    "price",
+    "quantity",
+    "side",
+    "is_buyer_maker",
+)
+_TRADES_INSERT_SQL = f"INSERT INTO trading.market_trades ({', '.join(_TRADE_COLUMNS)}) VALUES"
+
+_CANDLE_TABLES = {"1m": "candles_1m", "5m": "candles_5m", "1h": "candles_1h"}
+_CANDLE_COLUMNS = (
+    "timestamp",
+    "exchange",
+    "symbol",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "quote_volume",
+    "trades_count",
+    "is_synthetic",
+)
+_CANDLES_INSERT_SQL = {
+    timeframe: f"INSERT INTO trading.{table} ({', '.join(_CANDLE_COLUMNS)}) VALUES"
+    for timeframe, table in _CANDLE_TABLES.items()
+}
+
+
+# Process-wide pool for blocking INSERTs (trade blocks, indicators, candles,
+# orderbooks), so inserts don't queue behind other to_thread() users of the
+# loop's default executor. One thread per pooled connection - every INSERT
+# holds a connection while it runs, so more threads could never be busy.
+# Created by the first connect(), shut down by the last close().
+_CH_EXECUTOR: ThreadPoolExecutor | None = None
+_CH_EXECUTOR_USERS = 0  # Connected clients sharing _CH_EXECUTOR
+
+
+def _acquire_insert_executor(size: int) -> None:
+    """Create _CH_EXECUTOR with `size` threads if needed + register one user"""
+    global _CH_EXECUTOR, _CH_EXECUTOR_USERS
+    if _CH_EXECUTOR is None:
+        _CH_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, size), thread_name_prefix="ch-insert")
+    _CH_EXECUTOR_USERS += 1
+
+
+def _release_insert_executor() -> None:
+    """Unregister one user; the last one shuts _CH_EXECUTOR down"""
+    global _CH_EXECUTOR, _CH_EXECUTOR_USERS
+    _CH_EXECUTOR_USERS -= 1
+    if _CH_EXECUTOR_USERS <= 0 and _CH_EXECUTOR is not None:
+        _CH_EXECUTOR.shutdown(wait=False)
+        _CH_EXECUTOR = None
+        _CH_EXECUTOR_USERS = 0
+
+
+async def _run_insert(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking driver call on _CH_EXECUTOR"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_CH_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+
+_INDICATORS_INSERT = """
+    INSERT INTO trading.indicators
+    (timestamp, exchange, symbol, timeframe, indicator_name, indicator_value)
+    VALUES
+"""
+
+
+def _indicator_sets_to_columns(indicator_sets: list[IndicatorSet]) -> list[list]:
+    """
+    Unpivot indicator sets into one list per trading.indicators column
+
+    One row per (set, indicator name), in _INDICATORS_INSERT column order.
+    Built column by column - the per-set fields are repeated with one list
+    extend each, no per-row tuples for the driver to transpose again.
+    Used with Client.execute(..., columnar=True).
+    """
+    timestamps: list = []
+    exchanges: list[str] = []
+    symbols: list[str] = []
+    timeframes: list[str] = []
+    names: list[str] = []
+    values: list[float] = []
+
+    for exchange, symbol, timeframe, timestamp, indicators in indicator_sets:
+        count = len(indicators)
+        timestamps += [timestamp] * count
+        exchanges += [exchange] * count
+        symbols += [symbol] * count
+        timeframes += [timeframe] * count
+        names += indicators.keys()
+        values += map(float, indicators.values())
+
+    return [timestamps, exchanges, symbols, timeframes, names, values]
+
+
+def _insert_indicator_sets(conn: Client, indicator_sets: list[IndicatorSet]) -> int:
+    """
+    Unpivot indicator sets to columns and INSERT them (runs on _CH_EXECUTOR)
+
+    Column building happens here rather than on the event loop, so a large
+    batch's marshaling doesn't stall it. Columnar, like market_trades: the
+    driver encodes each column straight into the native block.
+    """
+    columns = _indicator_sets_to_columns(indicator_sets)
+    conn.execute(_INDICATORS_INSERT, columns, columnar=True)
+    return len(columns[0])
+
+
+def _trades_to_columns(trades: list[TradeRow]) -> list[list]:
+    """
+    Transpose trade rows into one list per market_trades column
+
+    TradeRow fields are already in _TRADE_COLUMNS order with insert-ready
+    types, so this is a single zip(*rows).
+    Used with Client.execute(..., columnar=True).
+    """
+    return [list(column) for column in zip(*trades, strict=True)]
+
+
+class _Session:
+    """Connection bound to one task for the duration of ClickHouseClient.session()"""
+
+    __slots__ = ("conn", "task")
+
+    def __init__(self, task: asyncio.Task | None):
+        self.conn: Client | None = None  # Checked out on first use
+        self.task = task
+
+
+# Current task's session (ContextVar so it follows the task, not the client)
+_session: ContextVar[_Session | None] = ContextVar("clickhouse_session", default=None)
+
+
 class ClickHouseClient(BaseTimeSeriesDB):
     """
     ClickHouse implementation with connection pooling + worker pool
 
     Architecture:
-        StreamProcessor → enqueue_trades() → Queue → Workers → Pool → ClickHouse
+        StreamProcessor → enqueue_trades() → Buffer → Workers → Pool → ClickHouse
                               ↓ (put_nowait, fast)       ↓ (get connection)
                           Non-blocking              Connection pool
 
@@ -40,14 +332,37 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
     Connection Pooling:
     - Each worker gets a connection from pool (blocks if all busy)
-    - Poisoned connections are replaced automatically
+    - Poisoned connections are replaced automatically (on error + background ping)
     - Pool size configurable via databases.yaml (clickhouse.pool_size)
+
+    Block Buffering:
+    - Worker batches accumulate until block_rows (default 65536, one native
+      block) or flush_ms elapses, then go out as a single INSERT
+    - Amortizes per-insert part creation on the MergeTree side
+    - A failed block is re-queued for the next flush; the buffer is capped
+      at 2 * block_rows (oldest rows dropped + counted past that), so a
+      crash or outage loses at most that many rows
     """
 
     def __init__(self):
         super().__init__()  # Initialize queue + workers from BaseTimeSeriesDB
         self.settings = get_settings()
-        self._pool: asyncio.Queue[Client] | None = None
+        self._pool: _ConnectionPool | None = None
+
+        # Pre-flush block buffer (see _insert_trades_impl)
+        self._insert_buffer: list[TradeRow] = []
+        self._last_flush = time.monotonic()
+        self._block_rows = 1
+        self._max_buffer_rows = 2  # 2 * block_rows: a re-queued block + the next one
+        self._flush_interval = 0.0
+        self._flush_task: asyncio.Task | None = None
+
+        self._uses_executor = False  # Holds a _CH_EXECUTOR reference (connect → close)
+
+        # Idle connection health check + refill (see _pinger)
+        self._ping_interval = 0.0
+        self._pool_floor = 0  # Connections the pinger keeps open (initial pool size)
+        self._ping_task: asyncio.Task | None = None
 
     async def connect(self) -> None:
         """Connect to ClickHouse + start worker pool"""
@@ -56,23 +371,59 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         # 2. Create connection pool
         pool_size = self.settings.CLICKHOUSE_POOL_SIZE
-        self._pool = asyncio.Queue(maxsize=pool_size)
+        if self.settings.CLICKHOUSE_LAZY_POOL:
+            # Open min_pool_size now, the rest on first checkout
+            initial = max(1, min(self.settings.CLICKHOUSE_MIN_POOL_SIZE, pool_size))
+            self._pool = _ConnectionPool(pool_size, factory=self._create_connection)
+        else:
+            initial = pool_size
+            self._pool = _ConnectionPool(pool_size)
 
         logger.info(
             f"Creating ClickHouse connection pool "
-            f"(size={pool_size}, host={self.settings.CLICKHOUSE_HOST}:{self.settings.CLICKHOUSE_PORT})..."
+            f"(size={pool_size}, initial={initial}, "
+            f"host={self.settings.CLICKHOUSE_HOST}:{self.settings.CLICKHOUSE_PORT})..."
         )
 
-        for i in range(pool_size):
-            try:
-                conn = await self._create_connection()
-                await self._pool.put(conn)
-                logger.debug(f"  ✓ Connection {i + 1}/{pool_size} added to pool")
-            except Exception as e:
-                logger.error(f"Failed to create connection {i + 1}: {e}")
-                raise
-
-        logger.info(f"✓ ClickHouse pool ready with {pool_size} connections")
+        # Open connections concurrently: startup pays one handshake RTT, not N
+        results = await asyncio.gather(
+            *(self._create_connection() for _ in range(initial)), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Don't leak the connections that did succeed
+            for conn in results:
+                if not isinstance(conn, BaseException):
+                    with contextlib.suppress(Exception):
+                        conn.disconnect()
+            logger.error(f"Failed to create {len(errors)}/{initial} connections: {errors[0]}")
+            raise errors[0]
+
+        for conn in results:
+            self._pool.add(conn)
+        self._pool_floor = initial
+
+        logger.info(f"✓ ClickHouse pool ready with {initial}/{pool_size} connections")
+
+        # One insert thread per pooled connection (process-wide, shared by all clients)
+        _acquire_insert_executor(pool_size)
+        self._uses_executor = True
+
+        # 3. Block buffer: time bound enforced by a background flusher
+        self._block_rows = max(1, self.settings.CLICKHOUSE_BLOCK_ROWS)
+        self._max_buffer_rows = 2 * self._block_rows
+        self._flush_interval = max(0, self.settings.CLICKHOUSE_FLUSH_MS) / 1000
+        self._last_flush = time.monotonic()
+        if self._block_rows > 1 and self._flush_interval > 0:
+            self._flush_task = asyncio.create_task(
+                self._flush_loop(), name="clickhouse-block-flusher"
+            )
+
+        # 4. Background pinger replaces dead idle connections between inserts
+        #    and reopens ones lost to failed replacements
+        self._ping_interval = max(0, self.settings.CLICKHOUSE_PING_INTERVAL_S)
+        if self._ping_interval > 0:
+            self._ping_task = asyncio.create_task(self._pinger(), name="clickhouse-pinger")
 
     async def _create_connection(self) -> Client:
         """
@@ -81,6 +432,7 @@ class ClickHouseClient(BaseTimeSeriesDB):
         Called during:
         - Initial pool creation (connect())
         - Poison connection recovery (all insert/query methods)
+        - Pool refill after failed recovery (_pinger())
 
         Returns:
             Connected ClickHouse Client
@@ -94,6 +446,9 @@ class ClickHouseClient(BaseTimeSeriesDB):
             database=self.settings.CLICKHOUSE_DB,
             user=self.settings.CLICKHOUSE_USER,
             password=self.settings.CLICKHOUSE_PASSWORD,
+            # Driver splits INSERT data into native blocks of this many rows
+            # (default 1,048,576) - large indicator flushes go out block-aligned
+            settings={"insert_block_size": max(1, self.settings.CLICKHOUSE_BLOCK_ROWS)},
         )
 
         # Test connection with simple query
@@ -101,7 +456,220 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         return conn
 
-    async def _insert_trades_impl(self, trades: list[dict[str, Any]]) -> int:
+    @asynccontextmanager
+    async def session(self):
+        """
+        Pin one pooled connection to the current task for a block of operations
+
+        Every insert/query inside the block reuses the same connection instead
+        of a pool checkout + release per call; it goes back to the pool on exit.
+        Tasks spawned inside the block don't share it (they use the pool as usual).
+        Nested sessions reuse the outer one.
+
+        Example:
+            >>> async with clickhouse.session():
+            ...     candles = await clickhouse.query_candles("binance", "BTCUSDT", "1m")
+            ...     await clickhouse.insert_indicators(...)
+        """
+        current = _session.get()
+        if current is not None and current.task is asyncio.current_task():
+            yield
+            return
+
+        held = _Session(asyncio.current_task())
+        token = _session.set(held)
+        try:
+            yield
+        finally:
+            _session.reset(token)
+            if held.conn is not None:
+                self._pool.release(held.conn)
+
+    async def _acquire(self) -> tuple[Client, bool]:
+        """
+        Get a connection for one operation
+
+        Returns:
+            (connection, owned) - owned=False means it belongs to the current
+            session and must not be released by the caller
+        """
+        held = _session.get()
+        if held is None or held.task is not asyncio.current_task():
+            return await self._pool.acquire(), True
+
+        if held.conn is None:
+            held.conn = await self._pool.acquire()
+        return held.conn, False
+
+    def _release(self, conn: Client, owned: bool) -> None:
+        """Return a connection from _acquire() (session connections stay checked out)"""
+        if owned:
+            self._pool.release(conn)
+        else:
+            # May be a replacement for a poisoned session connection
+            _session.get().conn = conn
+
+    async def _replace_poisoned(self, conn: Client) -> Client:
+        """
+        Disconnect a broken connection and open a replacement
+
+        Detection is lazy: callers only get here when a real query/insert
+        raised on the connection (idle connections are checked by _pinger()).
+
+        Returns:
+            New connection (caller returns it to the pool)
+
+        Raises:
+            Exception if the replacement can't be created. The broken
+            connection is NOT returned - pool size is reduced by 1 until
+            the pinger reopens it (lazy pools also regrow on demand).
+        """
+        with contextlib.suppress(Exception):
+            conn.disconnect()
+
+        # Never hand the dead connection back via session exit
+        held = _session.get()
+        if held is not None and held.conn is conn:
+            held.conn = None
+
+        try:
+            new_conn = await self._create_connection()
+        except Exception as e:
+            self._pool.discard()
+            logger.critical(
+                f"Failed to recreate ClickHouse connection: {e}. "
+                f"Pool size reduced to {self._pool.open_count}/{self._pool.size}"
+            )
+            raise
+
+        logger.warning("Replaced poisoned connection with new one")
+        return new_conn
+
+    async def _pinger(self) -> None:
+        """
+        Background health check - every ping interval:
+
+        1. SELECT 1 on every idle connection concurrently; broken ones are
+           replaced via _replace_poisoned() before going back to the pool
+        2. Reopen connections lost to failed replacements (back up to the
+           initial pool size)
+
+        After a server restart the whole pool heals in about one ping round,
+        however many connections it has, instead of callers hitting one
+        failure per poisoned connection.
+        """
+        while True:
+            await asyncio.sleep(self._ping_interval)
+            await asyncio.gather(*(self._ping_slot(i) for i in range(self._pool.size)))
+            await self._refill_pool()
+
+    async def _ping_slot(self, index: int) -> None:
+        """Check the idle connection in one slot (checked-out slots are skipped)"""
+        conn = self._pool.try_acquire_slot(index)
+        if conn is None:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(conn.execute, "SELECT 1"), timeout=self._ping_interval
+            )
+        except Exception as e:
+            logger.warning(f"ClickHouse ping failed, replacing connection: {e!r}")
+            try:
+                conn = await self._replace_poisoned(conn)
+            except Exception:
+                return  # Already logged; _refill_pool() retries
+        self._pool.release(conn)
+
+    async def _refill_pool(self) -> None:
+        """Open connections concurrently until the pool is back at its initial size"""
+        missing = self._pool_floor - self._pool.open_count
+        if missing <= 0:
+            return
+
+        results = await asyncio.gather(
+            *(self._create_connection() for _ in range(missing)), return_exceptions=True
+        )
+        opened = 0
+        for conn in results:
+            if isinstance(conn, BaseException):
+                continue
+            self._pool.add(conn)
+            opened += 1
+
+        if opened < missing:
+            logger.warning(f"ClickHouse pool refill: reopened {opened}/{missing} connections")
+        else:
+            logger.info(f"✓ ClickHouse pool refilled ({opened} connections reopened)")
+
+    async def _insert_trades_impl(self, trades: list[TradeRow]) -> int:
+        """
+        Buffer worker batches into ClickHouse-sized blocks
+
+        Flushes when the buffer reaches block_rows or flush_ms has passed
+        since the last flush (block_rows=1 flushes every call). A failed
+        flush keeps its rows for the next one (_requeue_block).
+
+        Args:
+            trades: Batched trade data (from BaseTimeSeriesDB worker)
+
+        Returns:
+            Number of rows accepted by this call (buffered or inserted)
+        """
+        if not trades:
+            return 0
+
+        # Copy in: the worker reuses its batch list after we return
+        self._insert_buffer.extend(trades)
+
+        if (
+            len(self._insert_buffer) >= self._block_rows
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            await self._flush_buffer()
+        return len(trades)
+
+    async def _flush_buffer(self) -> int:
+        """Swap out the block buffer and insert it (no-op if empty); re-queue it on failure"""
+        batch, self._insert_buffer = self._insert_buffer, []
+        self._last_flush = time.monotonic()
+        if not batch:
+            return 0
+
+        inserted = await self._flush_impl(batch)
+        if not inserted:
+            self._requeue_block(batch)
+        return inserted
+
+    def _requeue_block(self, batch: list[TradeRow]) -> None:
+        """
+        Put a failed block back ahead of rows buffered since, for the next flush
+
+        Capped at _max_buffer_rows: past that the oldest rows are dropped
+        (and counted in _dropped_trades), bounding memory and the loss
+        while ClickHouse is down.
+        """
+        buffer = batch + self._insert_buffer
+        overflow = len(buffer) - self._max_buffer_rows
+        if overflow > 0:
+            del buffer[:overflow]
+            self._dropped_trades += overflow
+            logger.error(
+                f"✗ ClickHouse insert buffer full after failed flush: "
+                f"dropped {overflow} oldest trades (total: {self._dropped_trades})"
+            )
+        self._insert_buffer = buffer
+
+    async def _flush_loop(self) -> None:
+        """Background flusher - bounds how long buffered trades wait for a full block"""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if self._insert_buffer and time.monotonic() - self._last_flush >= self._flush_interval:
+                try:
+                    await self._flush_buffer()
+                except Exception as e:
+                    logger.error(f"ClickHouse block flush error: {e}", exc_info=True)
+
+    async def _flush_impl(self, trades: list[TradeRow]) -> int:
         """
         ClickHouse batch insert with connection pooling.
 
@@ -116,7 +684,7 @@ class ClickHouseClient(BaseTimeSeriesDB):
            - If recreate fails: DO NOT return broken conn, log critical error
 
         Args:
-            trades: Batched trade data (from BaseTimeSeriesDB worker)
+            trades: One block of trades (from _flush_buffer)
 
         Returns:
             Number of rows inserted (0 if failed)
@@ -127,37 +695,19 @@ class ClickHouseClient(BaseTimeSeriesDB):
         if not self._pool:
             raise RuntimeError("ClickHouse pool not initialized")
 
-        # Get connection from pool (blocks if all connections busy)
-        conn = await self._pool.get()
+        # Get connection from pool (waits only if all connections busy)
+        conn, owned = await self._acquire()
         poisoned = False
 
         try:
-            # Convert to format expected by ClickHouse
-            rows = [
-                (
-                    trade["timestamp"],
-                    trade["exchange"],
-                    trade["symbol"],
-                    trade["trade_id"],
-                    float(trade["price"]),
-                    float(trade["quantity"]),
-                    trade["side"],
-                    1 if trade["is_buyer_maker"] else 0,
-                )
-                for trade in trades
-            ]
-
-            query = """
-                INSERT INTO trading.market_trades
-                (timestamp, exchange, symbol, trade_id, price, quantity, side, is_buyer_maker)
-                VALUES
-            """
+            # Column-oriented payload: driver serializes each column in one pass
+            columns = _trades_to_columns(trades)
 
-            # Execute in thread pool (sync driver)
-            await asyncio.to_thread(conn.execute, query, rows)
+            # Execute on the insert thread pool (sync driver)
+            await _run_insert(conn.execute, _TRADES_INSERT_SQL, columns, columnar=True)
 
-            logger.debug(f"Inserted {len(rows)} trades into ClickHouse")
-            return len(rows)
+            logger.debug(f"Inserted {len(trades)} trades into ClickHouse")
+            return len(trades)
 
         except Exception as e:
             # Connection is poisoned
@@ -167,28 +717,14 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         finally:
             if poisoned:
-                # Attempt to recover from poison
-                with contextlib.suppress(Exception):
-                    conn.disconnect()
-
                 try:
-                    # Try to create a new connection
-                    conn = await self._create_connection()
-                    logger.warning("Replaced poisoned connection with new one")
-
-                except Exception as e:
-                    # Failed to recreate connection
-                    logger.critical(
-                        f"Failed to recreate ClickHouse connection: {e}. "
-                        f"Pool size reduced by 1 (was {self.settings.CLICKHOUSE_POOL_SIZE})"
-                    )
+                    conn = await self._replace_poisoned(conn)
+                except Exception:
                     # DO NOT put broken conn back to pool
-                    # Just return - pool size permanently reduced by 1
-                    # Operator must restart service to restore full pool
                     return 0
 
             # Return connection to pool (either original or recreated)
-            await self._pool.put(conn)
+            self._release(conn, owned)
 
     async def query(self, sql: str, params: dict | None = None) -> list[dict]:
         """
@@ -205,7 +741,7 @@ class ClickHouseClient(BaseTimeSeriesDB):
             raise RuntimeError("ClickHouse pool not initialized")
 
         # Get connection from pool
-        conn = await self._pool.get()
+        conn, owned = await self._acquire()
         poisoned = False
 
         try:
@@ -229,16 +765,9 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         finally:
             if poisoned:
-                with contextlib.suppress(Exception):
-                    conn.disconnect()
-                try:
-                    conn = await self._create_connection()
-                    logger.warning("Replaced poisoned connection")
-                except Exception as e:
-                    logger.critical(f"Failed to recreate connection: {e}")
-                    raise  # Query methods should raise on connection failure
+                conn = await self._replace_poisoned(conn)  # Raises if recreate fails
 
-            await self._pool.put(conn)
+            self._release(conn, owned)
 
     async def insert_orderbooks(self, orderbooks: list[dict[str, Any]]) -> int:
         """
@@ -261,7 +790,7 @@ class ClickHouseClient(BaseTimeSeriesDB):
         if not self._pool:
             raise RuntimeError("ClickHouse pool not initialized")
 
-        conn = await self._pool.get()
+        conn, owned = await self._acquire()
         poisoned = False
 
         try:
@@ -284,7 +813,7 @@ class ClickHouseClient(BaseTimeSeriesDB):
                 VALUES
             """
 
-            await asyncio.to_thread(conn.execute, query, rows)
+            await _run_insert(conn.execute, query, rows)
             logger.debug(f"Inserted {len(rows)} order book snapshots into ClickHouse")
             return len(rows)
 
@@ -295,16 +824,9 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         finally:
             if poisoned:
-                with contextlib.suppress(Exception):
-                    conn.disconnect()
-                try:
-                    conn = await self._create_connection()
-                    logger.warning("Replaced poisoned connection")
-                except Exception as e:
-                    logger.critical(f"Failed to recreate connection: {e}")
-                    raise
+                conn = await self._replace_poisoned(conn)  # Raises if recreate fails
 
-            await self._pool.put(conn)
+            self._release(conn, owned)
 
     async def insert_candles(self, candles: list[dict[str, Any]], timeframe: str = "1m") -> int:
         """
@@ -323,16 +845,14 @@ class ClickHouseClient(BaseTimeSeriesDB):
         if not self._pool:
             raise RuntimeError("ClickHouse pool not initialized")
 
-        conn = await self._pool.get()
+        query = _CANDLES_INSERT_SQL.get(timeframe)
+        if not query:
+            raise ValueError(f"Unsupported timeframe for insert: {timeframe}")
+
+        conn, owned = await self._acquire()
         poisoned = False
 
         try:
-            # Map timeframe to table name
-            table_mapping = {"1m": "candles_1m", "5m": "candles_5m", "1h": "candles_1h"}
-            table = table_mapping.get(timeframe)
-            if not table:
-                raise ValueError(f"Unsupported timeframe for insert: {timeframe}")
-
             rows = [
                 (
                     candle["timestamp"],
@@ -350,15 +870,8 @@ class ClickHouseClient(BaseTimeSeriesDB):
                 for candle in candles
             ]
 
-            query = f"""
-                INSERT INTO trading.{table}
-                (timestamp, exchange, symbol, open, high, low, close,
-                 volume, quote_volume, trades_count, is_synthetic)
-                VALUES
-            """
-
-            await asyncio.to_thread(conn.execute, query, rows)
-            logger.debug(f"Inserted {len(rows)} candles into trading.{table}")
+            await _run_insert(conn.execute, query, rows)
+            logger.debug(f"Inserted {len(rows)} candles into trading.{_CANDLE_TABLES[timeframe]}")
             return len(rows)
 
         except Exception as e:
@@ -368,16 +881,9 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         finally:
             if poisoned:
-                with contextlib.suppress(Exception):
-                    conn.disconnect()
-                try:
-                    conn = await self._create_connection()
-                    logger.warning("Replaced poisoned connection")
-                except Exception as e:
-                    logger.critical(f"Failed to recreate connection: {e}")
-                    raise
+                conn = await self._replace_poisoned(conn)  # Raises if recreate fails
 
-            await self._pool.put(conn)
+            self._release(conn, owned)
 
     async def query_candles(
         self,
@@ -407,13 +913,12 @@ class ClickHouseClient(BaseTimeSeriesDB):
         if not self._pool:
             raise RuntimeError("ClickHouse pool not initialized")
 
-        conn = await self._pool.get()
+        conn, owned = await self._acquire()
         poisoned = False
 
         try:
             # Map timeframe to table name
-            table_mapping = {"1m": "candles_1m", "5m": "candles_5m", "1h": "candles_1h"}
-            table = table_mapping.get(timeframe, "candles_1m")
+            table = _CANDLE_TABLES.get(timeframe, "candles_1m")
 
             # Build query
             query = f"""
@@ -463,16 +968,9 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         finally:
             if poisoned:
-                with contextlib.suppress(Exception):
-                    conn.disconnect()
-                try:
-                    conn = await self._create_connection()
-                    logger.warning("Replaced poisoned connection")
-                except Exception as e:
-                    logger.critical(f"Failed to recreate connection: {e}")
-                    raise
+                conn = await self._replace_poisoned(conn)  # Raises if recreate fails
 
-            await self._pool.put(conn)
+            self._release(conn, owned)
 
     async def insert_indicators(
         self,
@@ -483,7 +981,7 @@ class ClickHouseClient(BaseTimeSeriesDB):
         indicators: dict[str, float],
     ) -> int:
         """
-        Insert indicator values with connection pooling
+        Insert indicator values for one candle
 
         Uses ReplacingMergeTree for automatic deduplication
         ORDER BY (exchange, symbol, timeframe, indicator_name, timestamp)
@@ -498,31 +996,36 @@ class ClickHouseClient(BaseTimeSeriesDB):
         Returns:
             Number of rows inserted
         """
-        if not indicators:
+        return await self.insert_indicators_bulk(
+            [IndicatorSet(exchange, symbol, timeframe, timestamp, indicators)]
+        )
+
+    async def insert_indicators_bulk(self, indicator_sets: list[IndicatorSet]) -> int:
+        """
+        Insert indicator values for many candles in ONE INSERT
+
+        Sent as native blocks of at most clickhouse.block_rows rows each
+        (the connection's insert_block_size), however big the batch.
+
+        Args:
+            indicator_sets: (exchange, symbol, timeframe, timestamp, indicators) per candle
+
+        Returns:
+            Number of rows inserted
+        """
+        if not any(indicators for *_, indicators in indicator_sets):
             return 0
 
         if not self._pool:
             raise RuntimeError("ClickHouse pool not initialized")
 
-        conn = await self._pool.get()
+        conn, owned = await self._acquire()
         poisoned = False
 
         try:
-            # Convert to rows format
-            rows = [
-                (timestamp, exchange, symbol, timeframe, indicator_name, float(value))
-                for indicator_name, value in indicators.items()
-            ]
-
-            query = """
-                INSERT INTO trading.indicators
-                (timestamp, exchange, symbol, timeframe, indicator_name, indicator_value)
-                VALUES
-            """
-
-            await asyncio.to_thread(conn.execute, query, rows)
-            logger.debug(f"Inserted {len(rows)} indicators for {exchange}/{symbol}/{timeframe}")
-            return len(rows)
+            count = await _run_insert(_insert_indicator_sets, conn, indicator_sets)
+            logger.debug(f"Inserted {count} indicators for {len(indicator_sets)} candles")
+            return count
 
         except Exception as e:
             poisoned = True
@@ -531,34 +1034,49 @@ class ClickHouseClient(BaseTimeSeriesDB):
 
         finally:
             if poisoned:
-                with contextlib.suppress(Exception):
-                    conn.disconnect()
-                try:
-                    conn = await self._create_connection()
-                    logger.warning("Replaced poisoned connection")
-                except Exception as e:
-                    logger.critical(f"Failed to recreate connection: {e}")
-                    raise
+                conn = await self._replace_poisoned(conn)  # Raises if recreate fails
 
-            await self._pool.put(conn)
+            self._release(conn, owned)
 
     async def close(self) -> None:
         """Stop workers + close all pooled ClickHouse connections"""
         # 1. Stop workers first (will flush queue) - BaseTimeSeriesDB.close()
         await super().close()
 
-        # 2. Close all connections in pool
+        # 2. Stop pinger + background flusher, then flush the partial block
+        if self._ping_task:
+            self._ping_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._ping_task
+            self._ping_task = None
+        if self._flush_task:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        if self._pool and self._insert_buffer:
+            try:
+                await self._flush_buffer()
+            except Exception as e:
+                logger.error(f"Final ClickHouse block flush failed: {e}")
+            if self._insert_buffer:
+                # Final flush failed - nothing left to retry it
+                self._dropped_trades += len(self._insert_buffer)
+                logger.error(f"✗ Dropped {len(self._insert_buffer)} unflushed trades on close")
+                self._insert_buffer = []
+        if self._uses_executor:
+            _release_insert_executor()
+            self._uses_executor = False
+
+        # 3. Close all connections in pool
         if self._pool:
             logger.info("Closing ClickHouse connection pool...")
             closed_count = 0
 
-            while not self._pool.empty():
+            while (conn := self._pool.try_acquire()) is not None:
                 try:
-                    conn = await asyncio.wait_for(self._pool.get(), timeout=1.0)
                     conn.disconnect()
                     closed_count += 1
-                except TimeoutError:
-                    break
                 except Exception as e:
                     logger.warning(f"Error closing connection: {e}")
 
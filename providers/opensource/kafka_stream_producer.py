@@ -7,7 +7,6 @@ NEW (Phase 2 WebSocket Stability): Uses queued interface pattern from BaseStream
 """
 
 import asyncio
-import json
 import logging
 from typing import Any
 
@@ -15,6 +14,7 @@ from aiokafka import AIOKafkaProducer
 
 from config.settings import get_settings
 from core.interfaces.streaming_producer import BaseStreamProducer
+from core.utils.serialization import dumps_record
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ class KafkaStreamProducer(BaseStreamProducer):
         try:
             self.producer = AIOKafkaProducer(
                 bootstrap_servers=self.settings.KAFKA_BOOTSTRAP_SERVERS,
-                value_serializer=lambda v: json.dumps(v, default=str).encode("utf-8"),
+                value_serializer=dumps_record,  # orjson when installed
                 key_serializer=lambda k: k.encode("utf-8") if k else None,
                 compression_type="gzip",  # Compress messages
                 acks=0,  # Fire-and-forget (no broker ack wait)
@@ -82,6 +82,27 @@ class KafkaStreamProducer(BaseStreamProducer):
             logger.error(f"✗ Kafka send error: {e}")
             # Don't raise - worker continues processing other messages
 
+    async def _send_many_impl(self, records: list[tuple[str, dict[str, Any], str]]) -> None:
+        """
+        Batched Kafka send (called by worker from BaseStreamProducer)
+
+        Starts every producer.send() first, then awaits them together -
+        the whole worker batch lands in the producer's accumulator in one
+        go instead of one await per record. Failures are counted, not raised.
+        """
+        if not self.producer:
+            raise RuntimeError("Kafka producer not connected")
+
+        send = self.producer.send
+        results = await asyncio.gather(
+            *(send(topic=topic, value=data, key=key) for topic, data, key in records),
+            return_exceptions=True,
+        )
+
+        failed = sum(isinstance(result, BaseException) for result in results)
+        if failed:
+            logger.error(f"✗ Kafka send error: {failed}/{len(records)} records failed")
+
     async def send_batch(self, stream_name: str, records: list[dict[str, Any]]) -> dict[str, Any]:
         """
         Send batch of records (more efficient)
@@ -12,7 +12,7 @@ from datetime import timedelta
 from redis.asyncio import Redis
 
 from config.settings import get_settings
-from core.interfaces.cache import BaseCacheClient
+from core.interfaces.cache import BaseCacheClient, SetOp
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +48,15 @@ class RedisClient(BaseCacheClient):
 
         # Then connect to Redis
         try:
-            self.client = Redis.from_url(self.settings.redis_url, decode_responses=True)
+            self.client = Redis.from_url(
+                self.settings.redis_url,
+                decode_responses=True,
+                max_connections=self.settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=self.settings.REDIS_SOCKET_TIMEOUT_SEC,
+                socket_keepalive=True,
+                # Borrow-time PING only for connections idle this long
+                health_check_interval=self.settings.REDIS_HEALTH_CHECK_INTERVAL_SEC,
+            )
             # Test connection
             await self.client.ping()
             logger.info(
@@ -81,6 +89,34 @@ class RedisClient(BaseCacheClient):
             logger.error(f"✗ Redis SET error: {e}")
             # Don't raise - worker continues processing other messages
 
+    async def _set_many_impl(self, items: list[SetOp]) -> None:
+        """
+        Batched Redis set via pipeline (called by worker from BaseCacheClient)
+
+        All SETs in the batch go out in a single round-trip
+        (non-transactional pipeline). The TTL in seconds is only recomputed
+        when an item's ttl isn't the previous item's object - callers pass
+        shared constants, so a batch usually converts once.
+
+        Args:
+            items: Queued SetOps
+        """
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+
+        try:
+            last_ttl, ex = None, None
+            async with self.client.pipeline(transaction=False) as pipe:
+                for item in items:
+                    ttl = item.ttl
+                    if ttl is not last_ttl:
+                        last_ttl, ex = ttl, int(ttl.total_seconds()) if ttl else None
+                    pipe.set(item.key, item.value, ex=ex)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"✗ Redis pipeline SET error ({len(items)} keys): {e}")
+            # Don't raise - worker continues processing other messages
+
     async def get(self, key: str) -> str | None:
         """Get value by key"""
         if not self.client:
@@ -103,6 +139,52 @@ class RedisClient(BaseCacheClient):
             logger.error(f"✗ Redis HSET error: {e}")
             raise
 
+    async def hget(self, name: str, key: str) -> str | None:
+        """Get one hash field"""
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+
+        try:
+            return await self.client.hget(name, key)
+        except Exception as e:
+            logger.error(f"✗ Redis HGET error: {e}")
+            raise
+
+    async def hmget(self, name: str, keys: list[str]) -> list[str | None]:
+        """Get several hash fields (one HMGET)"""
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+
+        try:
+            return await self.client.hmget(name, keys)
+        except Exception as e:
+            logger.error(f"✗ Redis HMGET error: {e}")
+            raise
+
+    async def hset_many(self, items: list[tuple[str, dict[str, str], timedelta | None]]) -> int:
+        """
+        Multi-field HSET per hash (+ EXPIRE) in one pipeline
+
+        One round-trip for all hashes (non-transactional pipeline).
+        """
+        if not self.client:
+            raise RuntimeError("Redis client not connected")
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                last_ttl, seconds = None, None
+                for name, mapping, ttl in items:
+                    pipe.hset(name, mapping=mapping)
+                    if ttl is not last_ttl:
+                        last_ttl, seconds = ttl, int(ttl.total_seconds()) if ttl else None
+                    if seconds:
+                        pipe.expire(name, seconds)
+                await pipe.execute()
+            return len(items)
+        except Exception as e:
+            logger.error(f"✗ Redis pipeline HSET error ({len(items)} hashes): {e}")
+            raise
+
     async def hgetall(self, name: str) -> dict[str, str]:
         """Get all hash fields"""
         if not self.client:
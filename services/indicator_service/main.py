@@ -26,6 +26,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import get_settings
+from core.utils.event_loop import run
 from factory.client_factory import create_cache_client, create_timeseries_db
 from services.indicator_service.calculator import IndicatorCalculator
 from services.indicator_service.persistence import IndicatorPersistence
@@ -75,7 +76,17 @@ class IndicatorService:
         self.cache = create_cache_client()
 
         # Initialize components
-        self.persistence = IndicatorPersistence(self.db, self.cache)
+        self.persistence = IndicatorPersistence(
+            self.db,
+            self.cache,
+            batch_size=self.settings.INDICATOR_SERVICE_DB_BATCH_ROWS,
+            flush_interval=self.settings.INDICATOR_SERVICE_DB_FLUSH_INTERVAL_SECONDS,
+            max_buffered_rows=self.settings.INDICATOR_SERVICE_DB_MAX_BUFFERED_ROWS,
+            max_concurrent_flushes=self.settings.INDICATOR_SERVICE_DB_MAX_CONCURRENT_FLUSHES,
+            max_batch_size=self.settings.INDICATOR_SERVICE_DB_BATCH_ROWS_MAX,
+            insert_latency_slo=self.settings.INDICATOR_SERVICE_DB_INSERT_SLO_SECONDS,
+            cache_interval=self.settings.INDICATOR_SERVICE_CACHE_FLUSH_INTERVAL_SECONDS,
+        )
         self.calculator = IndicatorCalculator(
             db=self.db,
             persistence=self.persistence,
@@ -124,6 +135,9 @@ class IndicatorService:
                                 f"Failed to process {exchange_name}/{symbol}/{timeframe}: {e}"
                             )
 
+            # Cycle done - don't leave its tail waiting for the flush timer
+            await self.persistence.flush()
+
         except Exception as e:
             logger.error(f"Failed to calculate indicators: {e}")
             raise
@@ -186,6 +200,7 @@ class IndicatorService:
                             f"Catch-up failed for {exchange_name}/{symbol}/{timeframe}: {e}"
                         )
 
+        await self.persistence.flush()
         logger.info(f"✅ Catch-up complete: Processed {total_processed} candles")
 
     async def start(self):
@@ -248,6 +263,9 @@ class IndicatorService:
         logger.info("🛑 Stopping Indicator Service...")
         self.running = False
 
+        # Buffered indicator rows go out before the DB connection closes
+        await self.persistence.close()
+
         if self.db:
             await self.db.close()
         if self.cache:
@@ -282,6 +300,6 @@ if __name__ == "__main__":
     log_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         logger.info("Goodbye!")
@@ -1,36 +1,304 @@
 """
 Indicator Persistence - Save to cache + database
 
-Strategy:
-1. Cache-first (blocking, critical path, ~1-5ms) - Hot data, 60s TTL
-2. Database (background, non-blocking) - Cold storage, historical data
+Strategy (both buffered; the cache on its own short cadence):
+1. Cache-first - Hot data, 60s TTL. One hash per (exchange, timeframe),
+   field = symbol, value = latest JSON; all hashes written with one
+   hset_many() (multi-field HSET + EXPIRE per hash, one Redis pipeline).
+   Sent every cache_interval seconds (default 0.1) whatever the DB
+   batching does, so a cached value trails its save by ~cache_interval.
+   Any write refreshes the whole hash's EXPIRE, so readers also drop
+   values written more than 60s ago (cached_ms) - a symbol that stopped
+   updating isn't served as fresh by its busier neighbours
+2. Database - Cold storage, historical data. Rows go to the DB in bulk
+   INSERTs (ClickHouse wants thousands of rows per INSERT, not one
+   candle's worth). Optionally, _BatchTuner adapts batch_size to the
+   measured INSERT throughput/latency
 
 Cloud-agnostic:
 - Cache: Redis, Memcached, etc. (via BaseCacheClient)
 - Database: ClickHouse, TimescaleDB, etc. (via BaseTimeSeriesDB)
 
 Architecture:
-    save_indicators() →
-        ├─ _write_cache() (await - blocking)
-        └─ _write_db() (asyncio.create_task - background)
+    save_indicators() → _cache_pending[key][symbol] + _buffer.append()   (write-behind)
+                              ↓ _cache_loop(): every cache_interval seconds
+                          _write_cache() → cache.hset_many()   (not awaited)
+
+                              ↓ _writer_loop(): when batch_size rows are buffered,
+                                every flush_interval seconds, or on close(), take a
+                                flush slot + hand the batch to a _write() task
+                                (max_concurrent_flushes in flight)
+                          ├─ _write_cache() → cache.hset_many()   (anything still staged)
+                          └─ db.insert_indicators_bulk() (one INSERT) → _tune()
 """
 
+import asyncio
+import base64
+import contextlib
+import functools
 import json
 import logging
+import sys
+import threading
+import time
+import zlib
+from collections import deque
 from datetime import datetime, timedelta
+from operator import itemgetter
 
 from core.interfaces.cache import BaseCacheClient
-from core.interfaces.database import BaseTimeSeriesDB
+from core.interfaces.database import BaseTimeSeriesDB, IndicatorSet
+from core.utils.serialization import dumps_record
+
+try:
+    import zstandard
+
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:  # pragma: no cover - depends on optional dependency
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+_CACHE_TTL = timedelta(seconds=60)
+_CACHE_TTL_MS = int(_CACHE_TTL.total_seconds() * 1000)
+
+# Cache values above this many JSON bytes are stored compressed:
+# "<tag>:" + base64(compressed JSON). Base64 keeps them text, so reads through
+# a decode_responses Redis client still work; plain JSON starts with "{".
+# Typical indicator sets (~300 bytes) stay far below the threshold - below a
+# few KiB, base64 eats most of what compression saves.
+_COMPRESS_MIN_BYTES = 4096
+_COMPRESS_MAX_RATIO = 0.75  # Keep plain JSON unless packed is at least 25% smaller
+_ZSTD_TAG = b"zs:"
+_ZLIB_TAG = b"zl:"  # Fallback when zstandard isn't installed
+
+# A flush whose to-be-compressed values add up to more than this packs them
+# on a worker thread (zlib/zstd release the GIL while compressing; JSON
+# encoding doesn't, so that stays inline)
+_OFFLOAD_MIN_BYTES = 64 * 1024
+
+# ZstdCompressor isn't safe to share between threads - one per thread
+_compressors = threading.local()
+
+
+def _zstd_compressor():
+    """This thread's reusable ZstdCompressor (level 1)"""
+    compressor = getattr(_compressors, "zstd", None)
+    if compressor is None:
+        compressor = _compressors.zstd = zstandard.ZstdCompressor(level=1)
+    return compressor
+
+
+def _pack_cache_value(payload: bytes) -> bytes:
+    """
+    Compress a JSON cache value if it's over _COMPRESS_MIN_BYTES (zstd level 1, else zlib)
+
+    Returns the plain JSON when the packed form isn't meaningfully smaller.
+    """
+    if len(payload) <= _COMPRESS_MIN_BYTES:
+        return payload
+    if zstandard is not None:
+        packed = _ZSTD_TAG + base64.b64encode(_zstd_compressor().compress(payload))
+    else:
+        packed = _ZLIB_TAG + base64.b64encode(zlib.compress(payload, 1))
+    return packed if len(packed) <= len(payload) * _COMPRESS_MAX_RATIO else payload
+
+
+def _pack_cache_items(
+    pending: dict[str, dict[str, bytes]],
+) -> list[tuple[str, dict[str, bytes], timedelta]]:
+    """hset_many() items for buffered cache values, large values compressed"""
+    return [
+        (key, {symbol: _pack_cache_value(value) for symbol, value in fields.items()}, _CACHE_TTL)
+        for key, fields in pending.items()
+    ]
+
+
+def _compress_bytes(pending: dict[str, dict[str, bytes]]) -> int:
+    """Total size of the buffered values _pack_cache_value() will compress"""
+    return sum(
+        len(value)
+        for fields in pending.values()
+        for value in fields.values()
+        if len(value) > _COMPRESS_MIN_BYTES
+    )
+
+
+def _unpack_cache_value(value: str | bytes) -> str | bytes:
+    """Inverse of _pack_cache_value() - JSON text/bytes for json.loads()"""
+    if isinstance(value, str):
+        value = value.encode()
+    tag, body = value[:3], value[3:]
+    if tag == _ZSTD_TAG:
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed cache value, but zstandard is not installed")
+        return _ZSTD_DECOMPRESSOR.decompress(base64.b64decode(body))
+    if tag == _ZLIB_TAG:
+        return zlib.decompress(base64.b64decode(body))
+    return value
+
+
+def _fresh_indicators(cached: str | bytes, now_ms: int) -> dict[str, float] | None:
+    """
+    Indicators from one cached value, or None if it was written over _CACHE_TTL ago
+
+    The hash's EXPIRE is pushed forward by every symbol in it, so per-value
+    age is checked here (values without cached_ms count as stale).
+    """
+    data = json.loads(_unpack_cache_value(cached))
+    if now_ms - data.get("cached_ms", 0) > _CACHE_TTL_MS:
+        return None
+    return data["indicators"]
+
+
+@functools.lru_cache(maxsize=4096)
+def _cache_key(exchange: str, timeframe: str) -> str:
+    """indicators:{exchange}:{timeframe} hash name, formatted once per pair (interned)"""
+    return sys.intern(f"indicators:{exchange}:{timeframe}")
+
+
+def _merge_by_key(batch: list[IndicatorSet]) -> list[IndicatorSet]:
+    """
+    Collapse + sort a batch by (exchange, symbol, timeframe, timestamp)
+
+    Repeated candles (e.g. catch-up recomputing one the scheduled run
+    already saved) merge into one set, later values winning - what
+    ReplacingMergeTree would keep anyway, minus the duplicate rows. Sorted
+    so the block arrives close to the table's ORDER BY.
+    """
+    merged: dict[tuple, dict[str, float]] = {}
+    for exchange, symbol, timeframe, timestamp, indicators in batch:
+        key = (exchange, symbol, timeframe, timestamp)
+        current = merged.get(key)
+        merged[key] = indicators if current is None else {**current, **indicators}
+
+    return [
+        IndicatorSet(*key, indicators)
+        for key, indicators in sorted(merged.items(), key=itemgetter(0))
+    ]
+
+
+class _BatchTuner:
+    """
+    Adaptive batch size for the bulk INSERT (hill-climb on measured throughput)
+
+    Fed one (rows, seconds) sample per full-batch INSERT. Every `window`
+    samples:
+    - slowest INSERT in the window over latency_slo → halve the batch size
+    - EWMA rows/sec still climbing (>5% over the best seen) → grow it 1.5x
+    - otherwise hold: bigger batches stopped paying off (the knee)
+
+    Partial batches (timer flushes) aren't sampled - they say nothing
+    about whether a bigger batch_size would help.
+    """
+
+    __slots__ = ("floor", "ceiling", "latency_slo", "window", "rate", "best_rate", "_latencies")
+
+    _ALPHA = 0.3  # EWMA weight of the newest sample
+    _GROWTH = 1.5
+    _MIN_GAIN = 1.05
+
+    def __init__(self, floor: int, ceiling: int, latency_slo: float, window: int = 8):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.latency_slo = latency_slo
+        self.window = window
+        self.rate = 0.0  # EWMA rows/sec
+        self.best_rate = 0.0  # Best EWMA seen at a smaller batch size
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def observe(self, batch_size: int, rows: int, seconds: float) -> int:
+        """Record one INSERT; returns the batch size to use from now on"""
+        sample = rows / seconds if seconds > 0 else 0.0
+        self.rate = sample if not self.rate else self.rate + self._ALPHA * (sample - self.rate)
+        self._latencies.append(seconds)
+
+        if len(self._latencies) < self.window:
+            return batch_size
+
+        slowest = max(self._latencies)
+        self._latencies.clear()
+
+        if slowest > self.latency_slo:
+            # Over the SLO: back off, and re-learn the curve from there
+            self.best_rate = 0.0
+            return max(self.floor, batch_size // 2)
+
+        if self.rate > self.best_rate * self._MIN_GAIN:
+            self.best_rate = self.rate
+            return min(self.ceiling, int(batch_size * self._GROWTH))
+
+        return batch_size
+
 
 class IndicatorPersistence:
     """Save indicator results to cache (hot) + database (cold)"""
 
-    def __init__(self, db: BaseTimeSeriesDB, cache: BaseCacheClient):
+    def __init__(
+        self,
+        db: BaseTimeSeriesDB,
+        cache: BaseCacheClient,
+        batch_size: int = 10_000,
+        flush_interval: float = 1.0,
+        max_buffered_rows: int = 100_000,
+        max_concurrent_flushes: int = 2,
+        max_batch_size: int | None = None,
+        insert_latency_slo: float = 1.0,
+        cache_interval: float = 0.1,
+    ):
+        """
+        Args:
+            db: Time-series database (cold storage)
+            cache: Cache client (hot data)
+            batch_size: Buffered indicator rows that wake the writer for a bulk INSERT
+            flush_interval: Max seconds a partial batch waits (0 = no timer;
+                only batch_size, flush() and close() write)
+            max_buffered_rows: Backpressure bound - save_indicators() flushes
+                inline (waiting behind the writer) once this many rows are buffered
+            max_concurrent_flushes: Batches written at once - the writer goes
+                back to buffering while they're in flight
+            max_batch_size: Ceiling for adaptive batch sizing (_BatchTuner);
+                None keeps batch_size fixed
+            insert_latency_slo: Seconds per INSERT above which the tuner
+                halves batch_size
+            cache_interval: Max seconds a staged cache value waits before it
+                is sent, independent of DB batching (0 = send only with DB writes)
+        """
         self.db = db
         self.cache = cache
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self.cache_interval = cache_interval
+
+        # Adaptive batch size (opt-in): grows while throughput does, up to the ceiling
+        self._tuner: _BatchTuner | None = None
+        if max_batch_size is not None and max_batch_size > batch_size:
+            self._tuner = _BatchTuner(
+                floor=min(batch_size, 1000),
+                ceiling=min(max_batch_size, max_buffered_rows),
+                latency_slo=insert_latency_slo,
+            )
+
+        # Write buffers: cache hash -> {symbol: JSON value} (latest wins), one IndicatorSet per candle.
+        # Kept per candle (one append per save, merged by key at flush); the DB
+        # provider unpivots the batch into per-column lists off the event loop.
+        self._cache_pending: dict[str, dict[str, bytes]] = {}
+        self._buffer: list[IndicatorSet] = []
+        self._buffered_rows = 0  # Indicator values across _buffer (= DB rows)
+
+        # Flush slots bound the batches in flight (memory + DB connections);
+        # a batch is only taken from the buffer once it holds a slot
+        self._flush_slots = asyncio.Semaphore(max_concurrent_flushes)
+        self._inflight: set[asyncio.Task] = set()
+        self._cache_writes: set[asyncio.Task] = set()  # Fire-and-forget hset_many() sends
+
+        # Write-behind: one writer task (started on first save) starts a write
+        # when woken by a full batch or when flush_interval passes
+        self._writer_task: asyncio.Task | None = None
+        self._cache_task: asyncio.Task | None = None  # _cache_loop(), when cache_interval > 0
+        self._batch_ready = asyncio.Event()
+        self._closing = False
 
     async def save_indicators(
         self,
@@ -43,20 +311,36 @@ class IndicatorPersistence:
         """
         Save indicators to cache + database
 
-        Critical path: Cache write (blocking)
-        Background: Database write (non-blocking)
+        Write-behind: buffers the values and returns - the cache task sends
+        cache values within cache_interval; the writer task sends database
+        rows once batch_size rows are buffered, or after flush_interval.
+        Only waits on I/O when the writer falls max_buffered_rows behind
+        (backpressure).
         """
-        if not indicators:
+        if not indicators:  # First: the empty case does no other work
             logger.warning(f"No indicators to save for {exchange}/{symbol}/{timeframe}")
             return
 
-        # Step 1: Cache-first (blocking - critical path)
-        await self._write_cache(exchange, symbol, timeframe, timestamp, indicators)
+        # Step 1: Cache (latest value per key)
+        self._stage_cache(exchange, symbol, timeframe, timestamp, indicators)
+
+        # Step 2: Database (flushed in bulk)
+        self._buffer.append(IndicatorSet(exchange, symbol, timeframe, timestamp, indicators))
+        self._buffered_rows += len(indicators)
 
-        # Step 2: Database (sequential - avoids connection conflicts)
-        await self._write_db(exchange, symbol, timeframe, timestamp, indicators)
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop(), name="indicator-writer")
+            if self.cache_interval > 0:
+                self._cache_task = asyncio.create_task(
+                    self._cache_loop(), name="indicator-cache-writer"
+                )
 
-    async def _write_cache(
+        if self._buffered_rows >= self.batch_size:
+            self._batch_ready.set()
+        if self._buffered_rows >= self.max_buffered_rows:
+            await self.flush()  # Writer can't keep up - producer pays for this batch
+
+    def _stage_cache(
         self,
         exchange: str,
         symbol: str,
@@ -65,52 +349,218 @@ class IndicatorPersistence:
         indicators: dict[str, float],
     ) -> None:
         """
-        Write to cache with TTL
+        Buffer the cache write (replaces any pending value for the symbol)
 
-        Key: indicators:{exchange}:{symbol}:{timeframe}
-        Value: JSON {timestamp, indicators}
-        TTL: 60s
+        Hash: indicators:{exchange}:{timeframe}, field: symbol
+        Value: JSON {ts_ms, cached_ms, indicators} as UTF-8 bytes (dumps_record) -
+        ts_ms is the candle timestamp, cached_ms the wall-clock write time
+        (what readers check against the TTL), both epoch milliseconds.
+        Compressed at send time if large (_pack_cache_value), so overwritten
+        values never are
         """
         try:
-            key = f"indicators:{exchange}:{symbol}:{timeframe}"
+            key = _cache_key(exchange, timeframe)
             value = {
-                "timestamp": timestamp.isoformat(),
+                "ts_ms": round(timestamp.timestamp() * 1000),
+                "cached_ms": time.time_ns() // 1_000_000,
                 "indicators": indicators,
             }
-
-            await self.cache.set(key, json.dumps(value), ttl=timedelta(seconds=60))
-            logger.debug(f"✓ Cached {len(indicators)} indicators for {symbol}")
+            fields = self._cache_pending.get(key)
+            if fields is None:
+                fields = self._cache_pending[key] = {}
+            fields[symbol] = dumps_record(value)
 
         except Exception as e:
             # Cache miss is acceptable - log but don't crash
             logger.error(f"✗ Cache write failed for {symbol}: {e}")
 
-    async def _write_db(
-        self,
-        exchange: str,
-        symbol: str,
-        timeframe: str,
-        timestamp: datetime,
-        indicators: dict[str, float],
-    ) -> None:
+    def _write_cache(self, pending: dict[str, dict[str, bytes]]) -> None:
         """
-        Write to database (background)
+        Send buffered cache values in one call (TTL 60s per hash), fire-and-forget
 
-        Uses ReplacingMergeTree (ClickHouse) or similar for deduplication
+        hset_many() sends one multi-field HSET + EXPIRE per hash, all in a
+        single pipeline - one command per (exchange, timeframe) however
+        many symbols it holds. Values over _COMPRESS_MIN_BYTES are
+        compressed first - inline, or inside the send task on a worker
+        thread once there's more than _OFFLOAD_MIN_BYTES of them. Nothing
+        reads the reply, so the DB write doesn't wait for it: the send
+        runs as a task and _cache_write_done() logs the outcome.
         """
         try:
-            count = await self.db.insert_indicators(
-                exchange=exchange,
-                symbol=symbol,
-                timeframe=timeframe,
-                timestamp=timestamp,
-                indicators=indicators,
-            )
+            if _compress_bytes(pending) > _OFFLOAD_MIN_BYTES:
+                send = self._pack_and_send(pending)
+            else:
+                send = self.cache.hset_many(_pack_cache_items(pending))
+            task = asyncio.ensure_future(send)
+        except Exception as e:
+            # Cache miss is acceptable - log but don't crash
+            logger.error(f"✗ Cache write failed for {len(pending)} hashes: {e}")
+            return
+
+        self._cache_writes.add(task)
+        task.add_done_callback(functools.partial(self._cache_write_done, len(pending)))
+
+    def _send_staged_cache(self) -> None:
+        """Send whatever cache values are staged (the DB rows stay buffered)"""
+        if self._cache_pending:
+            pending, self._cache_pending = self._cache_pending, {}
+            self._write_cache(pending)
+
+    async def _cache_loop(self) -> None:
+        """
+        Background cache sender - send staged cache values every cache_interval seconds
+
+        Runs apart from _writer_loop(), so a value reaches the cache
+        within ~cache_interval however long its row waits for the bulk
+        INSERT. Cancelled by close().
+        """
+        while True:
+            await asyncio.sleep(self.cache_interval)
+            self._send_staged_cache()
+
+    async def _pack_and_send(self, pending: dict[str, dict[str, bytes]]) -> int:
+        """Compress a large cache flush on a worker thread, then send it"""
+        items = await asyncio.to_thread(_pack_cache_items, pending)
+        return await self.cache.hset_many(items)
+
+    def _cache_write_done(self, hashes: int, task: asyncio.Task) -> None:
+        """Done callback for _write_cache() sends - log the result, never raise"""
+        self._cache_writes.discard(task)
+        if task.cancelled():
+            return
+
+        error = task.exception()
+        if error is not None:
+            # Cache miss is acceptable - log but don't crash
+            logger.error(f"✗ Cache write failed for {hashes} hashes: {error}")
+        else:
+            logger.debug(f"✓ Cached indicators in {task.result()} hashes")
+
+    def _take_batch(self) -> tuple[dict[str, dict[str, bytes]], list[IndicatorSet]] | None:
+        """Swap out both buffers (None if nothing is buffered)"""
+        if not self._buffer:
+            return None
+
+        pending, self._cache_pending = self._cache_pending, {}
+        batch, self._buffer = self._buffer, []
+        self._buffered_rows = 0
+        return pending, batch
+
+    async def _write(self, pending: dict[str, dict[str, bytes]], batch: list[IndicatorSet]) -> int:
+        """
+        Write one taken batch: cache send first (not awaited), then the
+        database in one bulk INSERT
 
-            logger.debug(f"✓ Database saved {count} indicators for {symbol}")
+        The DB batch is de-duplicated and sorted by key first (_merge_by_key).
+        A failed batch is logged and dropped, same as the old per-candle writes.
+        """
+        if pending:
+            self._write_cache(pending)
+
+        try:
+            batch = _merge_by_key(batch)
+            started = time.perf_counter()
+            count = await self.db.insert_indicators_bulk(batch)
+            if self._tuner is not None and count >= self.batch_size:
+                self._tune(count, time.perf_counter() - started)
+            logger.debug(f"✓ Database saved {count} indicators for {len(batch)} candles")
+            return count
 
         except Exception as e:
-            logger.error(f"✗ Database write failed for {symbol}: {e}", exc_info=True)
+            logger.error(f"✗ Database write failed for {len(batch)} candles: {e}", exc_info=True)
+            return 0
+
+    def _tune(self, rows: int, seconds: float) -> None:
+        """Feed one full-batch INSERT to the tuner and apply its batch size"""
+        batch_size = self._tuner.observe(self.batch_size, rows, seconds)
+        if batch_size != self.batch_size:
+            logger.info(
+                f"Indicator batch size {self.batch_size} → {batch_size} "
+                f"({self._tuner.rate:,.0f} rows/s, last INSERT {seconds:.3f}s)"
+            )
+            self.batch_size = batch_size
+
+    async def flush(self) -> int:
+        """
+        Write all buffered indicators and wait for that write
+
+        Waits for a free flush slot first, so explicit and backpressure
+        flushes queue behind batches already in flight rather than adding
+        to them.
+
+        Returns:
+            Number of rows inserted (0 if nothing buffered or the write failed)
+        """
+        if not self._buffer:
+            return 0  # Nothing to write - don't queue for a slot behind in-flight writes
+
+        async with self._flush_slots:
+            taken = self._take_batch()
+            if taken is None:
+                return 0
+            return await self._write(*taken)
+
+    async def _write_in_slot(
+        self, pending: dict[str, dict[str, bytes]], batch: list[IndicatorSet]
+    ) -> None:
+        """_write() for the writer task, which acquired the slot already"""
+        try:
+            await self._write(pending, batch)
+        finally:
+            self._flush_slots.release()
+
+    async def _writer_loop(self) -> None:
+        """
+        Background writer - start a write on a full batch or every flush_interval seconds
+
+        Doesn't wait for the write: it waits for a free flush slot, takes
+        the batch and goes back to sleep while a _write_in_slot() task
+        sends it. With every slot busy the buffer keeps growing until
+        save_indicators() hits max_buffered_rows (backpressure).
+
+        Exits after a final pass once close() sets _closing; in-flight
+        writes are tracked in _inflight for close() to await.
+        """
+        timeout = self.flush_interval or None  # 0 = no timer, wake on full batches only
+
+        while not self._closing:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_ready.wait(), timeout)
+            self._batch_ready.clear()
+            if not self._buffer:
+                continue  # Idle tick
+
+            await self._flush_slots.acquire()
+            taken = self._take_batch()
+            if taken is None:
+                self._flush_slots.release()
+                continue
+
+            task = asyncio.create_task(self._write_in_slot(*taken), name="indicator-write")
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def close(self) -> None:
+        """Stop the writer, wait for in-flight writes + flush leftovers (cache sends included)"""
+        self._closing = True
+        if self._cache_task is not None:
+            self._cache_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._cache_task
+            self._cache_task = None
+
+        if self._writer_task is not None:
+            self._batch_ready.set()
+            await self._writer_task
+            self._writer_task = None
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight)
+
+        await self.flush()
+
+        if self._cache_writes:
+            await asyncio.gather(*self._cache_writes, return_exceptions=True)
 
     async def get_from_cache(
         self, exchange: str, symbol: str, timeframe: str
@@ -119,18 +569,53 @@ class IndicatorPersistence:
         Get latest indicators from cache
 
         Returns:
-            Dict of indicators or None if cache miss
+            Dict of indicators or None if cache miss (or written over 60s ago)
         """
         try:
-            key = f"indicators:{exchange}:{symbol}:{timeframe}"
-            cached = await self.cache.get(key)
+            key = _cache_key(exchange, timeframe)
+            cached = await self.cache.hget(key, symbol)
 
             if not cached:
                 return None
 
-            data = json.loads(cached)
-            return data.get("indicators")
+            return _fresh_indicators(cached, time.time_ns() // 1_000_000)
 
         except Exception as e:
             logger.error(f"Cache read error for {symbol}: {e}")
             return None
+
+    async def get_many_from_cache(
+        self, exchange: str, symbols: list[str], timeframe: str
+    ) -> dict[str, dict[str, float]]:
+        """
+        Get latest indicators for several symbols in one round-trip
+
+        All symbols of an (exchange, timeframe) share one hash, so this is
+        a single HMGET rather than one read per symbol.
+
+        Returns:
+            {symbol: indicators} for the symbols found (misses, stale and
+            unreadable values are left out; {} on a cache error)
+        """
+        try:
+            key = _cache_key(exchange, timeframe)
+            values = await self.cache.hmget(key, symbols)
+
+        except Exception as e:
+            logger.error(f"Cache read error for {len(symbols)} symbols: {e}")
+            return {}
+
+        now_ms = time.time_ns() // 1_000_000
+        results: dict[str, dict[str, float]] = {}
+        for symbol, cached in zip(symbols, values, strict=True):
+            if not cached:
+                continue
+            try:
+                indicators = _fresh_indicators(cached, now_ms)
+            except Exception as e:
+                logger.error(f"Cache read error for {symbol}: {e}")
+                continue
+            if indicators is not None:
+                results[symbol] = indicators
+
+        return results
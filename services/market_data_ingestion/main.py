@@ -26,6 +26,7 @@ sys.path.insert(0, str(project_root))
 
 from config.loader import get_enabled_exchanges
 from config.settings import get_settings
+from core.utils.event_loop import run
 from factory.client_factory import create_cache_client, create_exchange_websockets
 from services.market_data_ingestion.stream_processor import StreamProcessor
 
@@ -171,4 +172,4 @@ if __name__ == "__main__":
     log_dir.mkdir(parents=True, exist_ok=True)
 
     # Run service
-    asyncio.run(main())
+    run(main())
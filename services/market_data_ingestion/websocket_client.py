@@ -14,12 +14,29 @@ from collections.abc import Callable
 from datetime import datetime
 from decimal import Decimal
 
+from pydantic import TypeAdapter
 from websockets import connect
 
 from core.models.market_data import Trade
 
+try:
+    import msgspec
+
+    from core.models.market_data_msgspec import BinanceTradeMsg
+
+    # Decodes raw frames straight into a typed struct (no intermediate dict)
+    _TRADE_DECODER = msgspec.json.Decoder(BinanceTradeMsg)
+except ImportError:  # pragma: no cover - depends on optional dependency
+    _TRADE_DECODER = None
+
 logger = logging.getLogger(__name__)
 
+# Taker side indexed by Binance "m" flag: m=true → buyer is maker → taker is seller
+_SIDE_FROM_MAKER = ("buy", "sell")
+
+# Built once at import: validates a whole list of trades in a single pydantic-core call
+_TRADE_BATCH = TypeAdapter(list[Trade])
+
 
 class BinanceWebSocketClient:
     """
@@ -34,21 +51,50 @@ class BinanceWebSocketClient:
 
     BASE_URL = "wss://stream.binance.com:9443/ws"
 
-    def __init__(self, symbols: list[str]):
+    # Receive limits: websockets reassembles frames itself, so cap the frame
+    # size at one chunk and keep the incoming frame queue short. When the
+    # consumer lags, websockets pauses reading and back-pressure flows to TCP
+    # instead of buffering an unbounded burst in memory.
+    RX_CHUNK_SIZE = 32768  # Max frame size in bytes (trade frames are ~200B)
+    RX_MAX_QUEUE = 16  # Max frames buffered before reading is paused
+
+    def __init__(
+        self,
+        symbols: list[str],
+        callback_queue_size: int = 100,
+        inline_single_callback: bool = False,
+    ):
         """
         Initialize WebSocket client
 
         Args:
             symbols: List of symbols (lowercase, e.g., ["btcusdt", "ethusdt"])
+            callback_queue_size: Trades queued per callback - once a
+                callback's queue is full, the receive loop waits
+            inline_single_callback: With exactly one callback, await it
+                directly in the receive loop instead of queueing
+                (for a cheap callback, e.g. one that only enqueues)
         """
         self.symbols = symbols
         self.callbacks: list[Callable] = []
         self.running = False
+        self.callback_queue_size = callback_queue_size
+        self.inline_single_callback = inline_single_callback
+
+        # One bounded queue + consumer task per callback (started by start()):
+        # each callback sees trades in arrival order, a slow one doesn't
+        # stall the others, and a full queue pauses reading so backpressure
+        # reaches TCP (RX_MAX_QUEUE) instead of piling up in memory
+        self._callback_queues: list[asyncio.Queue] = []
+        self._callback_tasks: list[asyncio.Task] = []
 
     def on_trade(self, callback: Callable[[Trade], None]) -> None:
         """
         Register callback for trade events
 
+        Each callback gets every trade in the order received, one at a time
+        (trades queue up while it runs), independently of other callbacks.
+
         Args:
             callback: Async function to call when trade received
 
@@ -63,19 +109,37 @@ class BinanceWebSocketClient:
         """
         Start WebSocket connection with auto-reconnect
 
-        Runs forever until stop() is called.
+        Runs forever until stop() is called, then waits for callbacks to
+        finish the trades already queued for them.
         Automatically reconnects on disconnect with 5s delay.
         """
         self.running = True
+        inline = self.inline_single_callback and len(self.callbacks) == 1
+        if not inline:
+            self._start_consumers()
 
         # Build stream URL for multiple symbols
         # Format: wss://stream.binance.com:9443/ws/btcusdt@trade/ethusdt@trade
         streams = "/".join([f"{symbol}@trade" for symbol in self.symbols])
         url = f"{self.BASE_URL}/{streams}"
 
+        try:
+            await self._receive(url, inline)
+        except asyncio.CancelledError:
+            for task in self._callback_tasks:
+                task.cancel()
+            raise
+
+        # Let callbacks work through what's already queued before returning
+        await self._stop_consumers()
+
+    async def _receive(self, url: str, inline: bool) -> None:
+        """Receive loop with auto-reconnect - hands each trade to every callback"""
         while self.running:
             try:
-                async with connect(url) as websocket:
+                async with connect(
+                    url, max_size=self.RX_CHUNK_SIZE, max_queue=self.RX_MAX_QUEUE
+                ) as websocket:
                     logger.info(f"✓ Connected to Binance WebSocket: {self.symbols}")
 
                     async for message in websocket:
@@ -83,12 +147,16 @@ class BinanceWebSocketClient:
                             break
 
                         try:
-                            data = json.loads(message)
-                            trade = self._parse_trade(data)
+                            trade = self._decode_trade(message)
 
-                            # Trigger all registered callbacks
-                            for callback in self.callbacks:
-                                await callback(trade)
+                            if inline:
+                                # Fast path: one cheap callback, no queue hop
+                                await self._fire(self.callbacks[0], trade)
+                                continue
+
+                            # Queue for every callback (waits while a queue is full)
+                            for queue in self._callback_queues:
+                                await queue.put(trade)
 
                         except Exception as e:
                             logger.error(f"Error processing trade message: {e}")
@@ -100,6 +168,70 @@ class BinanceWebSocketClient:
                     logger.info("Reconnecting in 5 seconds...")
                     await asyncio.sleep(5)
 
+    def _start_consumers(self) -> None:
+        """One bounded queue + consumer task per registered callback"""
+        self._callback_queues = [
+            asyncio.Queue(maxsize=self.callback_queue_size) for _ in self.callbacks
+        ]
+        self._callback_tasks = [
+            asyncio.create_task(self._consume(callback, queue))
+            for callback, queue in zip(self.callbacks, self._callback_queues, strict=True)
+        ]
+
+    async def _stop_consumers(self) -> None:
+        """Drain every callback queue, then end its consumer"""
+        for queue in self._callback_queues:
+            await queue.put(None)
+        if self._callback_tasks:
+            await asyncio.gather(*self._callback_tasks, return_exceptions=True)
+        self._callback_queues, self._callback_tasks = [], []
+
+    async def _consume(self, callback: Callable, queue: asyncio.Queue) -> None:
+        """Deliver queued trades to one callback in arrival order (None ends it)"""
+        while (trade := await queue.get()) is not None:
+            await self._fire(callback, trade)
+
+    async def _fire(self, callback: Callable, trade: Trade) -> None:
+        """
+        Run one callback, logging (not raising) its errors
+
+        Args:
+            callback: Registered async callback
+            trade: Parsed trade
+        """
+        try:
+            await callback(trade)
+        except Exception as e:
+            logger.error(f"Error in trade callback: {e}")
+
+    def _decode_trade(self, raw: str | bytes) -> Trade:
+        """
+        Decode a raw WebSocket frame to Trade model
+
+        Uses msgspec when installed (JSON → struct in one step),
+        falls back to json.loads + _parse_trade otherwise.
+
+        Args:
+            raw: Raw WebSocket frame (JSON text or bytes)
+
+        Returns:
+            Trade: Normalized Trade object
+        """
+        if _TRADE_DECODER is None:
+            return self._parse_trade(json.loads(raw))
+
+        msg = _TRADE_DECODER.decode(raw)
+        return Trade(
+            timestamp=datetime.fromtimestamp(msg.T / 1000),
+            exchange="binance",
+            symbol=msg.s,
+            trade_id=str(msg.t),
+            price=Decimal(msg.p),
+            quantity=Decimal(msg.q),
+            side=_SIDE_FROM_MAKER[msg.m],
+            is_buyer_maker=msg.m,
+        )
+
     def _parse_trade(self, data: dict) -> Trade:
         """
         Parse Binance trade message to Trade model
@@ -123,16 +255,43 @@ class BinanceWebSocketClient:
         Returns:
             Trade: Normalized Trade object
         """
-        return Trade(
-            timestamp=datetime.fromtimestamp(data["T"] / 1000),
-            exchange="binance",
-            symbol=data["s"],
-            trade_id=str(data["t"]),
-            price=Decimal(data["p"]),
-            quantity=Decimal(data["q"]),
-            side="sell" if data["m"] else "buy",  # m=true → buyer is maker → taker is seller
-            is_buyer_maker=data["m"],
-        )
+        return Trade(**self._normalize(data))
+
+    def _parse_trade_batch(self, messages: list[dict]) -> list[Trade]:
+        """
+        Parse a batch of Binance trade messages in one validation pass
+
+        Same result as calling _parse_trade() per message, but pydantic
+        validates the whole list in a single call (useful for backfill/catch-up).
+
+        Args:
+            messages: Raw Binance WebSocket messages
+
+        Returns:
+            list[Trade]: Normalized Trade objects (same order as input)
+        """
+        return _TRADE_BATCH.validate_python([self._normalize(m) for m in messages])
+
+    def _normalize(self, data: dict) -> dict:
+        """
+        Map Binance trade message keys to Trade fields
+
+        Args:
+            data: Raw Binance WebSocket message
+
+        Returns:
+            dict: Trade field values (not yet validated)
+        """
+        return {
+            "timestamp": datetime.fromtimestamp(data["T"] / 1000),
+            "exchange": "binance",
+            "symbol": data["s"],
+            "trade_id": str(data["t"]),
+            "price": Decimal(data["p"]),
+            "quantity": Decimal(data["q"]),
+            "side": _SIDE_FROM_MAKER[data["m"]],
+            "is_buyer_maker": bool(data["m"]),
+        }
 
     async def stop(self) -> None:
         """Stop WebSocket connection"""
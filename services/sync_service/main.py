@@ -24,6 +24,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import get_settings
+from core.utils.event_loop import run
 from factory.client_factory import create_exchange_rest_api, create_timeseries_db
 
 # Configure logging
@@ -154,12 +155,14 @@ class SyncService:
                 await api.close()
             return successes, failures
 
-        results = await asyncio.gather(
-            *[backfill_exchange(name, cfg) for name, cfg in enabled_configs.items()]
-        )
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(backfill_exchange(name, cfg))
+                for name, cfg in enabled_configs.items()
+            ]
 
-        total_ok = sum(r[0] for r in results)
-        total_fail = sum(r[1] for r in results)
+        total_ok = sum(t.result()[0] for t in tasks)
+        total_fail = sum(t.result()[1] for t in tasks)
         logger.info(f"✅ Initial backfill complete: {total_ok} successful, {total_fail} failed")
 
     async def sync_all_exchanges(self):
@@ -189,12 +192,13 @@ class SyncService:
                 await api.close()
             return successes, failures
 
-        results = await asyncio.gather(
-            *[sync_exchange(name, cfg) for name, cfg in enabled_configs.items()]
-        )
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(sync_exchange(name, cfg)) for name, cfg in enabled_configs.items()
+            ]
 
-        total_ok = sum(r[0] for r in results)
-        total_fail = sum(r[1] for r in results)
+        total_ok = sum(t.result()[0] for t in tasks)
+        total_fail = sum(t.result()[1] for t in tasks)
         logger.info(f"Sync cycle complete: {total_ok} successful, {total_fail} failed")
 
     async def start(self):
@@ -274,6 +278,6 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         logger.info("Goodbye!")
@@ -8,6 +8,12 @@ Markers:
 - slow: Slow-running tests (>10 seconds)
 """
 
+import asyncio
+
+import pytest
+
+from tests.unit._helpers import FakeClock
+
 
 def pytest_configure(config):
     """Register custom markers"""
@@ -15,3 +21,22 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "integration: Integration tests (requires Docker)")
     config.addinivalue_line("markers", "binance: Tests using Binance API (requires internet)")
     config.addinivalue_line("markers", "slow: Slow tests (>10 seconds)")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """
+    Run async tests on uvloop when installed (same loop the services use,
+    see core.utils.event_loop); falls back to the default asyncio loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    """Manually advanced drop-rate clock (assign to client._clock)"""
+    return FakeClock()
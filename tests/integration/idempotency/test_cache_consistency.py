@@ -11,6 +11,7 @@ import pytest
 import redis as redis_lib
 
 from config.settings import Settings, get_settings
+from services.indicator_service.persistence import _unpack_cache_value
 
 # Set environment variables for localhost
 os.environ["CLICKHOUSE_HOST"] = "localhost"
@@ -91,16 +92,18 @@ def test_indicator_cache_format(redis_client):
         test_key = keys[0]
         test_key_str = test_key.decode() if isinstance(test_key, bytes) else test_key
 
-        cached_value = redis_client.get(test_key_str)
-        assert cached_value is not None, f"Key exists but no value: {test_key_str}"
+        # Hash per exchange/timeframe, field = symbol
+        cached_fields = redis_client.hgetall(test_key_str)
+        assert cached_fields, f"Hash exists but has no symbols: {test_key_str}"
+        cached_value = next(iter(cached_fields.values()))
 
         # Parse JSON
-        data = json.loads(cached_value)
+        data = json.loads(_unpack_cache_value(cached_value))
         print(f"  ✓ {test_key_str}")
-        print(f"    Timestamp: {data['timestamp']}")
+        print(f"    Timestamp (ms): {data['ts_ms']}")
         print(f"    Indicators: {list(data['indicators'].keys())}")
 
-        assert "timestamp" in data
+        assert "ts_ms" in data
         assert "indicators" in data
         assert len(data["indicators"]) > 0
 
@@ -16,6 +16,7 @@ from clickhouse_driver import Client
 
 from config.settings import Settings, get_settings
 from services.indicator_service.main import IndicatorService
+from services.indicator_service.persistence import _unpack_cache_value
 
 
 def get_indicator_value(
@@ -192,18 +193,19 @@ class TestIndicatorPipeline:
             print(f"\nCached indicator keys: {len(indicator_keys)}")
             assert len(indicator_keys) > 0, "No indicators cached in Redis"
 
-            # Verify first cached indicator
+            # Verify first cached indicator (hash per exchange/timeframe, field = symbol)
             first_key = indicator_keys[0]
-            cached_value = redis_client.get(first_key)
-            assert cached_value is not None
+            cached_fields = redis_client.hgetall(first_key)
+            assert cached_fields, f"Hash exists but has no symbols: {first_key}"
+            cached_value = next(iter(cached_fields.values()))
 
             # Parse JSON
-            data = json.loads(cached_value)
+            data = json.loads(_unpack_cache_value(cached_value))
             print(f"Cached indicator: {first_key}")
-            print(f"  Timestamp: {data['timestamp']}")
+            print(f"  Timestamp (ms): {data['ts_ms']}")
             print(f"  Indicators: {list(data['indicators'].keys())}")
 
-            assert "timestamp" in data
+            assert "ts_ms" in data
             assert "indicators" in data
             assert len(data["indicators"]) > 0
 
@@ -15,6 +15,7 @@ from clickhouse_driver import Client
 
 from config.settings import Settings, get_settings
 from services.indicator_service.main import IndicatorService
+from services.indicator_service.persistence import _unpack_cache_value
 from services.sync_service.main import SyncService
 
 
@@ -192,15 +193,16 @@ async def test_full_phase2_pipeline(clickhouse_client, redis_client, settings):
     print(f"  Cached indicators: {len(indicator_keys)}")
     assert len(indicator_keys) > 0, "No indicators cached in Redis"
 
-    # Verify first cached indicator
+    # Verify first cached indicator (hash per exchange/timeframe, field = symbol)
     first_key = indicator_keys[0]
-    cached_value = redis_client.get(first_key)
-    cached_data = json.loads(cached_value)
+    cached_fields = redis_client.hgetall(first_key)
+    assert len(cached_fields) > 0, f"Hash exists but has no symbols: {first_key}"
+    cached_data = json.loads(_unpack_cache_value(next(iter(cached_fields.values()))))
 
     print(f"  Sample cache key: {first_key}")
     print(f"    Indicators: {list(cached_data['indicators'].keys())}")
 
-    assert "timestamp" in cached_data
+    assert "ts_ms" in cached_data
     assert "indicators" in cached_data
     assert len(cached_data["indicators"]) > 0
 
@@ -0,0 +1,124 @@
+"""
+Shared lightweight test doubles for unit tests
+
+Unlike AsyncMock-based doubles, these keep the hot path free of mock
+machinery (plain attribute updates only), so tests that exercise the
+queue/worker path measure the code under test, not MagicMock overhead.
+"""
+
+import inspect
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from core.interfaces.cache import BaseCacheClient
+
+
+@dataclass(slots=True)
+class FakeSettings:
+    """
+    Plain settings stand-in for the queued provider interfaces
+
+    Only the queue/worker knobs read by BaseCacheClient, BaseTimeSeriesDB and
+    BaseStreamProducer. Reading anything else raises AttributeError, so a new
+    setting can't silently come back as a MagicMock. Fields are mutable so
+    fixtures/tests can tweak them per case.
+    """
+
+    DB_QUEUE_SIZE: int = 2000
+    DB_WORKERS: int = 3
+    DB_BATCH_SIZE: int = 100
+    STREAM_QUEUE_SIZE: int = 5000
+    STREAM_WORKERS: int = 10
+    STREAM_BATCH_MAX: int = 500
+    STREAM_LINGER_MS: int = 0
+    CACHE_QUEUE_SIZE: int = 1000
+    CACHE_WORKERS: int = 5
+    CACHE_MAX_BATCH: int = 100
+
+
+class FakeClock:
+    """
+    Manually advanced monotonic clock (stand-in for a client's _clock)
+
+    Assign to client._clock, then advance() instead of sleeping or patching
+    time.monotonic (which wouldn't reach uvloop's loop.time() anyway).
+    """
+
+    __slots__ = ("now",)
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FastCountingCacheClient(BaseCacheClient):
+    """
+    Cache client that only counts sets
+
+    Attributes:
+        calls: Number of _set_impl() calls
+        last: (key, value, ttl) of the most recent call
+    """
+
+    def __init__(self, settings: Any = None):
+        super().__init__(settings)
+        self.calls = 0
+        self.last: tuple | None = None
+
+    async def _set_impl(self, key: str, value: str, ttl: timedelta | None = None) -> bool:
+        self.calls += 1
+        self.last = (key, value, ttl)
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return None
+
+    async def hset(self, name: str, key: str, value: str) -> int:
+        return 1
+
+    async def hgetall(self, name: str) -> dict[str, str]:
+        return {}
+
+
+class FastAsyncMock:
+    """
+    Minimal async callable that records calls (AsyncMock stand-in for hot paths)
+
+    Attributes:
+        calls: (args, kwargs) per call, in order
+        return_value: Returned by each call
+        side_effect: Optional exception (raised) or callable (called with the
+            same arguments, awaited if it returns an awaitable, result returned)
+
+    Use AsyncMock instead when a test needs iterable side_effect or assert_* helpers.
+    """
+
+    def __init__(self, return_value: Any = None):
+        self.calls: list[tuple[tuple, dict]] = []
+        self.return_value = return_value
+        self.side_effect: Any = None
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        effect = self.side_effect
+        if effect is None:
+            return self.return_value
+        if isinstance(effect, BaseException) or (
+            isinstance(effect, type) and issubclass(effect, BaseException)
+        ):
+            raise effect
+        result = effect(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    @property
+    def call_count(self) -> int:
+        """Number of calls so far"""
+        return len(self.calls)
@@ -0,0 +1,31 @@
+"""
+Shared fixtures for market data ingestion service tests
+"""
+
+import pytest
+
+from services.market_data_ingestion.websocket_client import BinanceWebSocketClient
+
+
+@pytest.fixture
+def ws_client():
+    """Fresh BinanceWebSocketClient per test (no callbacks, not running)"""
+    client = BinanceWebSocketClient(["btcusdt"])
+    yield client
+    client.callbacks.clear()
+    client.running = False
+
+
+@pytest.fixture
+def binance_trade_msg():
+    """Canonical Binance trade message (buy side: m=false → buyer is taker)"""
+    return {
+        "e": "trade",
+        "E": 1234567890000,
+        "s": "BTCUSDT",
+        "t": 12345,
+        "p": "50000.00",
+        "q": "0.1",
+        "T": 1702857600000,  # 2023-12-18 10:00:00
+        "m": False,
+    }
@@ -4,17 +4,12 @@ Unit tests for StreamProcessor (Phase 2 - Redis ONLY)
 Tests simplified Redis-only functionality.
 """
 
-import sys
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
-from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 
-project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from core.models.market_data import OrderBook, Trade
 from services.market_data_ingestion.stream_processor import StreamProcessor
 
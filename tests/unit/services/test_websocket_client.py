@@ -4,17 +4,14 @@ Unit tests for BinanceWebSocketClient
 Mocks websocket connection to test parsing and callback logic
 """
 
-import sys
+import asyncio
+import json
 from datetime import datetime
-from decimal import Decimal
-from pathlib import Path
-from unittest.mock import AsyncMock
+from decimal import Decimal, InvalidOperation
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from core.models.market_data import Trade
 from services.market_data_ingestion.websocket_client import BinanceWebSocketClient
 
@@ -31,44 +28,28 @@ class TestBinanceWebSocketClient:
         assert client.callbacks == []
         assert client.running is False
 
-    def test_on_trade_registers_callback(self):
+    def test_on_trade_registers_callback(self, ws_client):
         """Test that on_trade registers callback"""
-        client = BinanceWebSocketClient(["btcusdt"])
         mock_callback = AsyncMock()
 
-        client.on_trade(mock_callback)
+        ws_client.on_trade(mock_callback)
 
-        assert len(client.callbacks) == 1
-        assert client.callbacks[0] == mock_callback
+        assert len(ws_client.callbacks) == 1
+        assert ws_client.callbacks[0] == mock_callback
 
-    def test_on_trade_multiple_callbacks(self):
+    def test_on_trade_multiple_callbacks(self, ws_client):
         """Test registering multiple callbacks"""
-        client = BinanceWebSocketClient(["btcusdt"])
         callback1 = AsyncMock()
         callback2 = AsyncMock()
 
-        client.on_trade(callback1)
-        client.on_trade(callback2)
+        ws_client.on_trade(callback1)
+        ws_client.on_trade(callback2)
 
-        assert len(client.callbacks) == 2
+        assert len(ws_client.callbacks) == 2
 
-    def test_parse_trade_buy_side(self):
+    def test_parse_trade_buy_side(self, ws_client, binance_trade_msg):
         """Test parsing Binance trade message - buy side"""
-        client = BinanceWebSocketClient(["btcusdt"])
-
-        # Binance message format
-        binance_message = {
-            "e": "trade",
-            "E": 1234567890000,
-            "s": "BTCUSDT",
-            "t": 12345,
-            "p": "50000.00",
-            "q": "0.1",
-            "T": 1702857600000,  # 2023-12-18 10:00:00
-            "m": False,  # m=false → buyer is taker → side="buy"
-        }
-
-        trade = client._parse_trade(binance_message)
+        trade = ws_client._parse_trade(binance_trade_msg)
 
         assert isinstance(trade, Trade)
         assert trade.exchange == "binance"
@@ -79,43 +60,26 @@ class TestBinanceWebSocketClient:
         assert trade.side == "buy"  # m=false → buy
         assert trade.is_buyer_maker is False
 
-    def test_parse_trade_sell_side(self):
+    def test_parse_trade_sell_side(self, ws_client, binance_trade_msg):
         """Test parsing Binance trade message - sell side"""
-        client = BinanceWebSocketClient(["ethusdt"])
-
         binance_message = {
-            "e": "trade",
-            "E": 1234567890000,
+            **binance_trade_msg,
             "s": "ETHUSDT",
             "t": 67890,
             "p": "3000.00",
             "q": "1.5",
-            "T": 1702857600000,
             "m": True,  # m=true → buyer is maker → side="sell"
         }
 
-        trade = client._parse_trade(binance_message)
+        trade = ws_client._parse_trade(binance_message)
 
         assert trade.symbol == "ETHUSDT"
         assert trade.side == "sell"  # m=true → sell
         assert trade.is_buyer_maker is True
 
-    def test_parse_trade_timestamp_conversion(self):
+    def test_parse_trade_timestamp_conversion(self, ws_client, binance_trade_msg):
         """Test timestamp conversion from milliseconds"""
-        client = BinanceWebSocketClient(["btcusdt"])
-
-        binance_message = {
-            "e": "trade",
-            "E": 1234567890000,
-            "s": "BTCUSDT",
-            "t": 12345,
-            "p": "50000.00",
-            "q": "0.1",
-            "T": 1702857600000,  # Unix timestamp in ms
-            "m": False,
-        }
-
-        trade = client._parse_trade(binance_message)
+        trade = ws_client._parse_trade(binance_trade_msg)
 
         # 1702857600000 ms = 2023-12-18 10:00:00 UTC
         expected_timestamp = datetime(2023, 12, 18, 3, 0, 0)  # Adjusted for timezone
@@ -124,25 +88,23 @@ class TestBinanceWebSocketClient:
         assert trade.timestamp.day == expected_timestamp.day
 
     @pytest.mark.asyncio
-    async def test_stop_sets_running_false(self):
+    async def test_stop_sets_running_false(self, ws_client):
         """Test that stop() sets running to False"""
-        client = BinanceWebSocketClient(["btcusdt"])
-        client.running = True
+        ws_client.running = True
 
-        await client.stop()
+        await ws_client.stop()
 
-        assert client.running is False
+        assert ws_client.running is False
 
 
 class TestBinanceWebSocketCallbacks:
     """Test callback execution"""
 
     @pytest.mark.asyncio
-    async def test_callback_execution(self):
+    async def test_callback_execution(self, ws_client):
         """Test that callbacks are called with trade"""
-        client = BinanceWebSocketClient(["btcusdt"])
         mock_callback = AsyncMock()
-        client.on_trade(mock_callback)
+        ws_client.on_trade(mock_callback)
 
         # Create mock trade
         trade = Trade(
@@ -157,19 +119,18 @@ class TestBinanceWebSocketCallbacks:
         )
 
         # Manually trigger callback (simulating websocket message)
-        for callback in client.callbacks:
+        for callback in ws_client.callbacks:
             await callback(trade)
 
         mock_callback.assert_called_once_with(trade)
 
     @pytest.mark.asyncio
-    async def test_multiple_callbacks_execution(self):
+    async def test_multiple_callbacks_execution(self, ws_client):
         """Test that all callbacks are called"""
-        client = BinanceWebSocketClient(["btcusdt"])
         callback1 = AsyncMock()
         callback2 = AsyncMock()
-        client.on_trade(callback1)
-        client.on_trade(callback2)
+        ws_client.on_trade(callback1)
+        ws_client.on_trade(callback2)
 
         trade = Trade(
             timestamp=datetime.now(),
@@ -183,7 +144,7 @@ class TestBinanceWebSocketCallbacks:
         )
 
         # Trigger all callbacks
-        for callback in client.callbacks:
+        for callback in ws_client.callbacks:
             await callback(trade)
 
         callback1.assert_called_once()
@@ -193,45 +154,273 @@ class TestBinanceWebSocketCallbacks:
 class TestBinanceMessageParsing:
     """Test edge cases in message parsing"""
 
-    def test_parse_trade_with_large_numbers(self):
+    def test_parse_trade_with_large_numbers(self, ws_client, binance_trade_msg):
         """Test parsing trades with large quantities/prices"""
-        client = BinanceWebSocketClient(["btcusdt"])
-
         binance_message = {
-            "e": "trade",
-            "E": 1234567890000,
-            "s": "BTCUSDT",
-            "t": 12345,
+            **binance_trade_msg,
             "p": "87643.99999999",  # Large decimal
             "q": "123.45678900",  # Large quantity
-            "T": 1702857600000,
-            "m": False,
         }
 
-        trade = client._parse_trade(binance_message)
+        trade = ws_client._parse_trade(binance_message)
 
         assert trade.price == Decimal("87643.99999999")
         assert trade.quantity == Decimal("123.45678900")
 
-    def test_parse_trade_with_scientific_notation(self):
+    def test_parse_trade_with_scientific_notation(self, ws_client, binance_trade_msg):
         """Test parsing very small quantities"""
-        client = BinanceWebSocketClient(["btcusdt"])
-
         binance_message = {
-            "e": "trade",
-            "E": 1234567890000,
-            "s": "BTCUSDT",
-            "t": 12345,
-            "p": "50000.00",
+            **binance_trade_msg,
             "q": "0.00000001",  # Very small quantity
-            "T": 1702857600000,
             "m": True,
         }
 
-        trade = client._parse_trade(binance_message)
+        trade = ws_client._parse_trade(binance_message)
 
         assert trade.quantity == Decimal("0.00000001")
 
+    def test_parse_trade_batch(self, ws_client, binance_trade_msg):
+        """Test batch parsing matches one-by-one parsing"""
+        messages = [
+            {
+                **binance_trade_msg,
+                "s": "BTCUSDT" if i % 2 else "ETHUSDT",
+                "t": i,
+                "p": f"{50000 + i}.25",
+                "q": f"0.{i:04d}",
+                "T": 1702857600000 + i,
+                "m": i % 3 == 0,
+            }
+            for i in range(1000)
+        ]
+
+        batch = ws_client._parse_trade_batch(messages)
+
+        assert len(batch) == 1000
+        assert batch == [ws_client._parse_trade(m) for m in messages]
+
+    @pytest.mark.parametrize("price", ["12a.5", "", "50000.00x"])
+    def test_malformed_price_raises(self, ws_client, binance_trade_msg, price):
+        """Test a malformed price string is rejected, never parsed into a wrong number"""
+        with pytest.raises(InvalidOperation):
+            ws_client._parse_trade({**binance_trade_msg, "p": price})
+
+
+class FakeConnection:
+    """Fake websockets connection replaying a fixed list of frames"""
+
+    def __init__(self, frames: list[str], idle: asyncio.Event | None = None):
+        self.frames = frames
+        self.idle = idle  # Keep the connection open until set (like a quiet stream)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+        if self.idle is not None:
+            await self.idle.wait()
+
+
+class TestBinanceReceiveLoop:
+    """Test the receive loop against a fake transport"""
+
+    @pytest.mark.asyncio
+    async def test_receive_burst_of_frames(self, ws_client, binance_trade_msg):
+        """Test a burst of 10 000 frames is parsed in order with bounded rx limits"""
+        frames = [json.dumps({**binance_trade_msg, "t": i}) for i in range(10_000)]
+        received = []
+        done = asyncio.Event()
+
+        async def on_trade(trade):
+            received.append(trade.trade_id)
+            if len(received) == len(frames):
+                await ws_client.stop()
+                done.set()
+
+        ws_client.on_trade(on_trade)
+
+        with patch(
+            "services.market_data_ingestion.websocket_client.connect",
+            return_value=FakeConnection(frames, idle=done),
+        ) as mock_connect:
+            await ws_client.start()
+
+        assert received == [str(i) for i in range(10_000)]
+        kwargs = mock_connect.call_args.kwargs
+        assert kwargs["max_size"] == BinanceWebSocketClient.RX_CHUNK_SIZE
+        assert kwargs["max_queue"] == BinanceWebSocketClient.RX_MAX_QUEUE
+
+    @pytest.mark.asyncio
+    async def test_slow_callback_does_not_block_recv(self, ws_client, binance_trade_msg):
+        """Test a slow callback doesn't hold up delivery to a fast one"""
+        frames = [json.dumps({**binance_trade_msg, "t": i}) for i in range(5)]
+        fast_count = 0
+        all_fast = asyncio.Event()
+
+        async def slow_callback(trade):
+            await asyncio.sleep(1)
+
+        async def fast_callback(trade):
+            nonlocal fast_count
+            fast_count += 1
+            if fast_count == len(frames):
+                all_fast.set()
+
+        ws_client.on_trade(slow_callback)
+        ws_client.on_trade(fast_callback)
+
+        with patch(
+            "services.market_data_ingestion.websocket_client.connect",
+            return_value=FakeConnection(frames, idle=asyncio.Event()),
+        ):
+            task = asyncio.create_task(ws_client.start())
+            try:
+                # All fast callbacks fire well before a single slow one completes
+                await asyncio.wait_for(all_fast.wait(), timeout=0.5)
+            finally:
+                await ws_client.stop()
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                for pending in list(ws_client._callback_tasks):
+                    pending.cancel()
+
+        assert fast_count == len(frames)
+
+    @pytest.mark.asyncio
+    async def test_callbacks_receive_trades_in_order(self, ws_client, binance_trade_msg):
+        """Test each callback sees trades in arrival order, even when some take longer"""
+        frames = [json.dumps({**binance_trade_msg, "t": i}) for i in range(5)]
+        seen = {"uneven": [], "fast": []}
+        done = asyncio.Event()
+
+        async def uneven_callback(trade):
+            # Earlier trades take longer - concurrent delivery would reorder them
+            await asyncio.sleep(0.01 * (5 - int(trade.trade_id)))
+            seen["uneven"].append(trade.trade_id)
+            if len(seen["uneven"]) == len(frames):
+                done.set()
+
+        async def fast_callback(trade):
+            seen["fast"].append(trade.trade_id)
+
+        ws_client.on_trade(uneven_callback)
+        ws_client.on_trade(fast_callback)
+
+        with patch(
+            "services.market_data_ingestion.websocket_client.connect",
+            return_value=FakeConnection(frames, idle=asyncio.Event()),
+        ):
+            task = asyncio.create_task(ws_client.start())
+            try:
+                await asyncio.wait_for(done.wait(), timeout=1)
+            finally:
+                await ws_client.stop()
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        assert seen["uneven"] == seen["fast"] == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_full_callback_queue_pauses_receive(self, binance_trade_msg):
+        """Test the receive loop stops reading once a callback's queue is full"""
+        ws_client = BinanceWebSocketClient(["btcusdt"], callback_queue_size=2)
+        frames = [json.dumps({**binance_trade_msg, "t": i}) for i in range(5)]
+        release = asyncio.Event()
+        started = []
+
+        async def blocked_callback(trade):
+            started.append(trade.trade_id)
+            await release.wait()
+
+        ws_client.on_trade(blocked_callback)
+
+        with patch(
+            "services.market_data_ingestion.websocket_client.connect",
+            return_value=FakeConnection(frames, idle=asyncio.Event()),
+        ):
+            task = asyncio.create_task(ws_client.start())
+            try:
+                await asyncio.sleep(0.05)
+                # One trade in the callback, two queued - the rest not read yet
+                assert started == ["0"]
+                assert ws_client._callback_queues[0].qsize() == 2
+
+                release.set()
+                await asyncio.sleep(0.05)
+                assert started == ["0", "1", "2", "3", "4"]
+            finally:
+                await ws_client.stop()
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+    @pytest.mark.asyncio
+    async def test_inline_single_callback(self, binance_trade_msg):
+        """Test the single-callback fast path awaits the callback in the receive loop"""
+        ws_client = BinanceWebSocketClient(["btcusdt"], inline_single_callback=True)
+        frames = [json.dumps({**binance_trade_msg, "t": i}) for i in range(3)]
+        seen = []
+        done = asyncio.Event()
+
+        async def callback(trade):
+            seen.append(trade.trade_id)
+            assert not ws_client._callback_tasks  # No consumer task / queue hop
+            if len(seen) == len(frames):
+                done.set()
+
+        ws_client.on_trade(callback)
+
+        with patch(
+            "services.market_data_ingestion.websocket_client.connect",
+            return_value=FakeConnection(frames, idle=asyncio.Event()),
+        ):
+            task = asyncio.create_task(ws_client.start())
+            try:
+                await asyncio.wait_for(done.wait(), timeout=0.5)
+            finally:
+                await ws_client.stop()
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        assert seen == ["0", "1", "2"]
+
+
+class TestMsgspecParsing:
+    """Test msgspec decode path matches _parse_trade"""
+
+    @pytest.fixture(autouse=True)
+    def _require_msgspec(self):
+        pytest.importorskip("msgspec")
+
+    @pytest.mark.parametrize("is_buyer_maker", [True, False])
+    def test_decode_matches_parse_trade(self, ws_client, binance_trade_msg, is_buyer_maker):
+        """Test raw frame decode produces the same Trade as dict parsing"""
+        binance_message = {
+            **binance_trade_msg,
+            "p": "87643.99999999",
+            "q": "0.00000001",
+            "m": is_buyer_maker,
+            "M": True,  # Ignored field
+        }
+        raw = json.dumps(binance_message).encode()
+
+        assert ws_client._decode_trade(raw) == ws_client._parse_trade(binance_message)
+
+    def test_decode_invalid_message_raises(self, ws_client):
+        """Test non-trade frames raise (caught by the receive loop)"""
+        import msgspec
+
+        with pytest.raises(msgspec.ValidationError):
+            ws_client._decode_trade(b'{"result": null, "id": 1}')
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -9,7 +9,7 @@ from decimal import Decimal
 
 import pytest
 
-from core.models.market_data import Candle, OrderBook, Trade
+from core.models.market_data import _ZERO_LEVEL, Candle, OrderBook, Trade
 
 
 class TestTradeModel:
@@ -89,6 +89,28 @@ class TestTradeModel:
         assert "50000" in json_str
         assert "binance" in json_str
 
+    def test_symbol_interned(self):
+        """Test symbol/exchange/side strings are interned (shared across trades)"""
+
+        def make_trade() -> Trade:
+            # Build strings at runtime so they are distinct objects (like parsed JSON)
+            return Trade(
+                timestamp=datetime(2023, 12, 18, 10, 0, 0),
+                exchange="".join(["bin", "ance"]),
+                symbol="".join(["BTC", "USDT"]),
+                trade_id="12345",
+                price=Decimal("50000.00"),
+                quantity=Decimal("0.1"),
+                side="".join(["b", "uy"]),
+                is_buyer_maker=False,
+            )
+
+        first, second = make_trade(), make_trade()
+
+        assert first.symbol is second.symbol
+        assert first.exchange is second.exchange
+        assert first.side is second.side
+
 
 class TestCandleModel:
     """Test Candle model validation"""
@@ -215,6 +237,10 @@ class TestOrderBookModel:
         assert orderbook.spread == Decimal(0)
         assert orderbook.mid_price == Decimal(0)
 
+        # Empty-book level is a shared constant, not rebuilt per call
+        assert orderbook.best_bid is _ZERO_LEVEL
+        assert orderbook.best_ask is _ZERO_LEVEL
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
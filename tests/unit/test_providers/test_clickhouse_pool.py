@@ -6,14 +6,19 @@ Tests:
 - Pool size configuration
 - Poison connection recovery
 - Connection reuse
+- Dedicated insert executor sizing + shutdown
 """
 
 import asyncio
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from providers.opensource.clickhouse import ClickHouseClient
+from core.interfaces.database import IndicatorSet, TradeRow
+from providers.opensource import clickhouse
+from providers.opensource.clickhouse import ClickHouseClient, _ConnectionPool
+from tests.unit._helpers import FakeSettings
 
 
 @pytest.mark.unit
@@ -28,6 +33,10 @@ async def test_connection_pool_creation():
         # Mock settings to return pool size = 3
         with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
             mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 3
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
             mock_settings.return_value.CLICKHOUSE_HOST = "clickhouse"
             mock_settings.return_value.CLICKHOUSE_PORT = 9000
             mock_settings.return_value.CLICKHOUSE_DB = "trading"
@@ -79,6 +88,10 @@ async def test_poison_connection_recovery():
 
         with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
             mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1  # Single connection pool
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
             mock_settings.return_value.CLICKHOUSE_HOST = "clickhouse"
             mock_settings.return_value.CLICKHOUSE_PORT = 9000
             mock_settings.return_value.CLICKHOUSE_DB = "trading"
@@ -94,28 +107,31 @@ async def test_poison_connection_recovery():
 
             # Try to insert with poisoned connection
             trades = [
-                {
-                    "timestamp": "2024-01-01 00:00:00",
-                    "exchange": "binance",
-                    "symbol": "BTCUSDT",
-                    "trade_id": "test_123",
-                    "price": 50000.0,
-                    "quantity": 1.0,
-                    "side": "buy",
-                    "is_buyer_maker": False,
-                }
+                TradeRow(
+                    timestamp="2024-01-01 00:00:00",
+                    exchange="binance",
+                    symbol="BTCUSDT",
+                    trade_id="test_123",
+                    price=50000.0,
+                    quantity=1.0,
+                    side="buy",
+                    is_buyer_maker=False,
+                )
             ]
 
             result = await client._insert_trades_impl(trades)
 
-            # Should return 0 (failed due to poisoned connection)
-            assert result == 0
+            # Accepted: the failed block stays buffered for the next flush
+            assert result == 1
+            assert client._insert_buffer == trades
             # Pool should still have 1 connection (new one replaced poisoned)
             assert client._pool.qsize() == 1
             # Verify poisoned connection was disconnected
             poisoned_conn.disconnect.assert_called_once()
 
+            # close() retries the block on the replacement connection
             await client.close()
+            assert _insert_count(new_conn) == 1
 
 
 @pytest.mark.unit
@@ -139,6 +155,10 @@ async def test_concurrent_inserts_with_pool():
 
         with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
             mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 2  # Small pool
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
             mock_settings.return_value.CLICKHOUSE_HOST = "clickhouse"
             mock_settings.return_value.CLICKHOUSE_PORT = 9000
             mock_settings.return_value.CLICKHOUSE_DB = "trading"
@@ -151,16 +171,16 @@ async def test_concurrent_inserts_with_pool():
             # Create multiple concurrent insert tasks
             async def insert_batch(batch_id: int):
                 trades = [
-                    {
-                        "timestamp": "2024-01-01 00:00:00",
-                        "exchange": "binance",
-                        "symbol": "BTCUSDT",
-                        "trade_id": f"test_{batch_id}_{i}",
-                        "price": 50000.0 + i,
-                        "quantity": 1.0,
-                        "side": "buy",
-                        "is_buyer_maker": False,
-                    }
+                    TradeRow(
+                        timestamp="2024-01-01 00:00:00",
+                        exchange="binance",
+                        symbol="BTCUSDT",
+                        trade_id=f"test_{batch_id}_{i}",
+                        price=50000.0 + i,
+                        quantity=1.0,
+                        side="buy",
+                        is_buyer_maker=False,
+                    )
                     for i in range(5)
                 ]
                 return await client._insert_trades_impl(trades)
@@ -188,6 +208,10 @@ async def test_pool_connection_reuse():
 
         with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
             mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1  # Single connection
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
             mock_settings.return_value.CLICKHOUSE_HOST = "clickhouse"
             mock_settings.return_value.CLICKHOUSE_PORT = 9000
             mock_settings.return_value.CLICKHOUSE_DB = "trading"
@@ -202,16 +226,16 @@ async def test_pool_connection_reuse():
 
             # Use connection for insert
             trades = [
-                {
-                    "timestamp": "2024-01-01 00:00:00",
-                    "exchange": "binance",
-                    "symbol": "BTCUSDT",
-                    "trade_id": "test_1",
-                    "price": 50000.0,
-                    "quantity": 1.0,
-                    "side": "buy",
-                    "is_buyer_maker": False,
-                }
+                TradeRow(
+                    timestamp="2024-01-01 00:00:00",
+                    exchange="binance",
+                    symbol="BTCUSDT",
+                    trade_id="test_1",
+                    price=50000.0,
+                    quantity=1.0,
+                    side="buy",
+                    is_buyer_maker=False,
+                )
             ]
             await client._insert_trades_impl(trades)
 
@@ -242,6 +266,10 @@ async def test_pool_closes_all_connections():
 
         with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
             mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 3
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
             mock_settings.return_value.CLICKHOUSE_HOST = "clickhouse"
             mock_settings.return_value.CLICKHOUSE_PORT = 9000
             mock_settings.return_value.CLICKHOUSE_DB = "trading"
@@ -260,3 +288,568 @@ async def test_pool_closes_all_connections():
 
             # Pool should be empty
             assert client._pool.empty()
+
+
+@pytest.mark.unit
+async def test_pool_hands_off_to_waiters_in_order():
+    """Verify release() hands a connection directly to the oldest waiter"""
+    pool = _ConnectionPool(1)
+    conn = MagicMock()
+    pool.release(conn)
+
+    held = await pool.acquire()
+    assert pool.empty()
+
+    # Two waiters queue up while the only connection is checked out
+    first = asyncio.create_task(pool.acquire())
+    second = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not first.done() and not second.done()
+
+    pool.release(held)
+    assert await first is conn
+    assert not second.done()
+    # Hand-off bypasses the slots
+    assert pool.qsize() == 0
+
+    pool.release(await first)
+    assert await second is conn
+
+
+@pytest.mark.unit
+async def test_lazy_pool_grows_on_demand():
+    """Verify lazy mode opens min_pool_size at startup and grows up to pool_size"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_client_class.side_effect = lambda **_: MagicMock(execute=MagicMock(return_value=[[1]]))
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 3
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = True
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+            mock_settings.return_value.CLICKHOUSE_MIN_POOL_SIZE = 1
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            # Only the seed connection is opened at startup
+            assert mock_client_class.call_count == 1
+            assert client._pool.qsize() == 1
+
+            # Three concurrent checkouts: 1 idle + 2 opened on demand
+            held = [await client._pool.acquire() for _ in range(3)]
+            assert mock_client_class.call_count == 3
+            assert len({id(conn) for conn in held}) == 3
+
+            # Pool is at capacity - a 4th checkout waits instead of opening more
+            waiter = asyncio.create_task(client._pool.acquire())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+            assert mock_client_class.call_count == 3
+
+            client._pool.release(held[0])
+            assert await waiter is held[0]
+
+            for conn in held:
+                client._pool.release(conn)
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_connect_failure_disconnects_opened_connections():
+    """Verify a failed startup handshake doesn't leak the connections that succeeded"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        good = MagicMock(execute=MagicMock(return_value=[[1]]))
+        bad = MagicMock(execute=MagicMock(side_effect=Exception("Connection refused")))
+        mock_client_class.side_effect = [good, bad]
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 2
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            with pytest.raises(Exception, match="Connection refused"):
+                await client.connect()
+
+            good.disconnect.assert_called_once()
+            assert client._pool.empty()
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_insert_trades_sends_columnar_payload():
+    """Verify trades are inserted as one list per column (columnar=True)"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock()
+        mock_conn.execute = MagicMock(return_value=[[1]])
+        mock_client_class.return_value = mock_conn
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            trades = [
+                TradeRow(
+                    timestamp="2024-01-01 00:00:00",
+                    exchange="binance",
+                    symbol="BTCUSDT",
+                    trade_id=f"test_{i}",
+                    price=50000.5,
+                    quantity=0.1,
+                    side="buy" if i % 2 else "sell",
+                    is_buyer_maker=bool(i % 2),
+                )
+                for i in range(3)
+            ]
+
+            assert await client._insert_trades_impl(trades) == 3
+
+            query, columns = mock_conn.execute.call_args.args
+            assert "INSERT INTO trading.market_trades" in query
+            assert mock_conn.execute.call_args.kwargs == {"columnar": True}
+            assert len(columns) == 8
+            assert columns[3] == ["test_0", "test_1", "test_2"]
+            assert columns[4] == [50000.5] * 3
+            assert columns[7] == [0, 1, 0]
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_insert_indicators_bulk_sends_one_insert():
+    """Verify indicator sets for several candles go out as one INSERT, off the event loop"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock()
+        mock_conn.execute = MagicMock(return_value=[[1]])
+        mock_client_class.return_value = mock_conn
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+            mock_conn.execute.reset_mock()
+            threads = []
+            mock_conn.execute.side_effect = lambda *a, **kw: threads.append(
+                threading.current_thread().name
+            )
+
+            sets = [
+                IndicatorSet("binance", "BTCUSDT", "1m", "2024-01-01 00:00:00", {"SMA_20": 1.0}),
+                IndicatorSet(
+                    "binance", "ETHUSDT", "5m", "2024-01-01 00:00:00", {"RSI_14": 2, "EMA_12": 3.0}
+                ),
+            ]
+
+            assert await client.insert_indicators_bulk(sets) == 3
+            assert await client.insert_indicators_bulk([]) == 0
+
+            mock_conn.execute.assert_called_once()
+            query, columns = mock_conn.execute.call_args.args
+            assert "INSERT INTO trading.indicators" in query
+            assert mock_conn.execute.call_args.kwargs == {"columnar": True}
+            # One row per indicator, one list per column
+            assert [column[1] for column in columns] == [
+                "2024-01-01 00:00:00",
+                "binance",
+                "ETHUSDT",
+                "5m",
+                "RSI_14",
+                2.0,
+            ]
+            assert columns[4] == ["SMA_20", "RSI_14", "EMA_12"]
+            # Big batches are split client-side into block_rows-sized native blocks
+            assert mock_client_class.call_args.kwargs["settings"] == {"insert_block_size": 1}
+            # Rows are built + sent off the event loop, on the insert executor
+            assert threads[0].startswith("ch-insert")
+
+            await client.close()
+
+
+def _insert_count(mock_conn: MagicMock) -> int:
+    """Number of INSERT statements executed on a mock connection"""
+    return sum(1 for c in mock_conn.execute.call_args_list if "INSERT" in str(c.args[0]))
+
+
+@pytest.mark.unit
+async def test_block_buffer_flushes_on_row_count():
+    """Verify small batches accumulate until block_rows, then go out as one INSERT"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock()
+        mock_conn.execute = MagicMock(return_value=[[1]])
+        mock_client_class.return_value = mock_conn
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 10
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 60_000
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            trade = TradeRow(
+                timestamp="2024-01-01 00:00:00",
+                exchange="binance",
+                symbol="BTCUSDT",
+                trade_id="test",
+                price=50000.0,
+                quantity=1.0,
+                side="buy",
+                is_buyer_maker=False,
+            )
+
+            # Below block size: accepted + buffered, nothing inserted yet
+            assert await client._insert_trades_impl([trade] * 5) == 5
+            assert _insert_count(mock_conn) == 0
+
+            # Crossing block size flushes the whole buffer in one INSERT
+            assert await client._insert_trades_impl([trade] * 5) == 5
+            assert _insert_count(mock_conn) == 1
+
+            # Partial block is flushed on close
+            await client._insert_trades_impl([trade] * 3)
+            await client.close()
+            assert _insert_count(mock_conn) == 2
+            assert len(mock_conn.execute.call_args.args[1][0]) == 3
+
+
+@pytest.mark.unit
+async def test_block_buffer_flushes_on_interval():
+    """Verify the background flusher inserts a partial block after flush_ms"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock()
+        mock_conn.execute = MagicMock(return_value=[[1]])
+        mock_client_class.return_value = mock_conn
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1000
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 20
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            trade = TradeRow(
+                timestamp="2024-01-01 00:00:00",
+                exchange="binance",
+                symbol="BTCUSDT",
+                trade_id="test",
+                price=50000.0,
+                quantity=1.0,
+                side="buy",
+                is_buyer_maker=False,
+            )
+            assert await client._insert_trades_impl([trade]) == 1
+
+            for _ in range(50):
+                if _insert_count(mock_conn):
+                    break
+                await asyncio.sleep(0.01)
+
+            assert _insert_count(mock_conn) == 1
+            assert client._insert_buffer == []
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_failed_block_is_requeued_with_bounded_loss():
+    """Verify a failed flush keeps its rows for the next one, capped at 2 * block_rows"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock()
+        mock_conn.execute = MagicMock(return_value=[[1]])
+        mock_client_class.return_value = mock_conn
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 4
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 60_000
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            def trades(start: int, count: int) -> list[TradeRow]:
+                return [
+                    TradeRow(
+                        timestamp="2024-01-01 00:00:00",
+                        exchange="binance",
+                        symbol="BTCUSDT",
+                        trade_id=str(i),
+                        price=50000.0,
+                        quantity=1.0,
+                        side="buy",
+                        is_buyer_maker=False,
+                    )
+                    for i in range(start, start + count)
+                ]
+
+            def failing_insert(sql, *args, **kwargs):
+                if "INSERT" in sql:
+                    raise Exception("Connection lost")
+                return [[1]]
+
+            # ClickHouse rejecting INSERTs (replacement connections still open)
+            mock_conn.execute.side_effect = failing_insert
+            assert await client._insert_trades_impl(trades(0, 4)) == 4
+            assert [t.trade_id for t in client._insert_buffer] == ["0", "1", "2", "3"]
+
+            # Next block fails too: buffer holds at most 2 * block_rows, oldest dropped
+            assert await client._insert_trades_impl(trades(4, 6)) == 6
+            assert [t.trade_id for t in client._insert_buffer] == [str(i) for i in range(2, 10)]
+            assert client._dropped_trades == 2
+
+            # Back up: the retained rows go out in the next flush
+            mock_conn.execute.side_effect = None
+            await client.close()
+            assert len(mock_conn.execute.call_args.args[1][3]) == 8  # trade_id column
+            assert client._insert_buffer == []
+
+
+@pytest.mark.unit
+async def test_background_pinger_replaces_dead_idle_connection():
+    """Verify the pinger SELECT 1s idle connections and swaps out dead ones"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        healthy = MagicMock(execute=MagicMock(return_value=[[1]]))
+        dying = MagicMock(execute=MagicMock(return_value=[[1]]))
+        replacement = MagicMock(execute=MagicMock(return_value=[[1]]))
+        mock_client_class.side_effect = [healthy, dying, replacement]
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 2
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0.01
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            # Connection dies while idle in the pool
+            dying.execute.side_effect = Exception("Connection reset")
+
+            for _ in range(100):
+                if replacement in client._pool._slots:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert replacement in client._pool._slots
+            assert healthy in client._pool._slots
+            dying.disconnect.assert_called_once()
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_background_pinger_heals_fully_poisoned_pool():
+    """Verify a server restart (every connection dead, reconnect briefly failing) heals without a caller"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        old = [MagicMock(execute=MagicMock(return_value=[[1]])) for _ in range(3)]
+        restarting = Exception("Connection refused")
+        fresh = [MagicMock(execute=MagicMock(return_value=[[1]])) for _ in range(3)]
+        # Initial pool, then every replacement fails while the server is down,
+        # then the refill succeeds
+        mock_client_class.side_effect = [*old, restarting, restarting, restarting, *fresh]
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 3
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0.01
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            for conn in old:
+                conn.execute.side_effect = Exception("Connection reset")
+
+            for _ in range(100):
+                if client._pool.qsize() == 3 and all(c in client._pool._slots for c in fresh):
+                    break
+                await asyncio.sleep(0.01)
+
+            assert sorted(map(id, client._pool._slots)) == sorted(map(id, fresh))
+            assert client._pool.open_count == 3
+            for conn in old:
+                conn.disconnect.assert_called_once()
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_saturated_pool_serves_callers_fifo_and_records_waits():
+    """Verify 4 callers on 2 connections are served in arrival order, waits histogrammed"""
+    pool = _ConnectionPool(2)
+    conns = [MagicMock(), MagicMock()]
+    for conn in conns:
+        pool.add(conn)
+
+    held = [await pool.acquire(), await pool.acquire()]
+    order = []
+
+    async def caller(n: int):
+        conn = await pool.acquire()
+        order.append(n)
+        pool.release(conn)
+
+    waiters = [asyncio.create_task(caller(n)) for n in range(4)]
+    await asyncio.sleep(0.005)
+
+    for conn in held:
+        pool.release(conn)
+    await asyncio.gather(*waiters)
+
+    assert order == [0, 1, 2, 3]
+    # 2 immediate checkouts in bucket 0, 6 total counted
+    assert sum(pool.pool_wait_seconds) == 6
+    # The first two waiters blocked for >= 5ms (past the 1ms/2ms/4ms buckets)
+    assert sum(pool.pool_wait_seconds[3:]) >= 2
+
+
+@pytest.mark.unit
+async def test_session_pins_one_connection_per_task():
+    """Verify session() reuses one checkout for all operations and returns it on exit"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_client_class.side_effect = lambda **_: MagicMock(execute=MagicMock(return_value=[]))
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 2
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            async with client.session():
+                await client.query("SELECT 1")
+                await client.query("SELECT 2")
+
+                # One connection pinned for the whole block
+                assert client._pool.qsize() == 1
+
+                # Child tasks don't share the pinned connection
+                await asyncio.create_task(client.query("SELECT 3"))
+                assert client._pool.qsize() == 1
+
+            assert client._pool.qsize() == 2
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_insert_candles_unsupported_timeframe_keeps_connection():
+    """Verify a bad timeframe fails before checkout (connection not treated as poisoned)"""
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock(execute=MagicMock(return_value=[[1]]))
+        mock_client_class.return_value = mock_conn
+
+        with patch("providers.opensource.clickhouse.get_settings") as mock_settings:
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 1
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+
+            with pytest.raises(ValueError, match="Unsupported timeframe"):
+                await client.insert_candles([{"timestamp": "2024-01-01"}], timeframe="4h")
+
+            assert mock_client_class.call_count == 1  # No replacement opened
+            mock_conn.disconnect.assert_not_called()
+            assert client._pool.qsize() == 1
+
+            await client.close()
+
+
+@pytest.mark.unit
+async def test_insert_executor_sized_to_pool(monkeypatch):
+    """Verify inserts run on a shared ch-insert pool with one thread per pooled connection"""
+    monkeypatch.setattr(clickhouse, "_CH_EXECUTOR", None)
+    monkeypatch.setattr(clickhouse, "_CH_EXECUTOR_USERS", 0)
+    base_settings = FakeSettings(DB_WORKERS=1)
+
+    with patch("providers.opensource.clickhouse.Client") as mock_client_class:
+        mock_conn = MagicMock()
+        mock_conn.execute = MagicMock(return_value=[[1]])
+        mock_client_class.return_value = mock_conn
+
+        with (
+            patch("config.settings.get_settings", return_value=base_settings),
+            patch("providers.opensource.clickhouse.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.CLICKHOUSE_POOL_SIZE = 4
+            mock_settings.return_value.CLICKHOUSE_LAZY_POOL = False
+            mock_settings.return_value.CLICKHOUSE_BLOCK_ROWS = 1
+            mock_settings.return_value.CLICKHOUSE_FLUSH_MS = 0
+            mock_settings.return_value.CLICKHOUSE_PING_INTERVAL_S = 0
+
+            client = ClickHouseClient()
+            await client.connect()
+            executor = clickhouse._CH_EXECUTOR
+
+            # Sized to the connection pool, not DB_WORKERS (=1): indicator,
+            # candle + orderbook inserts share it with the trade workers
+            assert executor is not None
+            assert executor._max_workers == 4
+
+            # Reused, not recreated, by later clients
+            second = ClickHouseClient()
+            await second.connect()
+            assert clickhouse._CH_EXECUTOR is executor
+
+            # Insert executes on the dedicated pool's threads
+            thread_names = []
+            mock_conn.execute.side_effect = lambda *a, **k: thread_names.append(
+                threading.current_thread().name
+            )
+            trade = TradeRow(
+                timestamp="2024-01-01 00:00:00",
+                exchange="binance",
+                symbol="BTCUSDT",
+                trade_id="t1",
+                price=1,
+                quantity=1,
+                side="buy",
+                is_buyer_maker=False,
+            )
+            assert await client._insert_trades_impl([trade]) == 1
+            assert thread_names[0].startswith("ch-insert")
+
+            # Still open while any client is connected; the last close() shuts it down
+            await second.close()
+            assert clickhouse._CH_EXECUTOR is executor
+            await client.close()
+            assert clickhouse._CH_EXECUTOR is None
+            assert executor._shutdown
+
+            # A later connect() starts a fresh pool
+            third = ClickHouseClient()
+            await third.connect()
+            assert clickhouse._CH_EXECUTOR not in (None, executor)
+            await third.close()
+            assert clickhouse._CH_EXECUTOR is None
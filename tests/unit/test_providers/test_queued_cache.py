@@ -3,27 +3,29 @@ Unit tests for BaseCacheClient queued interface pattern.
 
 Tests the queue + worker pattern for cache clients (Redis):
 - Queue initialization and worker creation
-- Enqueue set operations (with TTL support)
+- Enqueue set operations (with TTL support, single and bulk)
 - Drop rate tracking and warning thresholds
 - Worker processing and error handling
-- Sentinel shutdown pattern
-- Backward compatibility with legacy async methods
+- Broadcast shutdown (closing event + ring close)
+- Backward compatibility with legacy async methods (+ hash helper defaults)
 """
 
 import asyncio
-import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
 
-from core.interfaces.cache import BaseCacheClient
+from core.interfaces.cache import BaseCacheClient, SetOp
+from core.utils.ring import RingClosedError
+from tests.unit._helpers import FakeSettings, FastCountingCacheClient
 
 
 class TestCacheClient(BaseCacheClient):
     """Concrete implementation for testing"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, settings: Any = None):
+        super().__init__(settings)
         self._set_mock = AsyncMock(return_value=True)
         self._get_mock = AsyncMock(return_value=None)
 
@@ -53,20 +55,32 @@ class TestCacheClient(BaseCacheClient):
 @pytest.fixture
 def mock_settings():
     """Mock settings with default queue config"""
-    settings = MagicMock()
-    settings.CACHE_QUEUE_SIZE = 1000
-    settings.CACHE_WORKERS = 5
-    return settings
+    return FakeSettings(CACHE_QUEUE_SIZE=1000, CACHE_WORKERS=5, CACHE_MAX_BATCH=100)
 
 
 @pytest.fixture
 async def connected_cache(mock_settings):
     """Create and connect a test cache client"""
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        cache = TestCacheClient()
-        await cache.connect()
-        yield cache
-        await cache.close()
+    cache = TestCacheClient(settings=mock_settings)
+    await cache.connect()
+    yield cache
+    await cache.close()
+
+
+def _set_calls(cache) -> int:
+    """Number of _set_impl() calls for either test client flavour"""
+    if isinstance(cache, FastCountingCacheClient):
+        return cache.calls
+    return cache._set_mock.call_count
+
+
+@pytest.fixture(params=[TestCacheClient, FastCountingCacheClient], ids=["mock", "fast"])
+async def any_cache(request, mock_settings):
+    """Connected cache client, once with AsyncMock and once with a plain counter"""
+    cache = request.param(settings=mock_settings)
+    await cache.connect()
+    yield cache
+    await cache.close()
 
 
 @pytest.fixture
@@ -75,11 +89,10 @@ async def small_queue_cache(mock_settings):
     mock_settings.CACHE_QUEUE_SIZE = 10
     mock_settings.CACHE_WORKERS = 1
 
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        cache = TestCacheClient()
-        await cache.connect()
-        yield cache
-        await cache.close()
+    cache = TestCacheClient(settings=mock_settings)
+    await cache.connect()
+    yield cache
+    await cache.close()
 
 
 class TestBaseCacheClientInitialization:
@@ -91,20 +104,19 @@ class TestBaseCacheClientInitialization:
         mock_settings.CACHE_QUEUE_SIZE = 200
         mock_settings.CACHE_WORKERS = 3
 
-        with patch("config.settings.get_settings", return_value=mock_settings):
-            cache = TestCacheClient()
-            await cache.connect()
+        cache = TestCacheClient(settings=mock_settings)
+        await cache.connect()
 
-            try:
-                # Verify queue created
-                assert cache._queue is not None
-                assert cache._queue.maxsize == 200
+        try:
+            # Verify queue created
+            assert cache._queue is not None
+            assert cache._queue.maxsize == 200
 
-                # Verify workers created
-                assert len(cache._worker_tasks) == 3
-                assert all(not task.done() for task in cache._worker_tasks)
-            finally:
-                await cache.close()
+            # Verify workers created
+            assert len(cache._worker_tasks) == 3
+            assert all(not task.done() for task in cache._worker_tasks)
+        finally:
+            await cache.close()
 
     @pytest.mark.asyncio
     async def test_connect_without_queue_raises_error(self):
@@ -162,12 +174,51 @@ class TestBaseCacheClientEnqueue:
         assert result is True
         assert connected_cache._queue.qsize() == 1
 
-        # Verify TTL is in the queued tuple: ("set", key, value, ttl)
+        # Verify TTL is in the queued op
+        item = connected_cache._queue.get_nowait()
+        assert item.key == "key"
+        assert item.value == "value"
+        assert item.ttl == timedelta(seconds=300)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_set_without_ttl_reaches_set_impl(self, connected_cache):
+        """Verify no-TTL sets queue ttl=None and reach _set_impl with ttl=None"""
+        connected_cache.enqueue_set("key", "value")
+
         item = connected_cache._queue.get_nowait()
-        assert item[0] == "set"
-        assert item[1] == "key"
-        assert item[2] == "value"
-        assert item[3] == timedelta(seconds=300)
+        assert isinstance(item, SetOp)
+        assert (item.key, item.value, item.ttl) == ("key", "value", None)
+
+        await connected_cache._set_many_impl([item])
+        connected_cache._set_mock.assert_awaited_once_with("key", "value", None)
+
+    def test_setop_indexes_like_legacy_tuple(self):
+        """Verify SetOp keeps the ("set", key, value, ttl) index layout"""
+        from datetime import timedelta
+
+        op = SetOp("k", "v", timedelta(seconds=5))
+
+        assert op[0] == "set"
+        assert (op[1], op[2], op[3]) == ("k", "v", timedelta(seconds=5))
+
+    @pytest.mark.asyncio
+    async def test_worker_recycles_setops(self, connected_cache):
+        """Verify written ops go back on the freelist and are reused by enqueue_set()"""
+        from core.interfaces import cache as cache_module
+
+        cache_module._SETOP_FREELIST.clear()
+        connected_cache.enqueue_set("a", "1")
+        await asyncio.wait_for(connected_cache._queue.join(), timeout=1.0)
+
+        assert len(cache_module._SETOP_FREELIST) == 1
+        recycled = cache_module._SETOP_FREELIST[0]
+
+        connected_cache.enqueue_set("b", "2")
+        assert not cache_module._SETOP_FREELIST
+        await asyncio.wait_for(connected_cache._queue.join(), timeout=1.0)
+
+        connected_cache._set_mock.assert_awaited_with("b", "2", None)
+        assert cache_module._SETOP_FREELIST[0] is recycled
 
     @pytest.mark.asyncio
     async def test_multiple_enqueue_increases_queue_size(self, connected_cache):
@@ -177,32 +228,91 @@ class TestBaseCacheClientEnqueue:
 
         assert connected_cache._queue.qsize() == 5
 
+    @pytest.mark.asyncio
+    async def test_enqueue_set_many_queues_batch(self, connected_cache):
+        """Verify a bulk submit reaches _set_impl once per item, ttl preserved"""
+        from datetime import timedelta
+
+        queued = connected_cache.enqueue_set_many(
+            [("a", "1", None), ("b", "2", timedelta(seconds=30)), ("c", "3", None)]
+        )
+        assert queued == 3
+
+        await asyncio.wait_for(connected_cache._queue.join(), timeout=1.0)
+        calls = {c.args for c in connected_cache._set_mock.await_args_list}
+        assert calls == {("a", "1", None), ("b", "2", timedelta(seconds=30)), ("c", "3", None)}
+
+    @pytest.mark.asyncio
+    async def test_enqueue_set_many_drops_overflow_in_one_shot(self, small_queue_cache):
+        """Verify items beyond free capacity are dropped and counted together"""
+        for i in range(7):
+            small_queue_cache.enqueue_set(f"k{i}", f"v{i}")
+
+        queued = small_queue_cache.enqueue_set_many([(f"b{i}", "v", None) for i in range(5)])
+
+        assert queued == 3
+        assert small_queue_cache._queue.full()
+        assert small_queue_cache._dropped_sets == 2
+        assert len(small_queue_cache._drop_rate_window) == 2
+        # Leading items are the ones kept
+        assert [op.key for op in small_queue_cache._queue.get_many_nowait(10)][-3:] == [
+            "b0",
+            "b1",
+            "b2",
+        ]
+
+    def test_enqueue_set_many_requires_connect(self):
+        """Verify bulk submit before connect() raises like enqueue_set()"""
+        with pytest.raises(RuntimeError):
+            TestCacheClient().enqueue_set_many([("k", "v", None)])
+
 
 class TestCacheClientDropRateTracking:
     """Test drop rate calculation and warning thresholds"""
 
     @pytest.mark.asyncio
-    async def test_drop_rate_window_maintains_60_seconds(self, small_queue_cache):
+    async def test_drop_rate_window_maintains_60_seconds(self, small_queue_cache, fake_clock):
         """Verify drop rate window only keeps last 60 seconds"""
         # Fill queue
         for i in range(10):
             small_queue_cache.enqueue_set(f"k{i}", f"v{i}")
 
         # Drop 5 operations at T=0
-        for i in range(5):
+        small_queue_cache._clock = fake_clock
+        for _ in range(5):
             small_queue_cache.enqueue_set("drop", "value")
-            time.sleep(0.01)
+            fake_clock.advance(0.01)
 
         assert len(small_queue_cache._drop_rate_window) == 5
 
-        # Mock time.time() to be 61 seconds later
-        current_time = time.time()
-        with patch("time.time", return_value=current_time + 61):
-            # Drop another operation
-            small_queue_cache.enqueue_set("drop2", "value")
+        # Move the drop clock 61 seconds later
+        fake_clock.advance(61)
+        small_queue_cache.enqueue_set("drop2", "value")
+
+        # Old drops should be removed from window
+        assert len(small_queue_cache._drop_rate_window) == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_buckets_are_fixed_size(self, small_queue_cache, fake_clock):
+        """Verify sustained drops reuse the 60 one-second buckets (bounded memory)"""
+        for i in range(10):
+            small_queue_cache.enqueue_set(f"k{i}", f"v{i}")
+
+        small_queue_cache._clock = fake_clock
+        for _ in range(120):
+            fake_clock.advance(1)
+            small_queue_cache.enqueue_set("drop", "value")
+            small_queue_cache.enqueue_set("drop", "value")
+
+        assert len(small_queue_cache._drop_buckets) == 120
+        assert small_queue_cache._dropped_sets == 240
+        # Clock left at the last drop second: only the last 60 seconds (2 drops each) remain
+        assert len(small_queue_cache._drop_rate_window) == 120
 
-            # Old drops should be removed from window
-            assert len(small_queue_cache._drop_rate_window) == 1
+    @pytest.mark.asyncio
+    async def test_drop_clock_is_loop_time(self, connected_cache):
+        """Verify connect() binds the drop clock to the running loop's monotonic time"""
+        assert connected_cache._clock == asyncio.get_running_loop().time
 
     @pytest.mark.asyncio
     async def test_drop_tracking_records_all_drops(self, small_queue_cache):
@@ -211,9 +321,7 @@ class TestCacheClientDropRateTracking:
         for i in range(10):
             small_queue_cache.enqueue_set(f"k{i}", f"v{i}")
 
-        # Give workers a moment to start processing (so queue stays full)
-        await asyncio.sleep(0.05)
-
+        # Workers haven't run yet (no await since filling), so the queue stays full
         # Drop multiple operations
         for i in range(15):
             small_queue_cache.enqueue_set(f"drop{i}", "value")
@@ -241,20 +349,17 @@ class TestCacheClientWorkers:
     """Test worker pool processing"""
 
     @pytest.mark.asyncio
-    async def test_workers_process_queue_items(self, connected_cache):
+    async def test_workers_process_queue_items(self, any_cache):
         """Verify workers call _set_impl() for each queued item"""
-        # Configure mock to return success
-        connected_cache._set_mock.return_value = True
-
         # Enqueue 5 operations
         for i in range(5):
-            connected_cache.enqueue_set(f"key{i}", f"value{i}")
+            any_cache.enqueue_set(f"key{i}", f"value{i}")
 
         # Wait for workers to process
-        await connected_cache._queue.join()
+        await any_cache._queue.join()
 
         # Verify _set_impl was called 5 times
-        assert connected_cache._set_mock.call_count == 5
+        assert _set_calls(any_cache) == 5
 
     @pytest.mark.asyncio
     async def test_worker_passes_ttl_to_impl(self, connected_cache):
@@ -290,8 +395,8 @@ class TestCacheClientWorkers:
         for i in range(3):
             connected_cache.enqueue_set(f"key{i}", f"value{i}")
 
-        # Wait
-        await asyncio.sleep(0.5)
+        # Wait until all three are processed (failures are still task_done())
+        await asyncio.wait_for(connected_cache._queue.join(), timeout=2.0)
 
         # First call failed, but workers should continue
         assert connected_cache._set_mock.call_count >= 2
@@ -319,61 +424,133 @@ class TestCacheClientWorkers:
         assert args[1] == "50000"
         assert args[2] == ttl
 
+    @pytest.mark.asyncio
+    async def test_worker_flushes_queued_items_as_batch(self, mock_settings):
+        """Verify a worker drains already-queued items into one _set_many_impl() call"""
+        cache = TestCacheClient(settings=mock_settings)
+        batches = []
+        original = cache._set_many_impl
+
+        async def record_batch(items):
+            batches.append(len(items))
+            await original(items)
+
+        # Before connect(): workers bind _set_many_impl once at startup
+        cache._set_many_impl = record_batch
+        await cache.connect()
+
+        try:
+            # Enqueue a burst before any worker runs
+            for i in range(10):
+                cache.enqueue_set(f"key{i}", f"value{i}")
+
+            await cache._queue.join()
+
+            assert sum(batches) == 10
+            assert max(batches) > 1
+            assert cache._set_mock.call_count == 10
+        finally:
+            await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_worker_batch_respects_max_batch(self, mock_settings):
+        """Verify no flush exceeds CACHE_MAX_BATCH items"""
+        mock_settings.CACHE_WORKERS = 1
+        mock_settings.CACHE_MAX_BATCH = 3
+
+        cache = TestCacheClient(settings=mock_settings)
+        batches = []
+        original = cache._set_many_impl
+
+        async def record_batch(items):
+            batches.append(len(items))
+            await original(items)
+
+        # Before connect(): workers bind _set_many_impl once at startup
+        cache._set_many_impl = record_batch
+        await cache.connect()
+
+        try:
+            for i in range(10):
+                cache.enqueue_set(f"key{i}", f"value{i}")
+
+            await cache._queue.join()
+
+            assert sum(batches) == 10
+            assert max(batches) == 3
+        finally:
+            await cache.close()
+
 
 class TestCacheClientShutdown:
-    """Test sentinel pattern shutdown"""
+    """Test broadcast shutdown"""
 
     @pytest.mark.asyncio
-    async def test_close_sends_sentinels_to_workers(self, connected_cache):
-        """Verify close() sends sentinel to each worker"""
+    async def test_close_signals_workers(self, connected_cache):
+        """Verify close() broadcasts shutdown without enqueuing anything"""
+        workers = list(connected_cache._worker_tasks)
+
         await connected_cache.close()
 
-        # Queue should be empty (sentinels consumed)
+        # Broadcast is the closed ring: drained getters see RingClosedError
+        with pytest.raises(RingClosedError):
+            await connected_cache._queue.get()
+        # Nothing was put on the queue to signal shutdown
         assert connected_cache._queue.qsize() == 0
         # All workers should be done
-        assert all(task.done() for task in connected_cache._worker_tasks)
+        assert all(task.done() for task in workers)
 
     @pytest.mark.asyncio
-    async def test_close_flushes_remaining_items(self, connected_cache):
-        """Verify close() processes remaining queued items before exit"""
-        connected_cache._set_mock.return_value = True
+    async def test_close_with_full_queue_does_not_stall(self, small_queue_cache):
+        """Verify close() needs no free queue slots to stop workers"""
+        for i in range(10):
+            small_queue_cache.enqueue_set(f"key{i}", f"value{i}")
+        assert small_queue_cache.enqueue_set("overflow", "dropped") is False
+
+        await asyncio.wait_for(small_queue_cache.close(), timeout=1.0)
 
+        assert small_queue_cache._queue.qsize() == 0
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_remaining_items(self, any_cache):
+        """Verify close() processes remaining queued items before exit"""
         # Enqueue 10 operations
         for i in range(10):
-            connected_cache.enqueue_set(f"key{i}", f"value{i}")
+            any_cache.enqueue_set(f"key{i}", f"value{i}")
 
         # Close immediately
-        await connected_cache.close()
+        await any_cache.close()
 
         # All items should have been processed before shutdown
-        assert connected_cache._set_mock.call_count == 10
+        assert _set_calls(any_cache) == 10
 
     @pytest.mark.asyncio
-    async def test_close_timeout_cancels_workers(self):
-        """Verify close() cancels workers that don't finish in 5s"""
-        mock_settings = MagicMock()
-        mock_settings.CACHE_QUEUE_SIZE = 100
-        mock_settings.CACHE_WORKERS = 2
+    async def test_close_timeout_cancels_workers(self, caplog):
+        """Verify close() cancels workers still running at the shared deadline"""
+        mock_settings = FakeSettings(CACHE_QUEUE_SIZE=100, CACHE_WORKERS=2, CACHE_MAX_BATCH=100)
 
-        with patch("config.settings.get_settings", return_value=mock_settings):
-            cache = TestCacheClient()
-            await cache.connect()
+        cache = TestCacheClient(settings=mock_settings)
+        await cache.connect()
 
-            # Mock _set_impl to be very slow
-            async def slow_set(*args):
-                await asyncio.sleep(10)  # Longer than 5s timeout
+        # Mock _set_impl to be very slow
+        async def slow_set(*args):
+            await asyncio.sleep(10)  # Longer than 5s timeout
 
-            cache._set_mock = slow_set
+        cache._set_mock = slow_set
 
-            # Enqueue item
-            cache.enqueue_set("key", "value")
+        # Enqueue item
+        cache.enqueue_set("key", "value")
 
-            # Close with timeout (should cancel workers after 5s)
-            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
-                await cache.close()
+        # Shrink the deadline so the test doesn't wait 5s
+        cache._CLOSE_TIMEOUT_SECS = 0.05
+        tasks = list(cache._worker_tasks)
+        await asyncio.sleep(0)  # Let a worker pick up the set
 
-            # Workers should be cancelled or done
-            assert all(task.cancelled() or task.done() for task in cache._worker_tasks)
+        await asyncio.wait_for(cache.close(), timeout=2.0)
+
+        # The stuck worker was cancelled, the idle one exited on its own
+        assert all(task.done() for task in tasks)
+        assert "1 cache workers didn't finish" in caplog.text
 
     @pytest.mark.asyncio
     async def test_workers_cleared_after_close(self, connected_cache):
@@ -420,9 +597,9 @@ class TestCacheClientBackwardCompatibility:
         assert result is True
         assert connected_cache._queue.qsize() == 1
 
-        # Verify TTL passed through: ("set", key, value, ttl)
+        # Verify TTL passed through
         item = connected_cache._queue.get_nowait()
-        assert item[3] == timedelta(seconds=300)
+        assert item.ttl == timedelta(seconds=300)
 
     @pytest.mark.asyncio
     async def test_set_preserves_parameters(self, connected_cache):
@@ -442,3 +619,24 @@ class TestCacheClientBackwardCompatibility:
         assert args[0] == "my-key"
         assert args[1] == "my-value"
         assert args[2] == ttl
+
+    @pytest.mark.asyncio
+    async def test_hash_defaults_fall_back_to_hset_and_hgetall(self):
+        """Verify default hset_many()/hget()/hmget() go through the provider's hset()/hgetall()"""
+        cache = TestCacheClient()
+        cache.hset = AsyncMock(return_value=1)
+        cache.hgetall = AsyncMock(return_value={"BTCUSDT": "v1"})
+
+        written = await cache.hset_many(
+            [("h1", {"BTCUSDT": "v1", "ETHUSDT": "v2"}, None), ("h2", {"BTCUSDT": "v3"}, None)]
+        )
+
+        assert written == 2
+        assert [c.args for c in cache.hset.call_args_list] == [
+            ("h1", "BTCUSDT", "v1"),
+            ("h1", "ETHUSDT", "v2"),
+            ("h2", "BTCUSDT", "v3"),
+        ]
+        assert await cache.hget("h1", "BTCUSDT") == "v1"
+        assert await cache.hget("h1", "SOLUSDT") is None
+        assert await cache.hmget("h1", ["SOLUSDT", "BTCUSDT"]) == [None, "v1"]
@@ -6,28 +6,35 @@ Tests the queue + worker + batching pattern for database clients (ClickHouse):
 - Enqueue operations for trades
 - Batching logic (accumulate until batch_size, then flush)
 - Drop rate tracking and panic thresholds
-- Sentinel shutdown with partial batch flushing
+- Broadcast shutdown with partial batch flushing
 - Backward compatibility with legacy async methods
 """
 
 import asyncio
-import time
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import Any
 
 import pytest
 
-from core.interfaces.database import BaseTimeSeriesDB
+from core.interfaces.database import BaseTimeSeriesDB, TradeRow
+from tests.unit._helpers import FakeSettings, FastAsyncMock
+
+_TRADE_TS = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _trade(trade_id: object) -> TradeRow:
+    """Queued trade row, distinguishable by trade_id"""
+    return TradeRow(_TRADE_TS, "binance", "BTC/USDT", str(trade_id), 50000.0, 0.1, "buy", False)
 
 
 class TestTimeSeriesDB(BaseTimeSeriesDB):
     """Concrete implementation for testing"""
 
-    def __init__(self):
-        super().__init__()
-        self._insert_trades_mock = AsyncMock(return_value=0)
+    def __init__(self, settings: Any = None):
+        super().__init__(settings)
+        self._insert_trades_mock = FastAsyncMock(return_value=0)
 
-    async def _insert_trades_impl(self, trades: list[dict]) -> int:
+    async def _insert_trades_impl(self, trades: list[TradeRow]) -> int:
         """Mock implementation"""
         return await self._insert_trades_mock(trades)
 
@@ -47,21 +54,16 @@ class TestTimeSeriesDB(BaseTimeSeriesDB):
 @pytest.fixture
 def mock_settings():
     """Mock settings with default queue config"""
-    settings = MagicMock()
-    settings.DB_QUEUE_SIZE = 2000
-    settings.DB_WORKERS = 3
-    settings.DB_BATCH_SIZE = 100
-    return settings
+    return FakeSettings(DB_QUEUE_SIZE=2000, DB_WORKERS=3, DB_BATCH_SIZE=100)
 
 
 @pytest.fixture
 async def connected_db(mock_settings):
     """Create and connect a test database client"""
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        db = TestTimeSeriesDB()
-        await db.connect()
-        yield db
-        await db.close()
+    db = TestTimeSeriesDB(settings=mock_settings)
+    await db.connect()
+    yield db
+    await db.close()
 
 
 @pytest.fixture
@@ -71,11 +73,10 @@ async def small_queue_db(mock_settings):
     mock_settings.DB_WORKERS = 1
     mock_settings.DB_BATCH_SIZE = 50
 
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        db = TestTimeSeriesDB()
-        await db.connect()
-        yield db
-        await db.close()
+    db = TestTimeSeriesDB(settings=mock_settings)
+    await db.connect()
+    yield db
+    await db.close()
 
 
 class TestBaseTimeSeriesDBInitialization:
@@ -88,15 +89,23 @@ class TestBaseTimeSeriesDBInitialization:
         mock_settings.DB_WORKERS = 3
         mock_settings.DB_BATCH_SIZE = 100
 
-        with patch("config.settings.get_settings", return_value=mock_settings):
-            db = TestTimeSeriesDB()
-            await db.connect()
+        db = TestTimeSeriesDB(settings=mock_settings)
+        await db.connect()
+
+        try:
+            assert db._buffer.maxlen == 2000
+            assert len(db._worker_tasks) == 3
+        finally:
+            await db.close()
+
+    @pytest.mark.asyncio
+    async def test_queue_state_lives_in_slots(self, connected_db):
+        """Verify base queue/worker state is slotted, not in the instance __dict__"""
+        instance_attrs = vars(connected_db)
 
-            try:
-                assert db._queue.maxsize == 2000
-                assert len(db._worker_tasks) == 3
-            finally:
-                await db.close()
+        assert "_buffer" not in instance_attrs
+        assert "_trade_drops" not in instance_attrs
+        assert set(instance_attrs) == {"_insert_trades_mock", "enqueue_trades"}
 
     @pytest.mark.asyncio
     async def test_connect_without_queue_raises_error(self):
@@ -104,12 +113,19 @@ class TestBaseTimeSeriesDBInitialization:
         db = TestTimeSeriesDB()
 
         with pytest.raises(RuntimeError, match="not connected"):
-            db.enqueue_trades([{"trade": 1}])
+            db.enqueue_trades([_trade(1)])
 
 
 class TestTimeSeriesDBEnqueueTrades:
     """Test enqueue_trades() method"""
 
+    @pytest.mark.asyncio
+    async def test_connect_binds_fast_enqueue_path(self, connected_db):
+        """Verify connect() swaps in the enqueue path without the connected check"""
+        assert connected_db.enqueue_trades == connected_db._enqueue_trades_fast
+        assert connected_db.enqueue_trades([_trade(1)]) == 1
+        assert "enqueue_trades" not in vars(TestTimeSeriesDB())
+
     @pytest.mark.asyncio
     async def test_enqueue_trades_returns_count(self, connected_db):
         """Verify enqueue_trades() returns count of queued trades"""
@@ -126,7 +142,7 @@ class TestTimeSeriesDBEnqueueTrades:
         count = connected_db.enqueue_trades(trades)
 
         assert count == 10
-        assert connected_db._queue.qsize() == 1  # 1 tuple item ("trades", list)
+        assert len(connected_db._buffer) == 10  # Trades buffered directly, no wrapper item
 
     @pytest.mark.asyncio
     async def test_enqueue_empty_trades_returns_zero(self, connected_db):
@@ -134,31 +150,74 @@ class TestTimeSeriesDBEnqueueTrades:
         count = connected_db.enqueue_trades([])
 
         assert count == 0
-        assert connected_db._queue.qsize() == 0
+        assert len(connected_db._buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_enqueue_trades_accepts_generator(self, connected_db):
+        """Verify a generator is buffered directly (no list needed)"""
+        count = connected_db.enqueue_trades(_trade(i) for i in range(5))
+
+        assert count == 5
+        assert [t.trade_id for t in connected_db._buffer] == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_generator_overflow_drops_oldest(self, small_queue_db):
+        """Verify generator overflow is counted exactly and evicts the oldest trades"""
+        small_queue_db.enqueue_trades(_trade(i) for i in range(7))
+
+        count = small_queue_db.enqueue_trades(_trade(f"new{i}") for i in range(5))
+
+        assert count == 5
+        assert small_queue_db._dropped_trades == 2
+        assert [t.trade_id for t in small_queue_db._buffer] == (
+            ["2", "3", "4", "5", "6"] + [f"new{i}" for i in range(5)]
+        )
+
+    @pytest.mark.asyncio
+    async def test_enqueue_trades_threadsafe_from_worker_thread(self, connected_db):
+        """Verify trades enqueued from another thread land in the buffer on the loop thread"""
+        await asyncio.to_thread(connected_db.enqueue_trades_threadsafe, [_trade(1), _trade(2)])
+        await asyncio.sleep(0)  # Let the loop run the handed-over enqueue
+
+        assert [t.trade_id for t in connected_db._buffer] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_enqueue_trades_threadsafe_requires_connect(self):
+        """Verify the threadsafe path raises before connect()"""
+        with pytest.raises(RuntimeError, match="not connected"):
+            TestTimeSeriesDB().enqueue_trades_threadsafe([_trade(1)])
 
     @pytest.mark.asyncio
     async def test_queue_full_drops_trades(self, small_queue_db):
-        """Verify queue full drops trades and tracks metrics"""
+        """Verify a full queue drops the OLDEST trades and tracks metrics"""
         # Fill queue
         for i in range(10):
-            small_queue_db.enqueue_trades([{"trade": i}])
+            small_queue_db.enqueue_trades([_trade(i)])
 
-        # Next enqueue should drop
-        count = small_queue_db.enqueue_trades([{"dropped": 1}, {"dropped": 2}])
+        # Next enqueue evicts the two oldest trades
+        count = small_queue_db.enqueue_trades([_trade("new1"), _trade("new2")])
 
-        assert count == 0  # Dropped
+        assert count == 2  # New trades queued
         assert small_queue_db._dropped_trades == 2
-        assert len(small_queue_db._trade_drop_rate_window) == 2
+        assert small_queue_db._trade_drops.count_60s() == 2
+
+        buffered = list(small_queue_db._buffer)
+        assert len(buffered) == 10
+        assert _trade(0) not in buffered
+        assert _trade(1) not in buffered
+        assert buffered[0] == _trade(2)
+        assert buffered[-2:] == [_trade("new1"), _trade("new2")]
 
     @pytest.mark.asyncio
     async def test_multiple_enqueue_trades_accumulate(self, connected_db):
-        """Verify multiple enqueue_trades() calls accumulate in queue"""
-        connected_db.enqueue_trades([{"trade": 1}])
-        connected_db.enqueue_trades([{"trade": 2}, {"trade": 3}])
-        connected_db.enqueue_trades([{"trade": 4}])
+        """Verify multiple enqueue_trades() calls accumulate in the buffer"""
+        connected_db.enqueue_trades([_trade(1)])
+        connected_db.enqueue_trades([_trade(2), _trade(3)])
+        connected_db.enqueue_trades([_trade(4)])
 
-        # Should have 3 items in queue (one per enqueue call)
-        assert connected_db._queue.qsize() == 3
+        # One buffer entry per trade, in order
+        assert len(connected_db._buffer) == 4
+        assert [t.trade_id for t in connected_db._buffer] == ["1", "2", "3", "4"]
 
 
 class TestTimeSeriesDBBatching:
@@ -170,7 +229,7 @@ class TestTimeSeriesDBBatching:
         connected_db._insert_trades_mock.return_value = 30
 
         # Enqueue 30 trades (< batch_size of 100)
-        trades = [{"trade": i} for i in range(30)]
+        trades = [_trade(i) for i in range(30)]
         connected_db.enqueue_trades(trades)
 
         # Close immediately
@@ -178,46 +237,101 @@ class TestTimeSeriesDBBatching:
 
         # Partial batch should have been flushed
         assert connected_db._insert_trades_mock.call_count == 1
-        assert len(connected_db._insert_trades_mock.call_args[0][0]) == 30
+        assert len(connected_db._insert_trades_mock.calls[-1][0][0]) == 30
+
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_one_insert(self, connected_db):
+        """Verify reaching batch_size triggers a single insert of exactly batch_size trades"""
+        connected_db.enqueue_trades([_trade(i) for i in range(60)])
+        await asyncio.sleep(0)
+        assert connected_db._insert_trades_mock.call_count == 0  # Below batch_size
+
+        inserted = asyncio.Event()
+        connected_db._insert_trades_mock.side_effect = lambda trades: inserted.set()
+
+        connected_db.enqueue_trades([_trade(i) for i in range(60, 130)])
+        await asyncio.wait_for(inserted.wait(), timeout=2.0)
+
+        assert connected_db._insert_trades_mock.call_count == 1
+        batch = connected_db._insert_trades_mock.calls[-1][0][0]
+        assert [t.trade_id for t in batch] == [str(i) for i in range(100)]
+        assert len(connected_db._buffer) == 30
+        assert not connected_db._flush_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_worker_reuses_batch_list(self, mock_settings):
+        """Verify full batches are written into one reused list (impl must copy)"""
+        mock_settings.DB_WORKERS = 1
+        mock_settings.DB_BATCH_SIZE = 2
+
+        db = TestTimeSeriesDB(settings=mock_settings)
+        await db.connect()
+
+        seen = []
+        two_batches = asyncio.Event()
+
+        def copy_batch(trades):
+            seen.append((id(trades), list(trades)))
+            if len(seen) == 2:
+                two_batches.set()
+
+        db._insert_trades_mock.side_effect = copy_batch
+
+        try:
+            db.enqueue_trades([_trade(i) for i in range(4)])
+            await asyncio.wait_for(two_batches.wait(), timeout=2.0)
+
+            assert seen[0][0] == seen[1][0]
+            assert [b for _, b in seen] == [
+                [_trade(0), _trade(1)],
+                [_trade(2), _trade(3)],
+            ]
+        finally:
+            await db.close()
 
 
 class TestTimeSeriesDBDropRateTracking:
     """Test drop rate calculation and panic thresholds"""
 
     @pytest.mark.asyncio
-    async def test_drop_rate_window_60_seconds(self, small_queue_db):
+    async def test_drop_rate_window_60_seconds(self, small_queue_db, fake_clock):
         """Verify drop rate window maintains 60-second sliding window"""
         # Fill queue
         for i in range(10):
-            small_queue_db.enqueue_trades([{"trade": i}])
+            small_queue_db.enqueue_trades([_trade(i)])
 
         # Drop 5 trades at T=0
+        small_queue_db._clock = fake_clock
         for i in range(5):
-            small_queue_db.enqueue_trades([{"dropped": i}])
-            time.sleep(0.01)
+            small_queue_db.enqueue_trades([_trade(f"dropped{i}")])
+            fake_clock.advance(0.01)
+
+        assert small_queue_db.get_drop_rate_60s() == 5 / 60
 
-        assert len(small_queue_db._trade_drop_rate_window) == 5
+        # Clock 61 seconds later
+        fake_clock.advance(61)
+        # Drop another trade
+        small_queue_db.enqueue_trades([_trade("dropped99")])
 
-        # Mock time.time() to be 61 seconds later
-        current_time = time.time()
-        with patch("time.time", return_value=current_time + 61):
-            # Drop another trade
-            small_queue_db.enqueue_trades([{"dropped": 99}])
+        # Old drops should be outside the window
+        assert small_queue_db.get_drop_rate_60s() == 1 / 60
 
-            # Old drops should be removed from window
-            assert len(small_queue_db._trade_drop_rate_window) == 1
+    @pytest.mark.asyncio
+    async def test_drop_clock_is_loop_time(self, connected_db):
+        """Verify connect() binds the drop clock to the running loop's monotonic time"""
+        assert connected_db._clock == asyncio.get_running_loop().time
 
     @pytest.mark.asyncio
     async def test_dropped_trades_count_accumulates(self, small_queue_db):
         """Verify _dropped_trades accumulates across multiple drops"""
         # Fill queue
         for i in range(10):
-            small_queue_db.enqueue_trades([{"trade": i}])
+            small_queue_db.enqueue_trades([_trade(i)])
 
         # Drop 3 batches
-        small_queue_db.enqueue_trades([{"dropped": 1}])
-        small_queue_db.enqueue_trades([{"dropped": 2}, {"dropped": 3}])
-        small_queue_db.enqueue_trades([{"dropped": 4}])
+        small_queue_db.enqueue_trades([_trade("dropped1")])
+        small_queue_db.enqueue_trades([_trade("dropped2"), _trade("dropped3")])
+        small_queue_db.enqueue_trades([_trade("dropped4")])
 
         assert small_queue_db._dropped_trades == 4
 
@@ -230,9 +344,12 @@ class TestTimeSeriesDBWorkers:
         """Verify worker exceptions don't kill other workers"""
         # Make _insert_trades_impl fail once, then always succeed
         error_raised = False
+        three_batches = asyncio.Event()
 
         async def mock_impl(trades):
             nonlocal error_raised
+            if connected_db._insert_trades_mock.call_count >= 3:
+                three_batches.set()
             if not error_raised:
                 error_raised = True
                 raise Exception("Database connection error")
@@ -242,9 +359,10 @@ class TestTimeSeriesDBWorkers:
 
         # Enqueue enough trades to trigger multiple batches
         for i in range(3):
-            trades = [{"trade": j} for j in range(110)]
+            trades = [_trade(j) for j in range(110)]
             connected_db.enqueue_trades(trades)
-            await asyncio.sleep(0.2)
+
+        await asyncio.wait_for(three_batches.wait(), timeout=2.0)
 
         # First batch failed, but workers should continue
         assert connected_db._insert_trades_mock.call_count >= 2
@@ -262,7 +380,7 @@ class TestTimeSeriesDBShutdown:
         connected_db._insert_trades_mock.return_value = 50
 
         # Enqueue 50 trades (half a batch)
-        trades = [{"trade": i} for i in range(50)]
+        trades = [_trade(i) for i in range(50)]
         connected_db.enqueue_trades(trades)
 
         # Close (sends sentinel)
@@ -270,15 +388,15 @@ class TestTimeSeriesDBShutdown:
 
         # Partial batch should be flushed on sentinel
         assert connected_db._insert_trades_mock.call_count == 1
-        assert len(connected_db._insert_trades_mock.call_args[0][0]) == 50
+        assert len(connected_db._insert_trades_mock.calls[-1][0][0]) == 50
 
     @pytest.mark.asyncio
     async def test_close_sends_sentinels_to_workers(self, connected_db):
-        """Verify close() sends sentinel to each worker"""
+        """Verify close() wakes and stops every worker"""
         await connected_db.close()
 
-        # Queue should be empty (sentinels consumed)
-        assert connected_db._queue.qsize() == 0
+        # Buffer should be empty
+        assert len(connected_db._buffer) == 0
         # All workers should be done
         assert all(task.done() for task in connected_db._worker_tasks)
 
@@ -296,24 +414,47 @@ class TestTimeSeriesDBBackwardCompatibility:
     @pytest.mark.asyncio
     async def test_insert_trades_calls_enqueue_trades(self, connected_db):
         """Verify legacy insert_trades() calls enqueue_trades()"""
-        trades = [{"trade": 1}]
+        trades = [_trade(1)]
         count = await connected_db.insert_trades(trades)
 
         assert count == 1
-        assert connected_db._queue.qsize() == 1
+        assert len(connected_db._buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_insert_trades_adapts_trade_dicts(self, connected_db):
+        """Verify insert_trades() converts Trade.to_dict() dicts to TradeRow"""
+        trade_dict = {
+            "timestamp": _TRADE_TS,
+            "exchange": "binance",
+            "symbol": "BTC/USDT",
+            "trade_id": "1",
+            "price": "50000.0",
+            "quantity": "0.1",
+            "side": "buy",
+            "is_buyer_maker": False,
+        }
+
+        assert await connected_db.insert_trades([trade_dict]) == 1
+        assert connected_db._buffer[0] == _trade(1)
 
     @pytest.mark.asyncio
     async def test_insert_trades_preserves_parameters(self, connected_db):
         """Verify insert_trades() passes parameters correctly"""
-        connected_db._insert_trades_mock.return_value = 5
+        inserted = asyncio.Event()
+
+        def mock_impl(trades):
+            inserted.set()
+            return 5
+
+        connected_db._insert_trades_mock.side_effect = mock_impl
 
-        trades = [{"trade": i} for i in range(150)]
+        trades = [_trade(i) for i in range(150)]
         count = await connected_db.insert_trades(trades)
 
         assert count == 150
 
         # Wait for batch processing
-        await asyncio.sleep(0.5)
+        await asyncio.wait_for(inserted.wait(), timeout=2.0)
 
         # Should have been batched and inserted
         assert connected_db._insert_trades_mock.call_count >= 1
@@ -4,28 +4,28 @@ Unit tests for BaseStreamProducer queued interface pattern.
 Tests the queue + worker pattern for streaming clients (Kafka/Kinesis):
 - Queue initialization and worker creation
 - Enqueue operations (success, overflow, drop tracking)
-- Worker processing and error handling
-- Sentinel shutdown pattern
+- Worker processing, batching and error handling
+- Broadcast shutdown (event + ring close)
 - Backward compatibility with legacy async methods
 """
 
 import asyncio
 import logging
-import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import Any
 
 import pytest
 
 from core.interfaces.streaming_producer import BaseStreamProducer
+from tests.unit._helpers import FakeSettings, FastAsyncMock
 
 
 class TestStreamProducer(BaseStreamProducer):
     """Concrete implementation for testing"""
 
-    def __init__(self):
-        super().__init__()
-        self._send_impl = AsyncMock()  # Mock the send implementation
-        self._send_batch_impl = AsyncMock()
+    def __init__(self, settings: Any = None):
+        super().__init__(settings)
+        self._send_impl = FastAsyncMock()  # Mock the send implementation
+        self._send_batch_impl = FastAsyncMock()
 
     async def _send_impl(self, topic: str, record: dict, key: str) -> None:
         """Mock implementation that can be configured per test"""
@@ -39,20 +39,16 @@ class TestStreamProducer(BaseStreamProducer):
 @pytest.fixture
 def mock_settings():
     """Mock settings with default queue config"""
-    settings = MagicMock()
-    settings.STREAM_QUEUE_SIZE = 5000
-    settings.STREAM_WORKERS = 10
-    return settings
+    return FakeSettings(STREAM_QUEUE_SIZE=5000, STREAM_WORKERS=10)
 
 
 @pytest.fixture
 async def connected_producer(mock_settings):
     """Create and connect a test producer"""
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        producer = TestStreamProducer()
-        await producer.connect()
-        yield producer
-        await producer.close()
+    producer = TestStreamProducer(settings=mock_settings)
+    await producer.connect()
+    yield producer
+    await producer.close()
 
 
 @pytest.fixture
@@ -61,11 +57,10 @@ async def small_queue_producer(mock_settings):
     mock_settings.STREAM_QUEUE_SIZE = 10
     mock_settings.STREAM_WORKERS = 1
 
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        producer = TestStreamProducer()
-        await producer.connect()
-        yield producer
-        await producer.close()
+    producer = TestStreamProducer(settings=mock_settings)
+    await producer.connect()
+    yield producer
+    await producer.close()
 
 
 @pytest.fixture
@@ -74,23 +69,24 @@ async def blocked_queue_producer(mock_settings):
     mock_settings.STREAM_QUEUE_SIZE = 10
     mock_settings.STREAM_WORKERS = 1
 
-    with patch("config.settings.get_settings", return_value=mock_settings):
-        producer = TestStreamProducer()
+    producer = TestStreamProducer(settings=mock_settings)
 
-        # Make worker block forever on first item
-        event = asyncio.Event()
+    # Make worker block forever on first item
+    event = asyncio.Event()
+    producer.send_started = asyncio.Event()
 
-        async def blocked_send(*args):
-            await event.wait()  # Never returns
+    async def blocked_send(*args):
+        producer.send_started.set()
+        await event.wait()  # Never returns
 
-        producer._send_impl.side_effect = blocked_send
+    producer._send_impl.side_effect = blocked_send
 
-        await producer.connect()
-        yield producer
+    await producer.connect()
+    yield producer
 
-        # Unblock workers before cleanup
-        event.set()
-        await producer.close()
+    # Unblock workers before cleanup
+    event.set()
+    await producer.close()
 
 
 class TestBaseStreamProducerInitialization:
@@ -104,20 +100,28 @@ class TestBaseStreamProducerInitialization:
         mock_settings.STREAM_WORKERS = 5
 
         # Create test producer (concrete implementation for testing)
-        with patch("config.settings.get_settings", return_value=mock_settings):
-            producer = TestStreamProducer()
-            await producer.connect()
+        producer = TestStreamProducer(settings=mock_settings)
+        await producer.connect()
 
-            try:
-                # Verify queue created
-                assert producer._queue is not None
-                assert producer._queue.maxsize == 100
+        try:
+            # Verify queue created
+            assert producer._queue is not None
+            assert producer._queue.maxsize == 100
 
-                # Verify workers created
-                assert len(producer._worker_tasks) == 5
-                assert all(not task.done() for task in producer._worker_tasks)
-            finally:
-                await producer.close()
+            # Verify workers created
+            assert len(producer._worker_tasks) == 5
+            assert all(not task.done() for task in producer._worker_tasks)
+        finally:
+            await producer.close()
+
+    @pytest.mark.asyncio
+    async def test_queue_state_lives_in_slots(self, connected_producer):
+        """Verify base queue/worker state is slotted, not in the instance __dict__"""
+        instance_attrs = vars(connected_producer)
+
+        assert "_queue" not in instance_attrs
+        assert "_drops" not in instance_attrs
+        assert set(instance_attrs) == {"_send_impl", "_send_batch_impl"}
 
     @pytest.mark.asyncio
     async def test_connect_without_queue_raises_error(self):
@@ -151,19 +155,42 @@ class TestBaseStreamProducerEnqueue:
         result = connected_producer.enqueue_record("topic", {}, "key")
         assert result["status"] == "queued"
 
+    @pytest.mark.asyncio
+    async def test_enqueue_record_threadsafe_from_worker_thread(self, connected_producer):
+        """Verify a record enqueued from another thread reaches the workers"""
+        sent = asyncio.Event()
+        connected_producer._send_impl.side_effect = lambda *args: sent.set()
+
+        await asyncio.to_thread(
+            connected_producer.enqueue_record_threadsafe, "topic", {"i": 1}, "key"
+        )
+        await asyncio.wait_for(sent.wait(), timeout=2.0)
+
+        assert connected_producer._send_impl.calls[0][0] == ("topic", {"i": 1}, "key")
+
+    @pytest.mark.asyncio
+    async def test_enqueue_record_threadsafe_requires_connect(self):
+        """Verify the threadsafe path raises before connect()"""
+        with pytest.raises(RuntimeError, match="not connected"):
+            TestStreamProducer().enqueue_record_threadsafe("topic", {}, "key")
+
     @pytest.mark.asyncio
     async def test_queue_full_drops_record(self, small_queue_producer):
-        """Verify QueueFull is caught and drop is tracked"""
+        """Verify a full queue drops the OLDEST record and tracks it"""
         # Fill queue to max (queue size = 10)
         for i in range(10):
             small_queue_producer.enqueue_record("topic", {"i": i}, f"key{i}")
 
-        # Next enqueue should drop
+        # Next enqueue evicts the oldest record
         result = small_queue_producer.enqueue_record("topic", {}, "overflow")
 
-        assert result == {"status": "dropped"}
+        assert result == {"status": "queued"}
         assert small_queue_producer._dropped_count == 1
-        assert len(small_queue_producer._drop_rate_window) == 1
+        assert small_queue_producer._drops.count_60s() == 1
+
+        queued = small_queue_producer._queue.get_many_nowait(10)
+        keys = [key for _, _, key in queued]
+        assert keys == [f"key{i}" for i in range(1, 10)] + ["overflow"]
 
     @pytest.mark.asyncio
     async def test_multiple_enqueue_increases_queue_size(self, connected_producer):
@@ -178,34 +205,39 @@ class TestStreamProducerDropRateTracking:
     """Test drop rate calculation and SLO thresholds"""
 
     @pytest.mark.asyncio
-    async def test_drop_rate_window_maintains_60_seconds(self, small_queue_producer):
+    async def test_drop_rate_window_maintains_60_seconds(self, small_queue_producer, fake_clock):
         """Verify drop rate window only keeps last 60 seconds"""
         # Fill queue
         for i in range(10):
             small_queue_producer.enqueue_record("topic", {}, f"k{i}")
 
         # Drop 5 messages at T=0
-        for i in range(5):
+        small_queue_producer._clock = fake_clock
+        for _ in range(5):
             small_queue_producer.enqueue_record("topic", {}, "drop")
-            time.sleep(0.01)  # Slight delay
+            fake_clock.advance(0.01)
 
-        assert len(small_queue_producer._drop_rate_window) == 5
+        assert small_queue_producer.get_drop_rate_60s() == 5 / 60
 
-        # Mock time.time() to be 61 seconds later
-        current_time = time.time()
-        with patch("time.time", return_value=current_time + 61):
-            # Drop another message
-            small_queue_producer.enqueue_record("topic", {}, "drop2")
+        # Clock 61 seconds later
+        fake_clock.advance(61)
+        # Drop another message
+        small_queue_producer.enqueue_record("topic", {}, "drop2")
 
-            # Old drops should be removed from window
-            assert len(small_queue_producer._drop_rate_window) == 1
+        # Old drops should be outside the window
+        assert small_queue_producer.get_drop_rate_60s() == 1 / 60
+
+    @pytest.mark.asyncio
+    async def test_drop_clock_is_loop_time(self, connected_producer):
+        """Verify connect() binds the drop clock to the running loop's monotonic time"""
+        assert connected_producer._clock == asyncio.get_running_loop().time
 
     @pytest.mark.asyncio
     async def test_high_drop_rate_triggers_warning(self, blocked_queue_producer, caplog):
         """Verify queue full drops are logged with rate tracking"""
-        # Give worker a moment to pick up first item and block
+        # Wait for the worker to pick up the first item and block
         blocked_queue_producer.enqueue_record("topic", {}, "initial")
-        await asyncio.sleep(0.05)
+        await asyncio.wait_for(blocked_queue_producer.send_started.wait(), timeout=2.0)
 
         # Fill queue to capacity (10 items total capacity, 1 being processed, so 10 more)
         for i in range(10):
@@ -218,7 +250,7 @@ class TestStreamProducerDropRateTracking:
         # Now try to enqueue more - should drop and log warnings
         for i in range(15):
             result = blocked_queue_producer.enqueue_record("topic", {}, f"drop{i}")
-            assert result["status"] == "dropped", f"Expected drop on iteration {i}"
+            assert result["status"] == "queued", f"Expected eviction on iteration {i}"
 
         # Verify warnings were logged with drop rate tracking
         assert "Stream queue full" in caplog.text
@@ -259,22 +291,86 @@ class TestStreamProducerWorkers:
         # Verify _send_impl was called 5 times
         assert connected_producer._send_impl.call_count == 5
 
+    @pytest.mark.asyncio
+    async def test_workers_batch_send(self, mock_settings):
+        """Verify a burst is handed to _send_many_impl() in one call, lingering for stragglers"""
+        mock_settings.STREAM_WORKERS = 1
+        mock_settings.STREAM_LINGER_MS = 20
+
+        producer = TestStreamProducer(settings=mock_settings)
+        batches = []
+        original = producer._send_many_impl
+
+        async def record_batch(records):
+            batches.append(len(records))
+            await original(records)
+
+        # Before connect(): workers bind _send_many_impl once at startup
+        producer._send_many_impl = record_batch
+        await producer.connect()
+
+        try:
+            for i in range(40):
+                producer.enqueue_record("topic", {"i": i}, f"key{i}")
+            await asyncio.sleep(0)  # Worker takes the 40 and starts lingering
+            for i in range(40, 50):
+                producer.enqueue_record("topic", {"i": i}, f"key{i}")
+
+            await asyncio.wait_for(producer._queue.join(), timeout=2.0)
+
+            assert batches == [50]
+            assert producer._send_impl.call_count == 50
+        finally:
+            await producer.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_batch_max(self, mock_settings):
+        """Verify no send round exceeds STREAM_BATCH_MAX records"""
+        mock_settings.STREAM_WORKERS = 1
+        mock_settings.STREAM_BATCH_MAX = 8
+
+        producer = TestStreamProducer(settings=mock_settings)
+        batches = []
+        original = producer._send_many_impl
+
+        async def record_batch(records):
+            batches.append(len(records))
+            await original(records)
+
+        # Before connect(): workers bind _send_many_impl once at startup
+        producer._send_many_impl = record_batch
+        await producer.connect()
+
+        try:
+            for i in range(20):
+                producer.enqueue_record("topic", {"i": i}, f"key{i}")
+            await asyncio.wait_for(producer._queue.join(), timeout=2.0)
+
+            assert batches == [8, 8, 4]
+        finally:
+            await producer.close()
+
     @pytest.mark.asyncio
     async def test_worker_error_does_not_crash_others(self, connected_producer):
         """Verify worker exceptions don't kill other workers"""
         # Make _send_impl raise error on first call, then succeed
-        connected_producer._send_impl.side_effect = [
-            Exception("Network error"),
-            {"status": "sent"},
-            {"status": "sent"},
-        ]
+        all_sent = asyncio.Event()
+
+        def flaky_send(*args):
+            if connected_producer._send_impl.call_count == 3:
+                all_sent.set()
+            if connected_producer._send_impl.call_count == 1:
+                raise Exception("Network error")
+            return {"status": "sent"}
+
+        connected_producer._send_impl.side_effect = flaky_send
 
         # Enqueue 3 messages
         for i in range(3):
             connected_producer.enqueue_record("topic", {"i": i}, f"key{i}")
 
-        # Wait
-        await asyncio.sleep(0.5)
+        # Wait for all three sends
+        await asyncio.wait_for(all_sent.wait(), timeout=2.0)
 
         # First call failed, but workers should continue
         # At least 2 more messages should be processed
@@ -295,24 +391,36 @@ class TestStreamProducerWorkers:
         await connected_producer._queue.join()
 
         # Verify call args
-        args = connected_producer._send_impl.call_args[0]
+        args = connected_producer._send_impl.calls[-1][0]
         assert args[0] == "test-topic"
         assert args[1] == {"price": 50000}
         assert args[2] == "BTC/USDT"
 
 
 class TestStreamProducerShutdown:
-    """Test sentinel pattern shutdown"""
+    """Test broadcast shutdown"""
 
     @pytest.mark.asyncio
-    async def test_close_sends_sentinels_to_workers(self, connected_producer):
-        """Verify close() sends sentinel to each worker"""
+    async def test_close_broadcasts_shutdown_to_workers(self, connected_producer):
+        """Verify close() stops every worker with one broadcast (no queued sentinels)"""
+        workers = list(connected_producer._worker_tasks)
+
         await connected_producer.close()
 
-        # Queue should have received one sentinel per worker
-        # (already consumed, so queue empty)
+        assert connected_producer._shutdown.is_set()
         assert connected_producer._queue.qsize() == 0
-        assert all(task.done() for task in connected_producer._worker_tasks)
+        assert all(task.done() for task in workers)
+
+    @pytest.mark.asyncio
+    async def test_close_with_full_queue_does_not_stall(self, small_queue_producer):
+        """Verify close() on a full queue drains it without needing free slots"""
+        for i in range(10):
+            small_queue_producer.enqueue_record("topic", {"i": i}, f"key{i}")
+        assert small_queue_producer._queue.full()
+
+        await asyncio.wait_for(small_queue_producer.close(), timeout=2.0)
+
+        assert small_queue_producer._send_impl.call_count == 10
 
     @pytest.mark.asyncio
     async def test_close_flushes_remaining_items(self, connected_producer):
@@ -330,32 +438,32 @@ class TestStreamProducerShutdown:
         assert connected_producer._send_impl.call_count == 10
 
     @pytest.mark.asyncio
-    async def test_close_timeout_cancels_workers(self):
-        """Verify close() cancels workers that don't finish in 10s"""
-        mock_settings = MagicMock()
-        mock_settings.STREAM_QUEUE_SIZE = 100
-        mock_settings.STREAM_WORKERS = 2
+    async def test_close_timeout_cancels_workers(self, caplog):
+        """Verify close() cancels workers still running at the shared deadline"""
+        mock_settings = FakeSettings(STREAM_QUEUE_SIZE=100, STREAM_WORKERS=2)
+
+        producer = TestStreamProducer(settings=mock_settings)
+        await producer.connect()
 
-        with patch("config.settings.get_settings", return_value=mock_settings):
-            producer = TestStreamProducer()
-            await producer.connect()
+        # Mock _send_impl to be very slow
+        async def slow_send(*args):
+            await asyncio.sleep(15)  # Longer than 10s timeout
 
-            # Mock _send_impl to be very slow
-            async def slow_send(*args):
-                await asyncio.sleep(15)  # Longer than 10s timeout
+        producer._send_impl = slow_send
 
-            producer._send_impl = slow_send
+        # Enqueue item
+        producer.enqueue_record("topic", {}, "key")
 
-            # Enqueue item
-            producer.enqueue_record("topic", {}, "key")
+        # Shrink the deadline so the test doesn't wait 10s
+        producer._CLOSE_TIMEOUT_SECS = 0.05
+        tasks = list(producer._worker_tasks)
+        await asyncio.sleep(0)  # Let a worker pick up the record
 
-            # Close with timeout (should cancel workers after 10s)
-            # Note: This will actually wait 10s in the test
-            with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
-                await producer.close()
+        await asyncio.wait_for(producer.close(), timeout=2.0)
 
-            # Workers should be cancelled or done
-            assert all(task.cancelled() or task.done() for task in producer._worker_tasks)
+        # The stuck worker was cancelled, the idle one exited on its own
+        assert all(task.done() for task in tasks)
+        assert "1 stream workers didn't finish" in caplog.text
 
     @pytest.mark.asyncio
     async def test_workers_cleared_after_close(self, connected_producer):
@@ -402,7 +510,7 @@ class TestStreamProducerBackwardCompatibility:
         await connected_producer._queue.join()
 
         # Verify parameters passed to worker
-        args = connected_producer._send_impl.call_args[0]
+        args = connected_producer._send_impl.calls[-1][0]
         assert args[0] == "my-topic"
         assert args[1] == {"value": 123}
         assert args[2] == "my-key"
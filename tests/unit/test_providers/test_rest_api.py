@@ -6,8 +6,10 @@ Tests BinanceRestAPI, CoinbaseRestAPI, KrakenRestAPI using mocked ccxt responses
 
 from datetime import UTC, datetime
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import Any, NamedTuple
+from unittest.mock import AsyncMock, MagicMock
 
+import ccxt.async_support as ccxt
 import pytest
 
 from core.models.market_data import Candle
@@ -16,80 +18,139 @@ from providers.coinbase.rest_api import CoinbaseRestAPI
 from providers.kraken.rest_api import KrakenRestAPI
 
 
-@pytest.fixture
-def mock_ccxt_binance():
+@pytest.fixture(scope="module")
+def mock_all_ccxt():
+    """
+    Stub ccxt.binance/coinbase/kraken in one MonkeyPatch context (module lifetime)
+
+    All three rest_api modules import the same ccxt.async_support module,
+    so one context covers every exchange. Each class becomes a factory
+    returning that exchange's stub client.
+    """
+    clients = {
+        exchange: MagicMock(fetch_ohlcv=AsyncMock(), close=AsyncMock())
+        for exchange in ("binance", "coinbase", "kraken")
+    }
+    with pytest.MonkeyPatch.context() as mp:
+        for exchange, client in clients.items():
+            mp.setattr(ccxt, exchange, lambda *a, _client=client, **kw: _client)
+        yield clients
+
+
+@pytest.fixture(scope="module")
+def mock_ccxt_binance(mock_all_ccxt):
     """Mock ccxt.binance client"""
-    with patch("providers.binance.rest_api.ccxt.binance") as mock:
-        client = MagicMock()
-        client.fetch_ohlcv = AsyncMock()
-        client.close = AsyncMock()
-        mock.return_value = client
-        yield client
+    return mock_all_ccxt["binance"]
 
 
-@pytest.fixture
-def mock_ccxt_coinbase():
+@pytest.fixture(scope="module")
+def mock_ccxt_coinbase(mock_all_ccxt):
     """Mock ccxt.coinbase client"""
-    with patch("providers.coinbase.rest_api.ccxt.coinbase") as mock:
-        client = MagicMock()
-        client.fetch_ohlcv = AsyncMock()
-        client.close = AsyncMock()
-        mock.return_value = client
-        yield client
+    return mock_all_ccxt["coinbase"]
 
 
-@pytest.fixture
-def mock_ccxt_kraken():
+@pytest.fixture(scope="module")
+def mock_ccxt_kraken(mock_all_ccxt):
     """Mock ccxt.kraken client"""
-    with patch("providers.kraken.rest_api.ccxt.kraken") as mock:
-        client = MagicMock()
-        client.fetch_ohlcv = AsyncMock()
-        client.close = AsyncMock()
-        mock.return_value = client
-        yield client
+    return mock_all_ccxt["kraken"]
+
+
+@pytest.fixture(scope="module")
+def binance_api(mock_ccxt_binance):
+    """BinanceRestAPI built once against the mocked ccxt client"""
+    return BinanceRestAPI()
+
+
+@pytest.fixture(scope="module")
+def coinbase_api(mock_ccxt_coinbase):
+    """CoinbaseRestAPI built once against the mocked ccxt client"""
+    return CoinbaseRestAPI()
+
+
+@pytest.fixture(scope="module")
+def kraken_api(mock_ccxt_kraken):
+    """KrakenRestAPI built once against the mocked ccxt client"""
+    return KrakenRestAPI()
+
+
+@pytest.fixture(autouse=True)
+def _reset_ccxt(mock_all_ccxt):
+    """Per-test isolation for the shared clients (reset mocks, don't rebuild)"""
+    for client in mock_all_ccxt.values():
+        client.fetch_ohlcv.reset_mock(return_value=True, side_effect=True)
+        client.close.reset_mock()
 
 
 def create_mock_ohlcv_data(count=5, start_timestamp_ms=1704067200000):
     """
     Create mock OHLCV data from ccxt.
 
-    Format: [[timestamp_ms, open, high, low, close, volume], ...]
+    Format: ((timestamp_ms, open, high, low, close, volume), ...) - frozen,
+    since the same rows are shared by every test (see _MOCK_OHLCV).
     """
-    data = []
-    for i in range(count):
-        timestamp = start_timestamp_ms + (i * 60000)  # 1 minute apart
-        data.append(
-            [
-                timestamp,
-                50000.0 + i * 10,  # open
-                50100.0 + i * 10,  # high
-                49900.0 + i * 10,  # low
-                50050.0 + i * 10,  # close
-                100.0 + i,  # volume
-            ]
+    return tuple(
+        (
+            start_timestamp_ms + (i * 60000),  # 1 minute apart
+            50000.0 + i * 10,  # open
+            50100.0 + i * 10,  # high
+            49900.0 + i * 10,  # low
+            50050.0 + i * 10,  # close
+            100.0 + i,  # volume
         )
-    return data
+        for i in range(count)
+    )
+
+
+# Mock responses built once at import, keyed by candle count
+_MOCK_OHLCV = {count: create_mock_ohlcv_data(count) for count in (1, 5, 10)}
+
+
+class ExchangeCase(NamedTuple):
+    """One exchange under test: shared API client + its mocked ccxt client"""
+
+    name: str
+    api: Any
+    client: MagicMock
+    symbol: str
+    timeframes: tuple[str, ...]  # Must appear in get_supported_timeframes()
+
+
+# (exchange name, symbol, required timeframes) - API/mock come from the fixtures
+EXCHANGES = [
+    ("binance", "BTC/USDT", ("1m", "5m", "1h", "1d")),
+    ("coinbase", "BTC/USD", ("1m", "5m", "1h", "1d")),
+    ("kraken", "BTC/USD", ("1m", "5m", "1h", "1d", "1w")),
+]
+
+
+@pytest.fixture(params=EXCHANGES, ids=[name for name, _, _ in EXCHANGES])
+def exchange(request):
+    """Each exchange's module-scoped API client with its ccxt mock"""
+    name, symbol, timeframes = request.param
+    return ExchangeCase(
+        name=name,
+        api=request.getfixturevalue(f"{name}_api"),
+        client=request.getfixturevalue(f"mock_ccxt_{name}"),
+        symbol=symbol,
+        timeframes=timeframes,
+    )
 
 
 @pytest.mark.unit
-class TestBinanceRestAPI:
-    """Test Binance REST API client"""
+class TestExchangeRestAPI:
+    """Behavior shared by the Binance, Coinbase and Kraken REST API clients"""
 
     @pytest.mark.asyncio
-    async def test_fetch_latest_klines_success(self, mock_ccxt_binance):
+    async def test_fetch_latest_klines_success(self, exchange):
         """Test fetch_latest_klines with successful API response"""
-        # Setup mock response
-        mock_data = create_mock_ohlcv_data(count=5)
-        mock_ccxt_binance.fetch_ohlcv.return_value = mock_data
+        exchange.client.fetch_ohlcv.return_value = _MOCK_OHLCV[5]
 
-        # Create API client
-        api = BinanceRestAPI()
-
-        # Fetch klines
-        candles = await api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m", limit=5)
+        candles = await exchange.api.fetch_latest_klines(
+            symbol=exchange.symbol, timeframe="1m", limit=5
+        )
 
         # Verify API was called correctly
-        mock_ccxt_binance.fetch_ohlcv.assert_called_once_with("BTC/USDT", "1m", limit=5)
+        exchange.client.fetch_ohlcv.assert_called_once_with(exchange.symbol, "1m", limit=5)
 
         # Verify candles returned
         assert len(candles) == 5
@@ -97,8 +158,8 @@ class TestBinanceRestAPI:
 
         # Verify first candle
         first_candle = candles[0]
-        assert first_candle.exchange == "binance"
-        assert first_candle.symbol == "BTC/USDT"
+        assert first_candle.exchange == exchange.name
+        assert first_candle.symbol == exchange.symbol
         assert first_candle.timeframe == "1m"
         assert first_candle.open == Decimal("50000.0")
         assert first_candle.high == Decimal("50100.0")
@@ -108,41 +169,63 @@ class TestBinanceRestAPI:
         assert first_candle.is_synthetic is False
 
     @pytest.mark.asyncio
-    async def test_fetch_klines_with_date_range(self, mock_ccxt_binance):
+    async def test_fetch_klines_with_date_range(self, exchange):
         """Test fetch_klines with start/end dates"""
-        mock_data = create_mock_ohlcv_data(count=10)
-        mock_ccxt_binance.fetch_ohlcv.return_value = mock_data
-
-        api = BinanceRestAPI()
+        exchange.client.fetch_ohlcv.return_value = _MOCK_OHLCV[10]
 
         start = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
         end = datetime(2024, 1, 1, 0, 5, 0, tzinfo=UTC)
 
-        candles = await api.fetch_klines(
-            symbol="BTC/USDT", timeframe="1m", start=start, end=end, limit=10
+        candles = await exchange.api.fetch_klines(
+            symbol=exchange.symbol, timeframe="1m", start=start, end=end, limit=10
         )
 
         # Verify API called with correct timestamp
         expected_since = int(start.timestamp() * 1000)
-        mock_ccxt_binance.fetch_ohlcv.assert_called_once_with(
-            "BTC/USDT", "1m", since=expected_since, limit=10
+        exchange.client.fetch_ohlcv.assert_called_once_with(
+            exchange.symbol, "1m", since=expected_since, limit=10
         )
 
         assert len(candles) > 0
 
     @pytest.mark.asyncio
-    async def test_fetch_klines_filters_by_end_time(self, mock_ccxt_binance):
+    async def test_fetch_latest_klines_api_error(self, exchange):
+        """Test error handling when API fails"""
+        exchange.client.fetch_ohlcv.side_effect = Exception("API rate limit exceeded")
+
+        with pytest.raises(Exception, match="API rate limit exceeded"):
+            await exchange.api.fetch_latest_klines(symbol=exchange.symbol, timeframe="1m")
+
+    @pytest.mark.asyncio
+    async def test_close_client(self, exchange):
+        """Test closing ccxt client"""
+        await exchange.api.close()
+
+        exchange.client.close.assert_called_once()
+
+    def test_get_supported_timeframes(self, exchange):
+        """Test supported timeframes"""
+        timeframes = exchange.api.get_supported_timeframes()
+
+        for timeframe in exchange.timeframes:
+            assert timeframe in timeframes
+
+
+@pytest.mark.unit
+class TestRestAPICommonBehavior:
+    """Test common behavior across all exchange REST APIs (Binance as representative)"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_klines_filters_by_end_time(self, mock_ccxt_binance, binance_api):
         """Test that fetch_klines filters out candles after end time"""
         # Create mock data with timestamps beyond end time
-        mock_data = create_mock_ohlcv_data(count=10, start_timestamp_ms=1704067200000)
+        mock_data = _MOCK_OHLCV[10]
         mock_ccxt_binance.fetch_ohlcv.return_value = mock_data
 
-        api = BinanceRestAPI()
-
         start = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
         end = datetime(2024, 1, 1, 0, 3, 0, tzinfo=UTC)  # Only first 3 candles
 
-        candles = await api.fetch_klines(
+        candles = await binance_api.fetch_klines(
             symbol="BTC/USDT", timeframe="1m", start=start, end=end, limit=10
         )
 
@@ -150,18 +233,7 @@ class TestBinanceRestAPI:
         assert all(c.timestamp <= end for c in candles)
 
     @pytest.mark.asyncio
-    async def test_fetch_latest_klines_api_error(self, mock_ccxt_binance):
-        """Test error handling when API fails"""
-        # Mock API failure
-        mock_ccxt_binance.fetch_ohlcv.side_effect = Exception("API rate limit exceeded")
-
-        api = BinanceRestAPI()
-
-        with pytest.raises(Exception, match="API rate limit exceeded"):
-            await api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
-
-    @pytest.mark.asyncio
-    async def test_candle_creation_from_ohlcv(self, mock_ccxt_binance):
+    async def test_candle_creation_from_ohlcv(self, mock_ccxt_binance, binance_api):
         """Test Candle object creation from OHLCV data"""
         mock_data = [
             [
@@ -175,8 +247,7 @@ class TestBinanceRestAPI:
         ]
         mock_ccxt_binance.fetch_ohlcv.return_value = mock_data
 
-        api = BinanceRestAPI()
-        candles = await api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m", limit=1)
+        candles = await binance_api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m", limit=1)
 
         candle = candles[0]
 
@@ -192,139 +263,31 @@ class TestBinanceRestAPI:
         assert abs(candle.quote_volume - expected_quote_volume) < Decimal("0.01")
 
     @pytest.mark.asyncio
-    async def test_close_client(self, mock_ccxt_binance):
-        """Test closing ccxt client"""
-        api = BinanceRestAPI()
-        await api.close()
-
-        mock_ccxt_binance.close.assert_called_once()
-
-    def test_get_supported_timeframes(self):
-        """Test supported timeframes for Binance"""
-        api = BinanceRestAPI()
-        timeframes = api.get_supported_timeframes()
-
-        assert "1m" in timeframes
-        assert "5m" in timeframes
-        assert "1h" in timeframes
-        assert "1d" in timeframes
-
-
-@pytest.mark.unit
-class TestCoinbaseRestAPI:
-    """Test Coinbase REST API client"""
-
-    @pytest.mark.asyncio
-    async def test_fetch_latest_klines_success(self, mock_ccxt_coinbase):
-        """Test Coinbase fetch_latest_klines"""
-        mock_data = create_mock_ohlcv_data(count=3)
-        mock_ccxt_coinbase.fetch_ohlcv.return_value = mock_data
-
-        api = CoinbaseRestAPI()
-        candles = await api.fetch_latest_klines(symbol="BTC/USD", timeframe="1m", limit=3)
-
-        assert len(candles) == 3
-        assert candles[0].exchange == "coinbase"
-        assert candles[0].symbol == "BTC/USD"
-
-    @pytest.mark.asyncio
-    async def test_fetch_klines_with_date_range(self, mock_ccxt_coinbase):
-        """Test Coinbase fetch_klines with date range"""
-        mock_data = create_mock_ohlcv_data(count=5)
-        mock_ccxt_coinbase.fetch_ohlcv.return_value = mock_data
-
-        api = CoinbaseRestAPI()
-
-        start = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
-        end = datetime(2024, 1, 1, 1, 0, 0, tzinfo=UTC)
-
-        candles = await api.fetch_klines(symbol="BTC/USD", timeframe="1m", start=start, end=end)
-
-        assert len(candles) > 0
-
-    def test_get_supported_timeframes(self):
-        """Test Coinbase supported timeframes"""
-        api = CoinbaseRestAPI()
-        timeframes = api.get_supported_timeframes()
-
-        assert "1m" in timeframes
-        assert "5m" in timeframes
-        assert "1h" in timeframes
-        assert "1d" in timeframes
-
-
-@pytest.mark.unit
-class TestKrakenRestAPI:
-    """Test Kraken REST API client"""
-
-    @pytest.mark.asyncio
-    async def test_fetch_latest_klines_success(self, mock_ccxt_kraken):
-        """Test Kraken fetch_latest_klines"""
-        mock_data = create_mock_ohlcv_data(count=3)
-        mock_ccxt_kraken.fetch_ohlcv.return_value = mock_data
-
-        api = KrakenRestAPI()
-        candles = await api.fetch_latest_klines(symbol="BTC/USD", timeframe="1m", limit=3)
-
-        assert len(candles) == 3
-        assert candles[0].exchange == "kraken"
-        assert candles[0].symbol == "BTC/USD"
-
-    @pytest.mark.asyncio
-    async def test_error_handling(self, mock_ccxt_kraken):
-        """Test Kraken error handling"""
-        mock_ccxt_kraken.fetch_ohlcv.side_effect = Exception("Kraken API error")
-
-        api = KrakenRestAPI()
-
-        with pytest.raises(Exception, match="Kraken API error"):
-            await api.fetch_latest_klines(symbol="BTC/USD", timeframe="1m")
-
-    def test_get_supported_timeframes(self):
-        """Test Kraken supported timeframes"""
-        api = KrakenRestAPI()
-        timeframes = api.get_supported_timeframes()
-
-        assert "1m" in timeframes
-        assert "5m" in timeframes
-        assert "1h" in timeframes
-        assert "1d" in timeframes
-        assert "1w" in timeframes
-
-
-@pytest.mark.unit
-class TestRestAPICommonBehavior:
-    """Test common behavior across all exchange REST APIs"""
-
-    @pytest.mark.asyncio
-    async def test_empty_response_handling(self, mock_ccxt_binance):
+    async def test_empty_response_handling(self, mock_ccxt_binance, binance_api):
         """Test handling of empty API response"""
         mock_ccxt_binance.fetch_ohlcv.return_value = []
 
-        api = BinanceRestAPI()
-        candles = await api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
+        candles = await binance_api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
 
         assert candles == []
 
     @pytest.mark.asyncio
-    async def test_trades_count_always_zero(self, mock_ccxt_binance):
+    async def test_trades_count_always_zero(self, mock_ccxt_binance, binance_api):
         """Test that trades_count is always 0 for REST API (not provided)"""
-        mock_data = create_mock_ohlcv_data(count=1)
+        mock_data = _MOCK_OHLCV[1]
         mock_ccxt_binance.fetch_ohlcv.return_value = mock_data
 
-        api = BinanceRestAPI()
-        candles = await api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
+        candles = await binance_api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
 
         assert candles[0].trades_count == 0
 
     @pytest.mark.asyncio
-    async def test_is_synthetic_always_false(self, mock_ccxt_binance):
+    async def test_is_synthetic_always_false(self, mock_ccxt_binance, binance_api):
         """Test that is_synthetic is always False for REST API data"""
-        mock_data = create_mock_ohlcv_data(count=1)
+        mock_data = _MOCK_OHLCV[1]
         mock_ccxt_binance.fetch_ohlcv.return_value = mock_data
 
-        api = BinanceRestAPI()
-        candles = await api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
+        candles = await binance_api.fetch_latest_klines(symbol="BTC/USDT", timeframe="1m")
 
         assert candles[0].is_synthetic is False
 
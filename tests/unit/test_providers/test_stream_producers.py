@@ -0,0 +1,162 @@
+"""
+Unit tests for provider bulk sends (_send_many_impl overrides)
+
+- KafkaStreamProducer: all sends started, then awaited together
+- KinesisStreamProducer: PutRecords per stream, chunked at 500 records
+- KinesisStreamProducer lifecycle: connect() starts the workers, close()
+  drains them before closing the client
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from providers.aws.kinesis import KinesisStreamProducer
+from providers.opensource.kafka_stream_producer import KafkaStreamProducer
+from tests.unit._helpers import FakeSettings
+
+
+@pytest.mark.unit
+class TestKafkaBulkSend:
+    """Test KafkaStreamProducer._send_many_impl()"""
+
+    @pytest.mark.asyncio
+    async def test_sends_start_before_any_completes(self):
+        """Verify every record is handed to the producer before the batch is awaited"""
+        release = asyncio.Event()
+        started = []
+
+        async def send(topic, value, key):
+            started.append(key)
+            await release.wait()
+
+        producer = KafkaStreamProducer()
+        producer.producer = MagicMock(send=send)
+
+        batch = asyncio.create_task(
+            producer._send_many_impl([("trades", {"i": i}, f"key{i}") for i in range(3)])
+        )
+        await asyncio.sleep(0.01)
+        assert started == ["key0", "key1", "key2"]  # All in flight, none finished
+        assert not batch.done()
+
+        release.set()
+        await batch
+
+    @pytest.mark.asyncio
+    async def test_failed_sends_are_logged_not_raised(self):
+        """Verify one failing record doesn't fail the batch"""
+        producer = KafkaStreamProducer()
+        producer.producer = MagicMock(send=AsyncMock(side_effect=[None, Exception("boom")]))
+
+        await producer._send_many_impl([("trades", {"i": 0}, "a"), ("trades", {"i": 1}, "b")])
+
+        assert producer.producer.send.call_count == 2
+
+
+@pytest.mark.unit
+class TestKinesisBulkSend:
+    """Test KinesisStreamProducer._send_many_impl()"""
+
+    @pytest.mark.asyncio
+    async def test_put_records_grouped_by_stream_and_chunked(self):
+        """Verify records go out as PutRecords per stream, at most 500 per call"""
+        producer = KinesisStreamProducer()
+        producer.client = MagicMock(put_records=AsyncMock(return_value={"FailedRecordCount": 0}))
+
+        records = [("trades", {"i": i}, f"key{i}") for i in range(600)]
+        records.insert(10, ("candles", {"c": 1}, "BTCUSDT"))
+
+        await producer._send_many_impl(records)
+
+        calls = [
+            (c.kwargs["StreamName"], len(c.kwargs["Records"]))
+            for c in producer.client.put_records.call_args_list
+        ]
+        assert calls == [("trades", 500), ("trades", 100), ("candles", 1)]
+
+        first = producer.client.put_records.call_args_list[0].kwargs["Records"][0]
+        assert json.loads(first["Data"]) == {"i": 0}
+        assert first["PartitionKey"] == "key0"
+
+    @pytest.mark.asyncio
+    async def test_put_records_error_is_logged_not_raised(self):
+        """Verify a failed PutRecords call doesn't stop the other streams"""
+        producer = KinesisStreamProducer()
+        producer.client = MagicMock(
+            put_records=AsyncMock(side_effect=[Exception("throttled"), {"FailedRecordCount": 0}])
+        )
+
+        await producer._send_many_impl([("trades", {"i": 0}, "a"), ("candles", {"c": 1}, "b")])
+
+        assert producer.client.put_records.call_count == 2
+
+
+def _kinesis_with_client(client: MagicMock, workers: int = 2) -> KinesisStreamProducer:
+    """KinesisStreamProducer whose aioboto3 session hands out `client` (its own context manager)"""
+    producer = KinesisStreamProducer()
+    producer._settings = FakeSettings(STREAM_WORKERS=workers)
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock()
+    producer.session = MagicMock(client=MagicMock(return_value=client))
+    return producer
+
+
+@pytest.mark.unit
+class TestKinesisLifecycle:
+    """Test KinesisStreamProducer runs the BaseStreamProducer queue + workers"""
+
+    @pytest.mark.asyncio
+    async def test_connect_starts_workers(self):
+        """Verify connect() starts the worker pool and queued records reach PutRecords"""
+        client = MagicMock(put_records=AsyncMock(return_value={"FailedRecordCount": 0}))
+        producer = _kinesis_with_client(client, workers=2)
+
+        await producer.connect()
+        try:
+            assert len(producer._worker_tasks) == 2
+            assert producer.client is client
+
+            producer.enqueue_record("trades", {"i": 0}, "BTCUSDT")
+            for _ in range(50):
+                if client.put_records.called:
+                    break
+                await asyncio.sleep(0.01)
+
+            client.put_records.assert_called_once()
+        finally:
+            await producer.close()
+
+    @pytest.mark.asyncio
+    async def test_close_drains_queue_before_closing_client(self):
+        """Verify close() sends queued records, stops the workers, then exits the client"""
+        order = []
+        client = MagicMock(
+            put_records=AsyncMock(side_effect=lambda **kw: order.append(len(kw["Records"])) or {})
+        )
+        producer = _kinesis_with_client(client)
+        await producer.connect()
+        client.__aexit__.side_effect = lambda *exc: order.append("closed")
+
+        for i in range(3):
+            producer.enqueue_record("trades", {"i": i}, f"key{i}")
+        await producer.close()
+
+        assert sum(n for n in order if n != "closed") == 3
+        assert order[-1] == "closed"
+        assert producer._worker_tasks == []
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_stops_workers(self):
+        """Verify a client that can't be opened doesn't leave workers running"""
+        client = MagicMock()
+        producer = _kinesis_with_client(client)
+        client.__aenter__.side_effect = Exception("no credentials")
+
+        with pytest.raises(Exception, match="no credentials"):
+            await producer.connect()
+
+        assert producer._worker_tasks == []
+        assert producer.client is None
@@ -4,8 +4,10 @@ Unit tests for IndicatorCalculator
 Tests indicator calculation logic with mocked database and persistence layer.
 """
 
+import functools
 from datetime import UTC, datetime
 from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -14,6 +16,12 @@ from core.models.market_data import Candle
 from services.indicator_service.calculator import IndicatorCalculator
 
 
+@functools.lru_cache(maxsize=4096)
+def _dec(value: float) -> Decimal:
+    """Decimal for a test price (cached - tests reuse the same 50000 + i range)"""
+    return Decimal(str(value))
+
+
 def create_test_candle(
     close: float,
     timestamp_offset_minutes: int = 0,
@@ -32,18 +40,87 @@ def create_test_candle(
         exchange=exchange,
         symbol=symbol,
         timeframe=timeframe,
-        open=Decimal(str(close - 1)),
-        high=Decimal(str(close + 1)),
-        low=Decimal(str(close - 2)),
-        close=Decimal(str(close)),
+        open=_dec(close - 1),
+        high=_dec(close + 1),
+        low=_dec(close - 2),
+        close=_dec(close),
         volume=Decimal("100.0"),
-        quote_volume=Decimal(str(100 * close)),
+        quote_volume=_dec(100 * close),
         trades_count=10,
         is_synthetic=False,
     )
 
 
-@pytest.fixture
+@functools.cache
+def candle_series(
+    count: int,
+    exchange: str = "binance",
+    symbol: str = "BTCUSDT",
+    timeframe: str = "1m",
+    base_close: float = 50000,
+    minutes_apart: int = 1,
+) -> tuple[Candle, ...]:
+    """Candle history built once per argument set (Candles aren't mutated by the calculator)"""
+    return tuple(
+        create_test_candle(
+            base_close + i,
+            i * minutes_apart,
+            exchange=exchange,
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+        for i in range(count)
+    )
+
+
+@pytest.fixture(scope="module")
+def candles_50() -> list[Candle]:
+    """50 BTCUSDT 1m candles (above the 20-candle minimum)"""
+    return list(candle_series(50))
+
+
+@pytest.fixture(scope="module")
+def candles_20() -> list[Candle]:
+    """Exactly the 20-candle minimum"""
+    return list(candle_series(20))
+
+
+@pytest.fixture(scope="module")
+def candles_15() -> list[Candle]:
+    """Below the 20-candle minimum"""
+    return list(candle_series(15))
+
+
+# What each mocked indicator returns unless a test overrides it
+DEFAULT_RESULTS = {
+    "SMA": {"SMA_20": 50000.0, "SMA_50": 49900.0},
+    "EMA": {"EMA_12": 50100.0, "EMA_26": 50050.0},
+    "RSI": {"RSI_14": 55.5},
+}
+
+
+def make_indicator(results: dict[str, float]) -> MagicMock:
+    """Mock indicator whose get_results() returns `results` (only get_results exists)"""
+    indicator = MagicMock(spec_set=["get_results"])
+    indicator.get_results.return_value = results
+    return indicator
+
+
+def override_indicator(
+    calculator: IndicatorCalculator,
+    name: str,
+    results: dict[str, float] | None = None,
+    error: Exception | None = None,
+) -> None:
+    """Make one indicator return `results` or raise `error` for the current test"""
+    get_results = calculator.indicators[name].get_results
+    if error is not None:
+        get_results.side_effect = error
+    else:
+        get_results.return_value = results
+
+
+@pytest.fixture(scope="module")
 def mock_db():
     """Mock BaseTimeSeriesDB"""
     db = MagicMock()
@@ -52,7 +129,7 @@ def mock_db():
     return db
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_persistence():
     """Mock IndicatorPersistence"""
     persistence = MagicMock()
@@ -60,42 +137,48 @@ def mock_persistence():
     return persistence
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_indicator_loader():
     """Mock IndicatorLoader to return test indicators"""
     with patch("services.indicator_service.calculator.IndicatorLoader") as mock:
-        # Create mock indicators
-        sma_indicator = MagicMock()
-        sma_indicator.get_results.return_value = {"SMA_20": 50000.0, "SMA_50": 49900.0}
-
-        ema_indicator = MagicMock()
-        ema_indicator.get_results.return_value = {"EMA_12": 50100.0, "EMA_26": 50050.0}
-
-        rsi_indicator = MagicMock()
-        rsi_indicator.get_results.return_value = {"RSI_14": 55.5}
-
-        # Configure loader to return these indicators
         mock.load_from_settings.return_value = {
-            "SMA": sma_indicator,
-            "EMA": ema_indicator,
-            "RSI": rsi_indicator,
+            name: make_indicator(results) for name, results in DEFAULT_RESULTS.items()
         }
         yield mock
 
 
+@pytest.fixture(scope="module")
+def calculator_env(mock_db, mock_persistence, mock_indicator_loader):
+    """Calculator wired to the mocked DB/persistence, built once per module"""
+    return SimpleNamespace(
+        db=mock_db,
+        persistence=mock_persistence,
+        loader=mock_indicator_loader,
+        calc=IndicatorCalculator(db=mock_db, persistence=mock_persistence),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_calculator(calculator_env):
+    """Per-test isolation for the shared calculator (reset mocks, don't rebuild)"""
+    for name, indicator in calculator_env.calc.indicators.items():
+        indicator.get_results.reset_mock(return_value=True, side_effect=True)
+        indicator.get_results.return_value = DEFAULT_RESULTS[name]
+    calculator_env.persistence.save_indicators.reset_mock()
+    calculator_env.db.query_candles.reset_mock(return_value=True, side_effect=True)
+    calculator_env.db.insert_indicators.reset_mock()
+
+
 @pytest.mark.unit
 class TestIndicatorCalculator:
     """Test IndicatorCalculator logic"""
 
     @pytest.mark.asyncio
-    async def test_process_candle_with_sufficient_history(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
+    async def test_process_candle_with_sufficient_history(self, calculator_env, candles_50):
         """Test processing candle with sufficient historical data"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
+        calculator = calculator_env.calc
 
-        # Create 50 candles (more than minimum of 20)
-        candles = [create_test_candle(50000 + i, i) for i in range(50)]
+        candles = candles_50
         latest_candle = candles[-1]
 
         # Process the latest candle
@@ -115,7 +198,7 @@ class TestIndicatorCalculator:
             "RSI_14": 55.5,
         }
 
-        mock_persistence.save_indicators.assert_called_once_with(
+        calculator_env.persistence.save_indicators.assert_called_once_with(
             exchange=latest_candle.exchange,
             symbol=latest_candle.symbol,
             timeframe=latest_candle.timeframe,
@@ -124,14 +207,11 @@ class TestIndicatorCalculator:
         )
 
     @pytest.mark.asyncio
-    async def test_process_candle_with_insufficient_history(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
+    async def test_process_candle_with_insufficient_history(self, calculator_env, candles_15):
         """Test that processing fails gracefully with insufficient candles"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
+        calculator = calculator_env.calc
 
-        # Create only 15 candles (less than minimum of 20)
-        candles = [create_test_candle(50000 + i, i) for i in range(15)]
+        candles = candles_15
         latest_candle = candles[-1]
 
         # Process should return early without calling persistence
@@ -143,19 +223,17 @@ class TestIndicatorCalculator:
         assert not calculator.indicators["RSI"].get_results.called
 
         # Verify persistence was NOT called
-        mock_persistence.save_indicators.assert_not_called()
+        calculator_env.persistence.save_indicators.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_indicator_calculation_error_handling(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
+    async def test_indicator_calculation_error_handling(self, calculator_env, candles_50):
         """Test error handling when individual indicator fails"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
+        calculator = calculator_env.calc
 
         # Make one indicator fail
-        calculator.indicators["SMA"].get_results.side_effect = Exception("SMA calculation failed")
+        override_indicator(calculator, "SMA", error=Exception("SMA calculation failed"))
 
-        candles = [create_test_candle(50000 + i, i) for i in range(50)]
+        candles = candles_50
         latest_candle = candles[-1]
 
         # Should continue and calculate other indicators
@@ -166,7 +244,7 @@ class TestIndicatorCalculator:
         assert calculator.indicators["RSI"].get_results.called
 
         # Verify persistence called with partial results (no SMA)
-        call_args = mock_persistence.save_indicators.call_args
+        call_args = calculator_env.persistence.save_indicators.call_args
         indicators_saved = call_args.kwargs["indicators"]
 
         assert "EMA_12" in indicators_saved
@@ -174,34 +252,29 @@ class TestIndicatorCalculator:
         assert "SMA_20" not in indicators_saved  # Failed indicator excluded
 
     @pytest.mark.asyncio
-    async def test_no_results_from_any_indicator(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
+    async def test_no_results_from_any_indicator(self, calculator_env, candles_50):
         """Test behavior when no indicators return results"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
+        calculator = calculator_env.calc
 
         # Make all indicators return empty results
-        calculator.indicators["SMA"].get_results.return_value = {}
-        calculator.indicators["EMA"].get_results.return_value = {}
-        calculator.indicators["RSI"].get_results.return_value = {}
+        for name in DEFAULT_RESULTS:
+            override_indicator(calculator, name, {})
 
-        candles = [create_test_candle(50000 + i, i) for i in range(50)]
+        candles = candles_50
         latest_candle = candles[-1]
 
         await calculator.process_candle_with_history(latest_candle, candles)
 
         # Verify persistence NOT called when no results
-        mock_persistence.save_indicators.assert_not_called()
+        calculator_env.persistence.save_indicators.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_indicator_loader_called_during_init(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
+    async def test_indicator_loader_called_during_init(self, calculator_env):
         """Test that IndicatorLoader is called during initialization"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
+        calculator = calculator_env.calc
 
         # Verify loader was called
-        mock_indicator_loader.load_from_settings.assert_called_once()
+        calculator_env.loader.load_from_settings.assert_called_once()
 
         # Verify indicators loaded
         assert len(calculator.indicators) == 3
@@ -210,95 +283,38 @@ class TestIndicatorCalculator:
         assert "RSI" in calculator.indicators
 
     @pytest.mark.asyncio
-    async def test_process_with_exact_minimum_candles(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
+    async def test_process_with_exact_minimum_candles(self, calculator_env, candles_20):
         """Test processing with exactly 20 candles (minimum)"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
+        calculator = calculator_env.calc
 
-        # Create exactly 20 candles
-        candles = [create_test_candle(50000 + i, i) for i in range(20)]
+        candles = candles_20
         latest_candle = candles[-1]
 
         await calculator.process_candle_with_history(latest_candle, candles)
 
         # Should process successfully
-        mock_persistence.save_indicators.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_process_with_different_symbols(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
-        """Test processing candles for different symbols"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
-
-        # Process BTC
-        btc_candles = [create_test_candle(50000 + i, i, symbol="BTCUSDT") for i in range(50)]
-        await calculator.process_candle_with_history(btc_candles[-1], btc_candles)
-
-        # Process ETH
-        eth_candles = [create_test_candle(3000 + i, i, symbol="ETHUSDT") for i in range(50)]
-        await calculator.process_candle_with_history(eth_candles[-1], eth_candles)
-
-        # Verify both were processed
-        assert mock_persistence.save_indicators.call_count == 2
-
-        # Verify correct symbols
-        first_call = mock_persistence.save_indicators.call_args_list[0]
-        assert first_call.kwargs["symbol"] == "BTCUSDT"
-
-        second_call = mock_persistence.save_indicators.call_args_list[1]
-        assert second_call.kwargs["symbol"] == "ETHUSDT"
+        calculator_env.persistence.save_indicators.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_process_with_different_exchanges(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
-        """Test processing candles from different exchanges"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
-
-        # Process Binance
-        binance_candles = [create_test_candle(50000 + i, i, exchange="binance") for i in range(50)]
-        await calculator.process_candle_with_history(binance_candles[-1], binance_candles)
-
-        # Process Coinbase
-        coinbase_candles = [
-            create_test_candle(50000 + i, i, exchange="coinbase") for i in range(50)
-        ]
-        await calculator.process_candle_with_history(coinbase_candles[-1], coinbase_candles)
-
-        # Verify both exchanges processed
-        assert mock_persistence.save_indicators.call_count == 2
-
-        first_call = mock_persistence.save_indicators.call_args_list[0]
-        assert first_call.kwargs["exchange"] == "binance"
-
-        second_call = mock_persistence.save_indicators.call_args_list[1]
-        assert second_call.kwargs["exchange"] == "coinbase"
-
-    @pytest.mark.asyncio
-    async def test_process_with_different_timeframes(
-        self, mock_db, mock_persistence, mock_indicator_loader
-    ):
-        """Test processing candles with different timeframes"""
-        calculator = IndicatorCalculator(db=mock_db, persistence=mock_persistence)
-
-        # Process 1m candles
-        candles_1m = [create_test_candle(50000 + i, i, timeframe="1m") for i in range(50)]
-        await calculator.process_candle_with_history(candles_1m[-1], candles_1m)
-
-        # Process 5m candles
-        candles_5m = [create_test_candle(50000 + i, i * 5, timeframe="5m") for i in range(50)]
-        await calculator.process_candle_with_history(candles_5m[-1], candles_5m)
-
-        # Verify both timeframes processed
-        assert mock_persistence.save_indicators.call_count == 2
+    @pytest.mark.parametrize(
+        "attr,value,series_kwargs",
+        [
+            ("symbol", "BTCUSDT", {}),
+            ("symbol", "ETHUSDT", {"base_close": 3000}),
+            ("exchange", "binance", {}),
+            ("exchange", "coinbase", {}),
+            ("timeframe", "1m", {}),
+            ("timeframe", "5m", {"minutes_apart": 5}),
+        ],
+    )
+    async def test_process_candle_attribute(self, calculator_env, attr, value, series_kwargs):
+        """Test indicators are saved under the candle's exchange/symbol/timeframe"""
+        candles = list(candle_series(50, **{attr: value}, **series_kwargs))
 
-        first_call = mock_persistence.save_indicators.call_args_list[0]
-        assert first_call.kwargs["timeframe"] == "1m"
+        await calculator_env.calc.process_candle_with_history(candles[-1], candles)
 
-        second_call = mock_persistence.save_indicators.call_args_list[1]
-        assert second_call.kwargs["timeframe"] == "5m"
+        calculator_env.persistence.save_indicators.assert_called_once()
+        assert calculator_env.persistence.save_indicators.call_args.kwargs[attr] == value
 
 
 if __name__ == "__main__":
@@ -4,20 +4,32 @@ Unit tests for IndicatorPersistence
 Tests saving indicators to Redis cache and ClickHouse database.
 """
 
+import asyncio
+import base64
 import json
+import os
+import threading
+import time
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from services.indicator_service.persistence import IndicatorPersistence
+import services.indicator_service.persistence as persistence_module
+from core.interfaces.database import IndicatorSet
+from services.indicator_service.persistence import IndicatorPersistence, _BatchTuner
+
+
+def now_ms() -> int:
+    """Wall-clock epoch milliseconds (what cached_ms holds)"""
+    return time.time_ns() // 1_000_000
 
 
 @pytest.fixture
 def mock_db():
     """Mock BaseTimeSeriesDB"""
     db = MagicMock()
-    db.insert_indicators = AsyncMock(return_value=5)
+    db.insert_indicators_bulk = AsyncMock(return_value=5)
     return db
 
 
@@ -25,20 +37,39 @@ def mock_db():
 def mock_cache():
     """Mock BaseCacheClient"""
     cache = MagicMock()
-    cache.set = AsyncMock()
-    cache.get = AsyncMock()
+    cache.hset_many = AsyncMock(side_effect=len)
+    cache.hget = AsyncMock()
+    cache.hmget = AsyncMock()
     return cache
 
 
+def cached_items(mock_cache) -> list[tuple]:
+    """(hash, {symbol: value}, ttl) handed to the cache across all hset_many() calls"""
+    return [item for c in mock_cache.hset_many.call_args_list for item in c.args[0]]
+
+
+def cached_fields(mock_cache) -> list[tuple[str, str]]:
+    """(hash, symbol) for every cached value, in write order"""
+    return [(key, symbol) for key, fields, _ in cached_items(mock_cache) for symbol in fields]
+
+
+@pytest.fixture
+async def persistence(mock_db, mock_cache):
+    """IndicatorPersistence without the flush/cache timers (tests flush explicitly)"""
+    persistence = IndicatorPersistence(
+        db=mock_db, cache=mock_cache, flush_interval=0, cache_interval=0
+    )
+    yield persistence
+    await persistence.close()
+
+
 @pytest.mark.unit
 class TestIndicatorPersistence:
     """Test IndicatorPersistence save operations"""
 
     @pytest.mark.asyncio
-    async def test_save_indicators_success(self, mock_db, mock_cache):
+    async def test_save_indicators_success(self, persistence, mock_db, mock_cache):
         """Test successful save to both cache and database"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
         indicators = {
             "SMA_20": 50000.0,
@@ -55,23 +86,20 @@ class TestIndicatorPersistence:
             indicators=indicators,
         )
 
-        # Verify cache write called
-        mock_cache.set.assert_called_once()
+        # Verify cache + database writes are buffered until flush
+        mock_cache.hset_many.assert_not_called()
+        mock_db.insert_indicators_bulk.assert_not_called()
+        assert await persistence.flush() == 5
 
-        # Verify database write called
-        mock_db.insert_indicators.assert_called_once_with(
-            exchange="binance",
-            symbol="BTCUSDT",
-            timeframe="1m",
-            timestamp=timestamp,
-            indicators=indicators,
+        mock_cache.hset_many.assert_called_once()
+
+        mock_db.insert_indicators_bulk.assert_called_once_with(
+            [IndicatorSet("binance", "BTCUSDT", "1m", timestamp, indicators)]
         )
 
     @pytest.mark.asyncio
-    async def test_cache_key_format(self, mock_db, mock_cache):
+    async def test_cache_key_format(self, persistence, mock_db, mock_cache):
         """Test cache key formatting"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime.now(UTC)
         indicators = {"SMA_20": 50000.0}
 
@@ -84,16 +112,15 @@ class TestIndicatorPersistence:
         )
 
         # Verify cache key format
-        call_args = mock_cache.set.call_args
-        cache_key = call_args[0][0]
+        await persistence.flush()
+        cache_key, fields, _ = cached_items(mock_cache)[0]
 
-        assert cache_key == "indicators:binance:BTCUSDT:1m"
+        assert cache_key == "indicators:binance:1m"
+        assert list(fields) == ["BTCUSDT"]
 
     @pytest.mark.asyncio
-    async def test_cache_value_format(self, mock_db, mock_cache):
+    async def test_cache_value_format(self, persistence, mock_db, mock_cache):
         """Test cache value JSON format"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
         indicators = {"SMA_20": 50000.0, "RSI_14": 55.5}
 
@@ -106,22 +133,20 @@ class TestIndicatorPersistence:
         )
 
         # Get cache value from call args
-        call_args = mock_cache.set.call_args
-        cache_value = call_args[0][1]
+        await persistence.flush()
+        cache_value = cached_items(mock_cache)[0][1]["BTCUSDT"]
 
         # Parse JSON
         data = json.loads(cache_value)
 
-        assert "timestamp" in data
-        assert "indicators" in data
-        assert data["timestamp"] == timestamp.isoformat()
+        assert set(data) == {"ts_ms", "cached_ms", "indicators"}
+        assert data["ts_ms"] == 1704110400000  # 2024-01-01T12:00:00Z
+        assert abs(data["cached_ms"] - now_ms()) < 5000  # Write time, not candle time
         assert data["indicators"] == indicators
 
     @pytest.mark.asyncio
-    async def test_cache_ttl_setting(self, mock_db, mock_cache):
+    async def test_cache_ttl_setting(self, persistence, mock_db, mock_cache):
         """Test cache TTL is set to 60 seconds"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime.now(UTC)
         indicators = {"SMA_20": 50000.0}
 
@@ -134,16 +159,14 @@ class TestIndicatorPersistence:
         )
 
         # Verify TTL setting
-        call_args = mock_cache.set.call_args
-        ttl = call_args.kwargs["ttl"]
+        await persistence.flush()
+        ttl = cached_items(mock_cache)[0][2]
 
         assert ttl == timedelta(seconds=60)
 
     @pytest.mark.asyncio
-    async def test_save_empty_indicators(self, mock_db, mock_cache):
+    async def test_save_empty_indicators(self, persistence, mock_db, mock_cache):
         """Test that empty indicators are not saved"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime.now(UTC)
         indicators = {}
 
@@ -156,16 +179,39 @@ class TestIndicatorPersistence:
         )
 
         # Verify nothing was saved
-        mock_cache.set.assert_not_called()
-        mock_db.insert_indicators.assert_not_called()
+        assert await persistence.flush() == 0
+        mock_cache.hset_many.assert_not_called()
+        mock_db.insert_indicators_bulk.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_cache_failure_does_not_crash(self, mock_db, mock_cache):
-        """Test that cache write failure doesn't prevent database write"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
+    async def test_flush_with_empty_buffer_does_not_wait_for_writes(self, mock_db, mock_cache):
+        """Test flush() returns at once when nothing is buffered, even with writes in flight"""
+        release = asyncio.Event()
+
+        async def slow_insert(batch):
+            await release.wait()
+            return len(batch)
+
+        mock_db.insert_indicators_bulk.side_effect = slow_insert
+        persistence = IndicatorPersistence(
+            db=mock_db, cache=mock_cache, batch_size=1, flush_interval=0, max_concurrent_flushes=1
+        )
+
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", datetime.now(UTC), {"SMA_20": 1.0}
+        )
+        await asyncio.sleep(0.01)  # Writer took the batch, INSERT blocked
 
+        assert await asyncio.wait_for(persistence.flush(), timeout=0.1) == 0
+
+        release.set()
+        await persistence.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_failure_does_not_crash(self, persistence, mock_db, mock_cache):
+        """Test that cache write failure doesn't prevent database write"""
         # Mock cache failure
-        mock_cache.set.side_effect = Exception("Redis connection error")
+        mock_cache.hset_many.side_effect = Exception("Redis connection error")
 
         timestamp = datetime.now(UTC)
         indicators = {"SMA_20": 50000.0}
@@ -180,15 +226,38 @@ class TestIndicatorPersistence:
         )
 
         # Verify database write still called
-        mock_db.insert_indicators.assert_called_once()
+        await persistence.flush()
+        mock_db.insert_indicators_bulk.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_database_failure_does_not_crash(self, mock_db, mock_cache):
-        """Test that database write failure doesn't crash"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
+    async def test_cache_send_does_not_delay_database(self, persistence, mock_db, mock_cache):
+        """Test the DB insert doesn't wait for the cache reply (fire-and-forget)"""
+        release = asyncio.Event()
 
+        async def slow_hset_many(items):
+            await release.wait()
+            return len(items)
+
+        mock_cache.hset_many.side_effect = slow_hset_many
+
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", datetime.now(UTC), {"SMA_20": 50000.0}
+        )
+
+        # Cache reply still outstanding, database already written
+        assert await persistence.flush() == 5
+        mock_db.insert_indicators_bulk.assert_called_once()
+        assert len(persistence._cache_writes) == 1
+
+        release.set()
+        await persistence.close()
+        assert not persistence._cache_writes
+
+    @pytest.mark.asyncio
+    async def test_database_failure_does_not_crash(self, persistence, mock_db, mock_cache):
+        """Test that database write failure doesn't crash"""
         # Mock database failure
-        mock_db.insert_indicators.side_effect = Exception("ClickHouse connection error")
+        mock_db.insert_indicators_bulk.side_effect = Exception("ClickHouse connection error")
 
         timestamp = datetime.now(UTC)
         indicators = {"SMA_20": 50000.0}
@@ -202,38 +271,103 @@ class TestIndicatorPersistence:
             indicators=indicators,
         )
 
+        assert await persistence.flush() == 0
+
         # Verify cache write was attempted
-        mock_cache.set.assert_called_once()
+        mock_cache.hset_many.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_get_from_cache_success(self, mock_db, mock_cache):
+    async def test_get_from_cache_success(self, persistence, mock_db, mock_cache):
         """Test retrieving indicators from cache"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         # Mock cached data
         cached_data = {
-            "timestamp": "2024-01-01T12:00:00+00:00",
+            "ts_ms": 1704110400000,
+            "cached_ms": now_ms(),
             "indicators": {"SMA_20": 50000.0, "RSI_14": 55.5},
         }
-        mock_cache.get.return_value = json.dumps(cached_data)
+        mock_cache.hget.return_value = json.dumps(cached_data)
 
         result = await persistence.get_from_cache(
             exchange="binance", symbol="BTCUSDT", timeframe="1m"
         )
 
         # Verify correct key used
-        mock_cache.get.assert_called_once_with("indicators:binance:BTCUSDT:1m")
+        mock_cache.hget.assert_called_once_with("indicators:binance:1m", "BTCUSDT")
 
         # Verify indicators returned
         assert result == {"SMA_20": 50000.0, "RSI_14": 55.5}
 
     @pytest.mark.asyncio
-    async def test_get_from_cache_miss(self, mock_db, mock_cache):
-        """Test cache miss returns None"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
+    async def test_large_cache_value_is_compressed(self, persistence, mock_cache):
+        """Test big indicator maps are cached compressed and read back transparently"""
+        indicators = {f"IND_{i}": 50000.0 + i for i in range(300)}
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", datetime(2024, 1, 1, 12, tzinfo=UTC), indicators
+        )
+        await persistence.flush()
+        await persistence.close()  # Let the fire-and-forget cache send run
+
+        value = cached_items(mock_cache)[0][1]["BTCUSDT"]
+        assert value[:3] in (b"zs:", b"zl:")
+        assert len(value) < len(json.dumps({"ts_ms": 0, "indicators": indicators}))
+
+        # decode_responses Redis hands back str
+        mock_cache.hget.return_value = value.decode()
+        assert await persistence.get_from_cache("binance", "BTCUSDT", "1m") == indicators
+
+    @pytest.mark.asyncio
+    async def test_large_cache_flush_is_packed_off_the_event_loop(self, persistence, mock_cache):
+        """Test a flush with lots of data to compress packs it on a worker thread"""
+        pack_threads = set()
+        real_pack = persistence_module._pack_cache_value
 
+        def recording_pack(payload):
+            pack_threads.add(threading.current_thread())
+            return real_pack(payload)
+
+        timestamp = datetime.now(UTC)
+        indicators = {f"IND_{i}": 50000.0 + i for i in range(300)}
+        with patch.object(persistence_module, "_pack_cache_value", recording_pack):
+            for i in range(20):  # ~20 x 7.5 KB > _OFFLOAD_MIN_BYTES
+                await persistence.save_indicators("binance", f"SYM{i}", "1m", timestamp, indicators)
+            await persistence.flush()
+            await persistence.close()  # Let the cache send task finish
+
+        assert pack_threads and threading.current_thread() not in pack_threads
+        [(_, fields, _)] = cached_items(mock_cache)
+        assert len(fields) == 20
+        assert all(value[:3] in (b"zs:", b"zl:") for value in fields.values())
+
+    @pytest.mark.asyncio
+    async def test_small_cache_value_stays_plain_json(self, persistence, mock_cache):
+        """Test a full-precision set of the configured indicators isn't compressed"""
+        indicators = {
+            "SMA_20": 50123.456789012345,
+            "SMA_50": 49987.123456789012,
+            "EMA_12": 50234.567890123456,
+            "EMA_26": 50098.765432109876,
+            "RSI_14": 55.512345678901234,
+            "MACD": 135.80246913578025,
+            "MACD_signal": 120.12345678901234,
+            "MACD_histogram": 15.679012345678912,
+        }
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", datetime.now(UTC), indicators)
+        await persistence.flush()
+
+        value = cached_items(mock_cache)[0][1]["BTCUSDT"]
+        assert json.loads(value)["indicators"] == indicators
+
+    def test_incompressible_cache_value_stays_plain_json(self):
+        """Test a large value is kept plain when packing wouldn't make it meaningfully smaller"""
+        payload = json.dumps({"blob": base64.b64encode(os.urandom(6000)).decode()}).encode()
+
+        assert persistence_module._pack_cache_value(payload) == payload
+
+    @pytest.mark.asyncio
+    async def test_get_from_cache_miss(self, persistence, mock_db, mock_cache):
+        """Test cache miss returns None"""
         # Mock cache miss
-        mock_cache.get.return_value = None
+        mock_cache.hget.return_value = None
 
         result = await persistence.get_from_cache(
             exchange="binance", symbol="BTCUSDT", timeframe="1m"
@@ -242,12 +376,10 @@ class TestIndicatorPersistence:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_get_from_cache_error(self, mock_db, mock_cache):
+    async def test_get_from_cache_error(self, persistence, mock_db, mock_cache):
         """Test cache read error returns None"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         # Mock cache error
-        mock_cache.get.side_effect = Exception("Redis timeout")
+        mock_cache.hget.side_effect = Exception("Redis timeout")
 
         result = await persistence.get_from_cache(
             exchange="binance", symbol="BTCUSDT", timeframe="1m"
@@ -256,10 +388,78 @@ class TestIndicatorPersistence:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_save_multiple_symbols(self, mock_db, mock_cache):
-        """Test saving indicators for multiple symbols"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
+    async def test_get_many_from_cache(self, persistence, mock_cache):
+        """Test several symbols come back from one HMGET on the exchange/timeframe hash"""
+        btc = {"SMA_20": 50000.0}
+        mock_cache.hmget.return_value = [
+            json.dumps({"ts_ms": 1704110400000, "cached_ms": now_ms(), "indicators": btc}),
+            None,
+            "not json",
+            json.dumps({"ts_ms": 1704110400000, "cached_ms": now_ms() - 61_000, "indicators": btc}),
+        ]
+
+        result = await persistence.get_many_from_cache(
+            "binance", ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"], "1m"
+        )
+
+        mock_cache.hmget.assert_called_once_with(
+            "indicators:binance:1m", ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+        )
+        # Miss, unreadable + stale values are left out
+        assert result == {"BTCUSDT": btc}
+
+    @pytest.mark.asyncio
+    async def test_stale_symbol_not_served_while_hash_stays_live(self, persistence, mock_cache):
+        """Test a symbol that stopped updating expires even though its hash keeps being refreshed"""
+        store: dict[str, dict[str, bytes]] = {}
+
+        async def hset_many(items):
+            for key, fields, _ in items:
+                store.setdefault(key, {}).update(fields)
+            return len(items)
+
+        mock_cache.hset_many.side_effect = hset_many
+        mock_cache.hget.side_effect = lambda key, symbol: store.get(key, {}).get(symbol)
+        mock_cache.hmget.side_effect = lambda key, symbols: [
+            store.get(key, {}).get(s) for s in symbols
+        ]
+
+        async def save(*symbols):
+            for symbol in symbols:
+                await persistence.save_indicators(
+                    "binance", symbol, "1m", datetime.now(UTC), {"RSI_14": 50.0}
+                )
+            await persistence.flush()
+            await asyncio.gather(*persistence._cache_writes)
+
+        start = now_ms() * 1_000_000
+        with patch.object(persistence_module.time, "time_ns", return_value=start):
+            await save("BTCUSDT", "ETHUSDT")
+
+        # ETH's feed dies; BTC keeps writing (refreshing the whole hash's EXPIRE)
+        for seconds in (30, 60, 90):
+            with patch.object(
+                persistence_module.time, "time_ns", return_value=start + seconds * 10**9
+            ):
+                await save("BTCUSDT")
+
+        with patch.object(persistence_module.time, "time_ns", return_value=start + 91 * 10**9):
+            assert await persistence.get_from_cache("binance", "BTCUSDT", "1m") == {"RSI_14": 50.0}
+            assert await persistence.get_from_cache("binance", "ETHUSDT", "1m") is None
+            assert await persistence.get_many_from_cache(
+                "binance", ["BTCUSDT", "ETHUSDT"], "1m"
+            ) == {"BTCUSDT": {"RSI_14": 50.0}}
+
+    @pytest.mark.asyncio
+    async def test_get_many_from_cache_error(self, persistence, mock_cache):
+        """Test a cache read error returns no results"""
+        mock_cache.hmget.side_effect = Exception("Redis timeout")
 
+        assert await persistence.get_many_from_cache("binance", ["BTCUSDT"], "1m") == {}
+
+    @pytest.mark.asyncio
+    async def test_save_multiple_symbols(self, persistence, mock_db, mock_cache):
+        """Test saving indicators for multiple symbols"""
         timestamp = datetime.now(UTC)
 
         # Save BTC indicators
@@ -280,20 +480,22 @@ class TestIndicatorPersistence:
             indicators={"SMA_20": 3000.0},
         )
 
-        # Verify both saved
-        assert mock_cache.set.call_count == 2
-        assert mock_db.insert_indicators.call_count == 2
+        # Verify both saved - database rows in ONE bulk insert
+        await persistence.flush()
+        mock_cache.hset_many.assert_called_once()
+        mock_db.insert_indicators_bulk.assert_called_once()
+        batch = mock_db.insert_indicators_bulk.call_args.args[0]
+        assert [item.symbol for item in batch] == ["BTCUSDT", "ETHUSDT"]
 
-        # Verify correct cache keys
-        cache_calls = mock_cache.set.call_args_list
-        assert cache_calls[0][0][0] == "indicators:binance:BTCUSDT:1m"
-        assert cache_calls[1][0][0] == "indicators:binance:ETHUSDT:1m"
+        # Verify both symbols land in ONE hash for the exchange/timeframe
+        assert cached_fields(mock_cache) == [
+            ("indicators:binance:1m", "BTCUSDT"),
+            ("indicators:binance:1m", "ETHUSDT"),
+        ]
 
     @pytest.mark.asyncio
-    async def test_save_multiple_timeframes(self, mock_db, mock_cache):
+    async def test_save_multiple_timeframes(self, persistence, mock_db, mock_cache):
         """Test saving indicators for multiple timeframes"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime.now(UTC)
 
         # Save 1m timeframe
@@ -315,15 +517,15 @@ class TestIndicatorPersistence:
         )
 
         # Verify both saved with different cache keys
-        cache_calls = mock_cache.set.call_args_list
-        assert cache_calls[0][0][0] == "indicators:binance:BTCUSDT:1m"
-        assert cache_calls[1][0][0] == "indicators:binance:BTCUSDT:5m"
+        await persistence.flush()
+        assert cached_fields(mock_cache) == [
+            ("indicators:binance:1m", "BTCUSDT"),
+            ("indicators:binance:5m", "BTCUSDT"),
+        ]
 
     @pytest.mark.asyncio
-    async def test_save_multiple_exchanges(self, mock_db, mock_cache):
+    async def test_save_multiple_exchanges(self, persistence, mock_db, mock_cache):
         """Test saving indicators for multiple exchanges"""
-        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache)
-
         timestamp = datetime.now(UTC)
         indicators = {"SMA_20": 50000.0}
 
@@ -346,9 +548,285 @@ class TestIndicatorPersistence:
         )
 
         # Verify different cache keys
-        cache_calls = mock_cache.set.call_args_list
-        assert cache_calls[0][0][0] == "indicators:binance:BTCUSDT:1m"
-        assert cache_calls[1][0][0] == "indicators:coinbase:BTC-USD:1m"
+        await persistence.flush()
+        assert cached_fields(mock_cache) == [
+            ("indicators:binance:1m", "BTCUSDT"),
+            ("indicators:coinbase:1m", "BTC-USD"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_flush_when_batch_size_reached(self, mock_db, mock_cache):
+        """Test buffered rows are inserted as soon as batch_size rows are buffered"""
+        persistence = IndicatorPersistence(
+            db=mock_db, cache=mock_cache, batch_size=3, flush_interval=0
+        )
+        timestamp = datetime.now(UTC)
+
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", timestamp, {"SMA_20": 1.0})
+        mock_db.insert_indicators_bulk.assert_not_called()
+
+        # 1 + 2 rows = batch_size
+        await persistence.save_indicators(
+            "binance", "ETHUSDT", "1m", timestamp, {"SMA_20": 2.0, "RSI_14": 50.0}
+        )
+        # Writer task does the insert - save_indicators() didn't wait for it
+        mock_db.insert_indicators_bulk.assert_not_called()
+        await asyncio.sleep(0.01)
+        mock_db.insert_indicators_bulk.assert_called_once()
+        assert len(mock_db.insert_indicators_bulk.call_args.args[0]) == 2
+
+        # Buffer emptied by the flush
+        assert await persistence.flush() == 0
+        await persistence.close()
+
+    @pytest.mark.asyncio
+    async def test_flush_timer_writes_partial_batch(self, mock_db, mock_cache):
+        """Test the flush timer inserts a partial batch, and close() writes the rest"""
+        persistence = IndicatorPersistence(db=mock_db, cache=mock_cache, flush_interval=0.01)
+        timestamp = datetime.now(UTC)
+
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", timestamp, {"SMA_20": 1.0})
+        await asyncio.sleep(0.05)
+        mock_db.insert_indicators_bulk.assert_called_once()
+
+        await persistence.save_indicators("binance", "BTCUSDT", "5m", timestamp, {"SMA_20": 1.0})
+        await persistence.close()
+        assert mock_db.insert_indicators_bulk.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_sent_without_waiting_for_database_batch(self, mock_db, mock_cache):
+        """Test staged cache values go out every cache_interval, ahead of the DB INSERT"""
+        persistence = IndicatorPersistence(
+            db=mock_db, cache=mock_cache, flush_interval=0, cache_interval=0.02
+        )
+        timestamp = datetime(2024, 1, 1, 12, tzinfo=UTC)
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", timestamp, {"RSI_14": 50.0})
+
+        await asyncio.sleep(0.1)
+
+        # Cached within cache_interval; the row is still waiting for a full batch
+        assert cached_fields(mock_cache) == [("indicators:binance:1m", "BTCUSDT")]
+        mock_db.insert_indicators_bulk.assert_not_called()
+
+        await persistence.close()
+
+        # close() writes the row without sending the same cache value again
+        mock_db.insert_indicators_bulk.assert_called_once()
+        mock_cache.hset_many.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_merges_and_sorts_by_key(self, persistence, mock_db):
+        """Test repeated candles collapse (later values win) and the batch is key-sorted"""
+        t1 = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+        t2 = datetime(2024, 1, 1, 12, 1, tzinfo=UTC)
+
+        await persistence.save_indicators("binance", "ETHUSDT", "1m", t1, {"SMA_20": 3000.0})
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", t2, {"SMA_20": 1.0})
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", t1, {"SMA_20": 2.0})
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", t2, {"SMA_20": 5.0, "RSI_14": 50.0}
+        )
+
+        await persistence.flush()
+
+        assert mock_db.insert_indicators_bulk.call_args.args[0] == [
+            IndicatorSet("binance", "BTCUSDT", "1m", t1, {"SMA_20": 2.0}),
+            IndicatorSet("binance", "BTCUSDT", "1m", t2, {"SMA_20": 5.0, "RSI_14": 50.0}),
+            IndicatorSet("binance", "ETHUSDT", "1m", t1, {"SMA_20": 3000.0}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_merge_failure_drops_batch_without_raising(self, persistence, mock_db):
+        """Test a batch that can't be merged is logged and dropped, like a failed INSERT"""
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", datetime(2024, 1, 1, tzinfo=UTC), {"RSI_14": 50.0}
+        )
+        persistence._buffer.append(("malformed",))
+
+        assert await persistence.flush() == 0
+        mock_db.insert_indicators_bulk.assert_not_called()
+
+        # The next batch goes through as usual
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", datetime(2024, 1, 1, 0, 1, tzinfo=UTC), {"RSI_14": 51.0}
+        )
+        assert await persistence.flush() == 5
+
+    @pytest.mark.asyncio
+    async def test_cache_keeps_latest_value_per_key(self, persistence, mock_cache):
+        """Test repeated saves for one symbol reach the cache once, with the latest value"""
+        t1 = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+        t2 = datetime(2024, 1, 1, 12, 1, tzinfo=UTC)
+
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", t1, {"SMA_20": 1.0})
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", t2, {"SMA_20": 2.0})
+        await persistence.flush()
+
+        # One hset_many() call = one pipeline
+        mock_cache.hset_many.assert_called_once()
+        [(key, fields, ttl)] = cached_items(mock_cache)
+        assert key == "indicators:binance:1m"
+        [(symbol, value)] = fields.items()
+        assert symbol == "BTCUSDT"
+        data = json.loads(value)
+        assert data["ts_ms"] == 1704110460000
+        assert data["indicators"] == {"SMA_20": 2.0}
+
+    @pytest.mark.asyncio
+    async def test_backpressure_when_writer_falls_behind(self, mock_db, mock_cache):
+        """Test saves wait for the database once max_buffered_rows are buffered"""
+        release = asyncio.Event()
+
+        async def slow_insert(batch):
+            await release.wait()
+            return len(batch)
+
+        mock_db.insert_indicators_bulk.side_effect = slow_insert
+        persistence = IndicatorPersistence(
+            db=mock_db,
+            cache=mock_cache,
+            batch_size=1,
+            flush_interval=0,
+            max_buffered_rows=2,
+            max_concurrent_flushes=1,
+        )
+        timestamp = datetime.now(UTC)
+
+        # First batch: writer picks it up and blocks in the INSERT
+        await persistence.save_indicators("binance", "BTCUSDT", "1m", timestamp, {"SMA_20": 1.0})
+        await asyncio.sleep(0.01)
+        assert mock_db.insert_indicators_bulk.call_count == 1
+
+        # Buffering continues without waiting...
+        await persistence.save_indicators("binance", "ETHUSDT", "1m", timestamp, {"SMA_20": 2.0})
+
+        # ...until max_buffered_rows: this save waits behind the in-flight INSERT
+        third = asyncio.create_task(
+            persistence.save_indicators("binance", "SOLUSDT", "1m", timestamp, {"SMA_20": 3.0})
+        )
+        await asyncio.sleep(0.01)
+        assert not third.done()
+
+        release.set()
+        await third
+        await persistence.close()
+
+        symbols = [
+            item.symbol for c in mock_db.insert_indicators_bulk.call_args_list for item in c.args[0]
+        ]
+        assert symbols == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+    @pytest.mark.asyncio
+    async def test_writer_keeps_inserts_in_flight(self, mock_db, mock_cache):
+        """Test the writer starts the next INSERT while the previous one is still running"""
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def slow_insert(batch):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            return len(batch)
+
+        mock_db.insert_indicators_bulk.side_effect = slow_insert
+        persistence = IndicatorPersistence(
+            db=mock_db, cache=mock_cache, batch_size=1, flush_interval=0, max_concurrent_flushes=2
+        )
+        timestamp = datetime.now(UTC)
+
+        for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+            await persistence.save_indicators("binance", symbol, "1m", timestamp, {"SMA_20": 1.0})
+            await asyncio.sleep(0.01)
+
+        # Two slots: two INSERTs in flight, the third batch waits in the buffer
+        assert peak == 2
+        assert mock_db.insert_indicators_bulk.call_count == 2
+
+        release.set()
+        await persistence.close()
+        assert mock_db.insert_indicators_bulk.call_count == 3
+        assert peak == 2
+
+
+@pytest.mark.unit
+class TestBatchTuner:
+    """Test adaptive batch sizing"""
+
+    def test_grows_while_throughput_improves(self):
+        """Test batch size grows 1.5x per window while rows/sec keeps rising"""
+        tuner = _BatchTuner(floor=1000, ceiling=20_000, latency_slo=1.0, window=2)
+        size = 10_000
+
+        # Window 1: first rate seen → grow
+        size = tuner.observe(size, size, 0.1)
+        size = tuner.observe(size, size, 0.1)
+        assert size == 15_000
+
+        # Window 2: faster per row → grow, capped at the ceiling
+        size = tuner.observe(size, size, 0.05)
+        size = tuner.observe(size, size, 0.05)
+        assert size == 20_000
+
+    def test_holds_at_plateau(self):
+        """Test batch size stays put once bigger batches stop improving throughput"""
+        tuner = _BatchTuner(floor=1000, ceiling=100_000, latency_slo=1.0, window=2)
+        size = tuner.observe(10_000, 10_000, 0.1)
+        size = tuner.observe(size, 10_000, 0.1)
+        assert size == 15_000
+
+        # Same rows/sec at the bigger size → no gain, hold
+        size = tuner.observe(size, 15_000, 0.15)
+        size = tuner.observe(size, 15_000, 0.15)
+        assert size == 15_000
+
+    def test_halves_when_latency_exceeds_slo(self):
+        """Test a slow INSERT in the window halves the batch size, down to the floor"""
+        tuner = _BatchTuner(floor=4000, ceiling=100_000, latency_slo=0.5, window=2)
+
+        size = tuner.observe(10_000, 10_000, 0.1)
+        size = tuner.observe(size, 10_000, 0.9)
+        assert size == 5000
+
+        size = tuner.observe(size, 5000, 0.9)
+        size = tuner.observe(size, 5000, 0.9)
+        assert size == 4000
+
+    @pytest.mark.asyncio
+    async def test_persistence_applies_tuned_batch_size(self, mock_db, mock_cache):
+        """Test full-batch INSERTs feed the tuner and its size is used for the next batch"""
+        mock_db.insert_indicators_bulk.side_effect = lambda batch: sum(
+            len(item.indicators) for item in batch
+        )
+        persistence = IndicatorPersistence(
+            db=mock_db, cache=mock_cache, batch_size=2, flush_interval=0, max_batch_size=10
+        )
+        persistence._tuner.window = 1
+        timestamp = datetime.now(UTC)
+
+        await persistence.save_indicators(
+            "binance", "BTCUSDT", "1m", timestamp, {"SMA_20": 1.0, "RSI_14": 50.0}
+        )
+        assert await persistence.flush() == 2
+        assert persistence.batch_size == 3
+
+        # Partial batch: not sampled
+        await persistence.save_indicators("binance", "ETHUSDT", "1m", timestamp, {"SMA_20": 1.0})
+        await persistence.flush()
+        assert persistence.batch_size == 3
+        await persistence.close()
+
+    def test_fixed_batch_size_without_ceiling(self, mock_db, mock_cache):
+        """Test no tuner unless max_batch_size is above batch_size"""
+        assert IndicatorPersistence(db=mock_db, cache=mock_cache)._tuner is None
+        assert (
+            IndicatorPersistence(
+                db=mock_db, cache=mock_cache, batch_size=100, max_batch_size=100
+            )._tuner
+            is None
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+"""
+Unit tests for event loop selection (core/utils/event_loop.py)
+
+Tests:
+- USE_UVLOOP=False runs on the default asyncio loop
+- USE_UVLOOP=True runs on uvloop when installed
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.utils.event_loop import get_loop_factory, run
+
+
+async def _loop_type() -> type:
+    return type(asyncio.get_running_loop())
+
+
+@pytest.mark.unit
+class TestEventLoop:
+    """Test uvloop opt-in"""
+
+    def test_disabled_uses_default_loop(self):
+        """Verify USE_UVLOOP=False keeps the asyncio default loop"""
+        mock_settings = MagicMock(USE_UVLOOP=False)
+        with patch("config.settings.get_settings", return_value=mock_settings):
+            assert get_loop_factory() is None
+            loop_type = run(_loop_type())
+
+        assert loop_type.__module__.startswith("asyncio")
+
+    def test_enabled_uses_uvloop(self):
+        """Verify USE_UVLOOP=True runs main() on a uvloop loop"""
+        uvloop = pytest.importorskip("uvloop")
+        mock_settings = MagicMock(USE_UVLOOP=True)
+        with patch("config.settings.get_settings", return_value=mock_settings):
+            loop_type = run(_loop_type())
+
+        assert issubclass(loop_type, uvloop.Loop)
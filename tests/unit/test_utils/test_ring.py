@@ -0,0 +1,246 @@
+"""
+Unit tests for BoundedRing (core/utils/ring.py)
+
+Tests:
+- FIFO order across wrap-around
+- put_nowait() returns False when full (no exception)
+- get() wakes on put, put() waits for free slot
+- task_done()/join() accounting
+- put_many_nowait()/get_many() batch pushes and pops
+- close() drains then raises RingClosedError
+- DropRateRing 60-second window across wrap-around
+"""
+
+import asyncio
+
+import pytest
+
+from core.utils.ring import BoundedRing, DropRateRing, RingClosedError
+
+
+@pytest.mark.unit
+class TestBoundedRing:
+    """Test ring buffer semantics"""
+
+    def test_invalid_maxsize(self):
+        """Verify capacity must be at least 1"""
+        with pytest.raises(ValueError):
+            BoundedRing(0)
+
+    def test_fifo_order_with_wraparound(self):
+        """Verify items come out in insertion order after the indices wrap"""
+        ring = BoundedRing(3)
+        out = []
+        for i in range(10):
+            assert ring.put_nowait(i) is True
+            if ring.full():
+                out.append(ring.get_nowait())
+        while not ring.empty():
+            out.append(ring.get_nowait())
+
+        assert out == list(range(10))
+
+    def test_put_nowait_full_returns_false(self):
+        """Verify a full ring rejects without raising"""
+        ring = BoundedRing(2)
+        assert ring.put_nowait("a")
+        assert ring.put_nowait("b")
+
+        assert ring.put_nowait("c") is False
+        assert ring.qsize() == 2
+
+    def test_put_evicting_overwrites_oldest(self):
+        """Verify a full ring evicts the oldest item and keeps FIFO order"""
+        ring = BoundedRing(3)
+        for item in ("a", "b", "c"):
+            assert ring.put_evicting(item) is False
+
+        assert ring.put_evicting("d") is True
+        assert ring.put_evicting("e") is True
+        assert ring.qsize() == 3
+
+        assert ring.get_many_nowait(10) == ["c", "d", "e"]
+
+    def test_get_nowait_empty_raises(self):
+        """Verify empty ring raises asyncio.QueueEmpty like asyncio.Queue"""
+        with pytest.raises(asyncio.QueueEmpty):
+            BoundedRing(1).get_nowait()
+
+    async def test_get_waits_for_put(self):
+        """Verify get() blocks until an item is put"""
+        ring = BoundedRing(4)
+        getter = asyncio.create_task(ring.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        ring.put_nowait("item")
+        assert await asyncio.wait_for(getter, timeout=1.0) == "item"
+
+    async def test_put_waits_for_free_slot(self):
+        """Verify put() on a full ring waits until a consumer frees a slot"""
+        ring = BoundedRing(1)
+        ring.put_nowait("first")
+
+        putter = asyncio.create_task(ring.put("second"))
+        await asyncio.sleep(0)
+        assert not putter.done()
+
+        assert ring.get_nowait() == "first"
+        await asyncio.wait_for(putter, timeout=1.0)
+        assert ring.get_nowait() == "second"
+
+    async def test_multiple_consumers_each_get_one_item(self):
+        """Verify one put wakes consumers but only one receives the item"""
+        ring = BoundedRing(4)
+        getters = [asyncio.create_task(ring.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        ring.put_nowait("only")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        done = [g for g in getters if g.done()]
+        assert [g.result() for g in done] == ["only"]
+
+        for g in getters:
+            g.cancel()
+        await asyncio.gather(*getters, return_exceptions=True)
+
+    async def test_join_waits_for_task_done(self):
+        """Verify join() returns only after every item is task_done()"""
+        ring = BoundedRing(4)
+        ring.put_nowait(1)
+        ring.put_nowait(2)
+
+        joiner = asyncio.create_task(ring.join())
+        ring.get_nowait()
+        ring.task_done()
+        await asyncio.sleep(0)
+        assert not joiner.done()
+
+        ring.get_nowait()
+        ring.task_done()
+        await asyncio.wait_for(joiner, timeout=1.0)
+
+    async def test_close_wakes_all_getters_after_drain(self):
+        """Verify close() lets buffered items out, then every getter gets RingClosedError"""
+        ring = BoundedRing(4)
+        ring.put_nowait("last")
+        ring.close()
+
+        assert await ring.get() == "last"
+        with pytest.raises(RingClosedError):
+            await ring.get()
+
+        idle = BoundedRing(4)
+        getters = [asyncio.create_task(idle.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+        idle.close()
+
+        results = await asyncio.gather(*getters, return_exceptions=True)
+        assert all(isinstance(r, RingClosedError) for r in results)
+
+    def test_get_many_nowait_across_wraparound(self):
+        """Verify batch pops keep FIFO order when the batch wraps the buffer end"""
+        ring = BoundedRing(4)
+        for i in range(3):
+            ring.put_nowait(i)
+        assert ring.get_many_nowait(2) == [0, 1]
+
+        # Tail wraps: slots now hold 2, 3, 4, 5 with head at index 2
+        for i in range(3, 6):
+            assert ring.put_nowait(i)
+        assert ring.full()
+
+        assert ring.get_many_nowait(10) == [2, 3, 4, 5]
+        assert ring.empty()
+        assert ring.get_many_nowait(10) == []
+
+        # Freed slots are reusable and no stale references remain
+        assert ring._buf == [None] * 4
+        assert ring.put_nowait("next")
+        assert ring.get_many_nowait(1) == ["next"]
+
+    def test_put_many_nowait_wraps_and_truncates(self):
+        """Verify batch appends wrap the buffer end and keep only what fits"""
+        ring = BoundedRing(4)
+        ring.put_nowait("x")
+        ring.put_nowait("y")
+        ring.get_many_nowait(2)
+
+        # Tail at index 2: batch wraps, and only 4 of 6 fit
+        assert ring.put_many_nowait([0, 1, 2, 3, 4, 5]) == 4
+        assert ring.full()
+        assert ring.put_many_nowait([6]) == 0
+
+        assert ring.get_many_nowait(10) == [0, 1, 2, 3]
+
+    async def test_put_many_nowait_wakes_getter_and_counts_unfinished(self):
+        """Verify one bulk put wakes a waiting consumer and join() tracks every item"""
+        ring = BoundedRing(8)
+        getter = asyncio.create_task(ring.get_many(8))
+        await asyncio.sleep(0)
+
+        assert ring.put_many_nowait(["a", "b", "c"]) == 3
+        assert await asyncio.wait_for(getter, timeout=1.0) == ["a", "b", "c"]
+
+        joiner = asyncio.create_task(ring.join())
+        for _ in range(3):
+            ring.task_done()
+        await asyncio.wait_for(joiner, timeout=1.0)
+
+    async def test_get_many_waits_then_takes_burst(self):
+        """Verify get_many() wakes once for a burst and returns all of it"""
+        ring = BoundedRing(8)
+        getter = asyncio.create_task(ring.get_many(8))
+        await asyncio.sleep(0)
+
+        for i in range(5):
+            ring.put_nowait(i)
+
+        assert await asyncio.wait_for(getter, timeout=1.0) == [0, 1, 2, 3, 4]
+
+    def test_task_done_too_many_times(self):
+        """Verify unbalanced task_done() raises ValueError"""
+        with pytest.raises(ValueError):
+            BoundedRing(1).task_done()
+
+
+@pytest.mark.unit
+class TestDropRateRing:
+    """Test drop timestamp ring"""
+
+    def test_capacity_must_be_power_of_two(self):
+        """Verify non power-of-two capacities are rejected (index masking)"""
+        with pytest.raises(ValueError):
+            DropRateRing(1000)
+
+    def test_window_excludes_old_drops(self):
+        """Verify only drops newer than 60 seconds are counted"""
+        drops = DropRateRing(16)
+        drops.record(3, now=100.0)
+        drops.record(2, now=150.0)
+
+        assert drops.count_60s(now=155.0) == 5
+        assert drops.count_60s(now=161.0) == 2
+        assert drops.rate_60s(now=211.0) == 0.0
+
+    def test_wraparound_keeps_newest_in_order(self):
+        """Verify the ring overwrites oldest slots and still bisects correctly"""
+        drops = DropRateRing(8)
+        for t in range(20):
+            drops.record(now=float(t))
+
+        # Ring holds t=12..19; window at now=75 keeps t > 15
+        assert drops.count_60s(now=75.0) == 4
+        assert drops.count_60s(now=19.0) == 8
+
+    def test_bulk_record_larger_than_capacity(self):
+        """Verify a burst bigger than the ring fills it without overflow"""
+        drops = DropRateRing(8)
+        drops.record(now=1.0)
+        drops.record(100, now=2.0)
+
+        assert drops.count_60s(now=2.0) == 8
+        assert drops.count_60s(now=61.5) == 8
+        assert drops.count_60s(now=62.0) == 0
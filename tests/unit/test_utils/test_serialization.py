@@ -0,0 +1,60 @@
+"""
+Unit tests for stream record encoding (core/utils/serialization.py)
+
+Tests:
+- orjson path round-trips datetimes (UTC as "Z") and stringifies Decimals
+- Kafka producer uses dumps_record as its value serializer
+"""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.utils.serialization import ORJSON_AVAILABLE, dumps_record
+
+
+@pytest.mark.unit
+class TestDumpsRecord:
+    """Test JSON bytes encoding for stream payloads"""
+
+    def test_returns_utf8_json_bytes(self):
+        """Verify output is bytes that json.loads() reads back"""
+        payload = dumps_record({"symbol": "BTC/USDT", "i": 1})
+
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == {"symbol": "BTC/USDT", "i": 1}
+
+    def test_decimal_encoded_as_string(self):
+        """Verify Decimal prices keep full precision as strings (like default=str)"""
+        assert json.loads(dumps_record({"price": Decimal("50000.12345678")})) == {
+            "price": "50000.12345678"
+        }
+
+    def test_send_impl_serializes_with_orjson(self):
+        """Verify datetimes round-trip through the orjson path"""
+        if not ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        ts = datetime(2024, 1, 1, 12, 30, 45, 123456, tzinfo=UTC)
+
+        decoded = json.loads(dumps_record({"timestamp": ts}))
+
+        assert decoded["timestamp"] == "2024-01-01T12:30:45.123456Z"
+        assert datetime.fromisoformat(decoded["timestamp"]) == ts
+
+    async def test_kafka_producer_uses_dumps_record(self):
+        """Verify the Kafka producer serializes values with dumps_record"""
+        from providers.opensource.kafka_stream_producer import KafkaStreamProducer
+
+        with patch("providers.opensource.kafka_stream_producer.AIOKafkaProducer") as mock_cls:
+            mock_cls.return_value.start = AsyncMock()
+            mock_cls.return_value.stop = AsyncMock()
+            mock_cls.return_value.flush = AsyncMock()
+            producer = KafkaStreamProducer()
+            await producer.connect()
+            try:
+                assert mock_cls.call_args.kwargs["value_serializer"] is dumps_record
+            finally:
+                await producer.close()